@@ -1,11 +1,12 @@
 import os
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, create_engine, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, create_engine, Integer, BigInteger, Boolean, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
 from dotenv import load_dotenv
+from .services.telemetry import instrument_engine
 
 load_dotenv()
 
@@ -18,6 +19,7 @@ if not DATABASE_URL:
     DATABASE_URL = "sqlite:///./cosint.db"
 
 engine = create_engine(DATABASE_URL)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -68,6 +70,174 @@ class ResearchNote(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# --- Tracked-bill polling (app/services/bill_poller.py) ---
+# One row per distinct tracked bill, however many users track it.
+
+class BillWatch(Base):
+    __tablename__ = "bill_watches"
+
+    bill_key = Column(String, primary_key=True) # e.g. "118-hr-1"
+    congress = Column(Integer, nullable=False)
+    bill_type = Column(String, nullable=False)
+    bill_number = Column(String, nullable=False)
+    update_date = Column(String) # Congress.gov updateDate at the last check
+    latest_action_date = Column(String)
+    latest_action_text = Column(Text)
+    # Newest action date seen and the actions already seen on that date (JSON list of keys)
+    action_watermark = Column(String)
+    watermark_keys = Column(Text)
+    last_checked = Column(DateTime)
+    last_changed = Column(DateTime)
+
+class BillUpdate(Base):
+    __tablename__ = "bill_updates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bill_key = Column(String, nullable=False, index=True)
+    action_date = Column(String)
+    action_code = Column(String)
+    text = Column(Text)
+    detected_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+# --- Intel packets (app/services/intel_packets.py) ---
+# Facts extracted from chat answers, one row per distinct fact about a subject per user.
+
+class IntelPacketRecord(Base):
+    __tablename__ = "intel_packets"
+    __table_args__ = (
+        UniqueConstraint("user_id", "subject_key", "fact_hash"),
+        Index("ix_intel_packets_user_member", "user_id", "bioguide_id", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(String, nullable=False)
+    bioguide_id = Column(String, nullable=True) # member whose page the fact was captured on
+    subject_name = Column(String)
+    subject_key = Column(String, nullable=False) # normalized subject name
+    title = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    fact_hash = Column(String, nullable=False) # hash of the normalized content
+    # The answer the fact was extracted from: exact hash and 64-bit SimHash
+    source_hash = Column(String, nullable=True)
+    source_simhash = Column(BigInteger, nullable=True)
+    conversation_id = Column(UUID(as_uuid=True), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# --- Congress.gov mirror ---
+# Optional local copy of Congress.gov data kept up to date by app/services/cosint/mirror.py.
+# Lives in its own metadata so it can sit in a separate (e.g. SQLite) database.
+MIRROR_DATABASE_URL = os.getenv("CONGRESS_MIRROR_DATABASE_URL") or DATABASE_URL
+
+if MIRROR_DATABASE_URL == DATABASE_URL:
+    mirror_engine = engine
+else:
+    mirror_engine = create_engine(MIRROR_DATABASE_URL)
+    instrument_engine(mirror_engine)
+MirrorSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=mirror_engine)
+MirrorBase = declarative_base()
+
+class MirrorMember(MirrorBase):
+    __tablename__ = "mirror_members"
+
+    bioguide_id = Column(String, primary_key=True)
+    name = Column(String)
+    state_code = Column(String, index=True)
+    district = Column(Integer, nullable=True)
+    current_member = Column(Boolean, default=False, index=True)
+    update_date = Column(String)
+    payload = Column(Text) # member list item as JSON
+    detail = Column(Text, nullable=True) # member detail as JSON
+
+class MirrorBill(MirrorBase):
+    __tablename__ = "mirror_bills"
+
+    bill_id = Column(String, primary_key=True) # e.g., "118-hr-1"
+    congress = Column(Integer, index=True)
+    bill_type = Column(String)
+    bill_number = Column(String)
+    update_date = Column(String)
+    payload = Column(Text) # bill list item as JSON
+    detail = Column(Text, nullable=True) # bill detail as JSON
+
+class MirrorBillAction(MirrorBase):
+    __tablename__ = "mirror_bill_actions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bill_id = Column(String, index=True, nullable=False)
+    action_date = Column(String, index=True)
+    payload = Column(Text)
+
+class MirrorBillCosponsor(MirrorBase):
+    __tablename__ = "mirror_bill_cosponsors"
+
+    bill_id = Column(String, primary_key=True)
+    bioguide_id = Column(String, primary_key=True, index=True)
+    sponsorship_date = Column(String)
+    payload = Column(Text)
+
+class MirrorRollCall(MirrorBase):
+    __tablename__ = "mirror_roll_calls"
+
+    roll_call_id = Column(String, primary_key=True) # e.g., "119-1-300"
+    congress = Column(Integer)
+    session = Column(Integer)
+    roll_call = Column(Integer)
+    start_date = Column(String, index=True)
+    update_date = Column(String)
+    payload = Column(Text)
+
+class MirrorRollCallVote(MirrorBase):
+    __tablename__ = "mirror_roll_call_votes"
+
+    roll_call_id = Column(String, primary_key=True)
+    bioguide_id = Column(String, primary_key=True)
+    vote_cast = Column(String)
+
+class MirrorSyncState(MirrorBase):
+    __tablename__ = "mirror_sync_state"
+
+    resource = Column(String, primary_key=True) # e.g., "members", "bills:119", "house_votes:119"
+    last_synced = Column(DateTime)
+
+# --- Bill history (app/services/cosint/bill_history.py) ---
+# Append-only actions and cosponsors of every bill looked up, in the mirror database.
+
+class BillActionLog(MirrorBase):
+    __tablename__ = "bill_action_log"
+    __table_args__ = (UniqueConstraint("bill_id", "action_key"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True) # increases with time within a bill
+    bill_id = Column(String, index=True, nullable=False) # e.g., "118-hr-1"
+    action_key = Column(String, nullable=False) # hash of date, code and text
+    action_date = Column(String)
+    payload = Column(Text)
+
+class BillCosponsorLog(MirrorBase):
+    __tablename__ = "bill_cosponsor_log"
+
+    bill_id = Column(String, primary_key=True)
+    bioguide_id = Column(String, primary_key=True)
+    sponsorship_date = Column(String)
+    payload = Column(Text) # updated in place when a cosponsor withdraws
+
+class BillSponsorLog(MirrorBase):
+    __tablename__ = "bill_sponsor_log"
+
+    bill_id = Column(String, primary_key=True)
+    bioguide_id = Column(String, index=True)
+    name = Column(String)
+    party = Column(String)
+
+class BillHistoryState(MirrorBase):
+    __tablename__ = "bill_history_state"
+
+    bill_id = Column(String, primary_key=True)
+    actions_through = Column(String, nullable=True) # newest action date stored
+    cosponsors_through = Column(String, nullable=True) # newest sponsorship date stored
+    cosponsor_count = Column(Integer, nullable=True) # Congress.gov's count, including withdrawn cosponsors
+    withdrawn_count = Column(Integer, nullable=True)
+    refreshed_at = Column(DateTime)
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -79,3 +249,23 @@ def get_db():
 # Create tables if they don't exist (useful for initial setup)
 def init_db():
     Base.metadata.create_all(bind=engine)
+    if mirror_engine is engine:
+        MirrorBase.metadata.create_all(bind=engine)
+
+def init_mirror_db():
+    """
+    Create the mirror tables when the mirror has its own database, which the
+    migrations don't manage. In the main database they come from the migrations
+    (or init_db). Runs once at startup, not per request.
+    """
+    if mirror_engine is not engine:
+        MirrorBase.metadata.create_all(bind=mirror_engine)
+
+def dispose_engines():
+    """
+    Forget pooled connections inherited from a parent process (gunicorn preload_app)
+    without closing them, so each worker opens its own.
+    """
+    engine.dispose(close=False)
+    if mirror_engine is not engine:
+        mirror_engine.dispose(close=False)
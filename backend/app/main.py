@@ -1,18 +1,82 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel
+from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
-from .database import init_db
-from .routers import chat, intelligence, notebook
+from .database import init_db, init_mirror_db
+from .routers import chat, intelligence, notebook, districts, briefings
+from .routers.auth import jwks_cache
+from .services.warmup_service import warmup_scheduler, WARMUP_ENABLED
+from .services.bill_poller import bill_poll_scheduler, BILL_POLL_ENABLED
+from .services.member_profiles import member_profile_scheduler, MEMBER_PROFILE_REFRESH_ENABLED
+from .services.cosponsor_graph import cosponsor_graph_scheduler, COSPONSOR_GRAPH_REFRESH_ENABLED
+from .services.bill_index import bill_index_scheduler, BILL_INDEX_ENABLED
+from .services.brave_search_client import close_clients as close_search_clients
+from .services.preload import preload_agent_modules, PRELOAD_AGENT
+from .services.telemetry import request_scope, server_timing_header, setup_tracing, REQUEST_SECONDS
 from dotenv import load_dotenv
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, CollectorRegistry, multiprocess
+import asyncio
+import os
+import time
 
 # Load environment variables
 load_dotenv()
 
 app = FastAPI(title="COSINT API")
+setup_tracing()
 
-# Initialize database tables on startup
+# Initialize database tables on startup (gunicorn.conf.py does it once in the master instead)
 @app.on_event("startup")
 def startup_event():
-    init_db()
+    if os.getenv("DB_INIT_ON_STARTUP", "true").lower() == "true":
+        init_db()
+        init_mirror_db()
+
+# Keep the Supabase JWKS warm so token verification never waits on a fetch
+@app.on_event("startup")
+async def start_jwks_refresher():
+    app.state.jwks_refresher = asyncio.create_task(jwks_cache.run_refresher())
+
+# Pre-populate member and bill data so the first page view after a deploy is warm
+@app.on_event("startup")
+async def start_warmup():
+    if WARMUP_ENABLED:
+        app.state.warmup = asyncio.create_task(warmup_scheduler.run())
+
+# Check tracked bills for new actions (feeds /tracked-bills/updates)
+@app.on_event("startup")
+async def start_bill_poller():
+    if BILL_POLL_ENABLED:
+        app.state.bill_poller = asyncio.create_task(bill_poll_scheduler.run())
+
+# Keep materialized member pages current (new roll calls, refreshed member data)
+@app.on_event("startup")
+async def start_member_profile_refresher():
+    if MEMBER_PROFILE_REFRESH_ENABLED:
+        app.state.member_profile_refresher = asyncio.create_task(member_profile_scheduler.run())
+
+# Fold newly stored cosponsor lists into the co-sponsorship graph
+@app.on_event("startup")
+async def start_cosponsor_graph_refresher():
+    if COSPONSOR_GRAPH_REFRESH_ENABLED:
+        app.state.cosponsor_graph_refresher = asyncio.create_task(cosponsor_graph_scheduler.run())
+
+# Embed newly fetched bills into the similar-bills index
+@app.on_event("startup")
+async def start_bill_indexer():
+    if BILL_INDEX_ENABLED:
+        app.state.bill_indexer = asyncio.create_task(bill_index_scheduler.run())
+
+# The agent stack is imported after startup, so the server answers health checks right
+# away (scale-to-zero cold starts) and the first chat doesn't wait on the imports
+@app.on_event("startup")
+async def start_agent_preload():
+    if PRELOAD_AGENT:
+        app.state.agent_preload = asyncio.create_task(asyncio.to_thread(preload_agent_modules))
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_search_clients()
 
 # Enable CORS
 app.add_middleware(
@@ -21,18 +85,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Conversation-Id"],
+    expose_headers=["X-Conversation-Id", "Server-Timing"],
 )
 
+# Per-request timing breakdown (upstream, cache, tools, LLM, DB) as a Server-Timing header
+@app.middleware("http")
+async def server_timing_middleware(request: Request, call_next):
+    with request_scope() as timings:
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        REQUEST_SECONDS.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=response.status_code
+        ).observe(elapsed)
+        timings["total"] = [elapsed * 1000, 1]
+        response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
+
 # Include Routers
 app.include_router(chat.router)
 app.include_router(intelligence.router)
 app.include_router(notebook.router)
+app.include_router(districts.router)
+app.include_router(briefings.router)
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    # Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR; report them all
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/system/model")
 async def get_model_info():
     from .services.cosint.agent import COSINT_AGENT_MODEL
@@ -42,8 +134,27 @@ async def get_model_info():
 async def clear_cache():
     from .services.cache_service import cache
     cache.clear()
+    warmup_scheduler.trigger()
     return {"status": "cache cleared"}
 
+@app.get("/system/cache/stats")
+async def get_cache_stats():
+    from .services.cache_service import cache_stats
+    return cache_stats()
+
+class CacheEvictRequest(BaseModel):
+    namespace: Optional[str] = None # e.g. 'congress', 'answer'
+    function: Optional[str] = None # e.g. 'get_member_details'
+    entity: Optional[str] = None # e.g. 'member:B001288', 'bill:118-hr-1'
+
+@app.post("/system/cache/evict")
+async def evict_cache(request: CacheEvictRequest):
+    from .services.cache_service import evict
+    if not (request.namespace or request.function or request.entity):
+        raise HTTPException(status_code=400, detail="Provide a namespace, function or entity to evict")
+    removed = evict(request.namespace, request.function, request.entity)
+    return {"status": "evicted", "removed": removed}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,67 +1,176 @@
 import os
-import requests
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+import httpx
 from fastapi import Header, HTTPException
 from jose import jwt
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# JWT Verification Logic using JWKS (Supports ES256)
-_jwks_cache = None
+# How long a fetched JWKS is trusted before it is refreshed in the background
+JWKS_TTL = int(os.getenv("JWKS_TTL", "3600"))
+# Minimum gap between two JWKS fetches, so a wave of tokens with unknown kids
+# can't turn into a wave of requests to Supabase
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30"))
+# Number of already-verified tokens kept in memory
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "2048"))
 
-def get_jwks():
-    global _jwks_cache
-    if _jwks_cache is None:
+
+class JWKSCache:
+    """
+    Supabase signing keys indexed by kid.
+    Keys are refreshed in the background once older than the TTL, and fetches
+    (including the ones triggered by an unknown kid) are rate-limited.
+    """
+    def __init__(self, ttl: int = JWKS_TTL, min_refresh_interval: int = JWKS_MIN_REFRESH_INTERVAL):
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.keys: Dict[str, Dict[str, Any]] = {}
+        self.fetched_at = 0.0
+        self.last_attempt = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _jwks_url(self) -> str:
         supabase_url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
         if not supabase_url:
             raise HTTPException(status_code=500, detail="SUPABASE_URL not configured")
-            
-        jwks_url = f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
-        try:
-            response = requests.get(jwks_url)
-            response.raise_for_status()
-            _jwks_cache = response.json()
-        except Exception as e:
-            print(f"Failed to fetch JWKS from {jwks_url}: {e}")
-            raise HTTPException(status_code=500, detail="Internal authentication error")
-    return _jwks_cache
+        return f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+    async def refresh(self):
+        """
+        Fetch the JWKS unless another fetch happened within the refresh interval.
+        On failure the previously known keys are kept.
+        """
+        jwks_url = self._jwks_url()
+        async with self._lock:
+            if time.monotonic() - self.last_attempt < self.min_refresh_interval:
+                return
+            self.last_attempt = time.monotonic()
+            try:
+                async with httpx.AsyncClient(timeout=5) as client:
+                    response = await client.get(jwks_url)
+                    response.raise_for_status()
+                    jwks = response.json()
+                self.keys = {k["kid"]: k for k in jwks.get("keys", []) if "kid" in k}
+                self.fetched_at = time.monotonic()
+            except Exception as e:
+                print(f"Failed to fetch JWKS from {jwks_url}: {e}")
+
+    def schedule_refresh(self):
+        """Refresh in the background without making the current request wait."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def run_refresher(self):
+        """Long-running task that keeps the keys fresh on the TTL."""
+        while True:
+            try:
+                await self.refresh()
+            except HTTPException as e:
+                print(f"JWKS refresher: {e.detail}")
+            await asyncio.sleep(self.ttl)
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not self.keys:
+            await self.refresh()
+            if not self.keys:
+                raise HTTPException(status_code=500, detail="Internal authentication error")
+        elif time.monotonic() - self.fetched_at > self.ttl:
+            self.schedule_refresh()
+
+        key_json = self.keys.get(kid)
+        if key_json is None:
+            # Keys may have been rotated; refetch (rate-limited) and try once more
+            await self.refresh()
+            key_json = self.keys.get(kid)
+        return key_json
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens that already passed signature verification.
+    Entries are keyed by the token's SHA-256 and dropped at the token's exp.
+    """
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        user_id, exp = entry
+        if exp <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user_id
+
+    def put(self, token: str, user_id: str, exp: Optional[float]):
+        # Tokens without an expiry are never cached
+        if not exp:
+            return
+        key = self._key(token)
+        self._entries[key] = (user_id, float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+jwks_cache = JWKSCache()
+verified_tokens = VerifiedTokenCache()
+
 
 async def get_current_user(authorization: str = Header(None)):
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid token")
-    
+
     token = authorization.split(" ")[1]
+
+    # Fast path: this exact token was verified before and hasn't expired
+    user_id = verified_tokens.get(token)
+    if user_id:
+        return user_id
+
     try:
         # 1. Get the Key ID (kid) from the token header
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get("kid")
-        
+
         # 2. Get the corresponding public key from JWKS
-        jwks = get_jwks()
-        key_json = next((k for k in jwks["keys"] if k["kid"] == kid), None)
-        
-        if not key_json:
-            # Refresh cache and try again once if key not found
-            global _jwks_cache
-            _jwks_cache = None
-            jwks = get_jwks()
-            key_json = next((k for k in jwks["keys"] if k["kid"] == kid), None)
-            
+        key_json = await jwks_cache.get_key(kid)
         if not key_json:
             raise HTTPException(status_code=401, detail="Invalid token: unknown key ID")
 
         # 3. Verify the token using the public key
         payload = jwt.decode(
-            token, 
-            key_json, 
-            algorithms=["ES256", "HS256"], 
+            token,
+            key_json,
+            algorithms=["ES256", "HS256"],
             audience="authenticated"
         )
-        
+
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token payload")
+
+        verified_tokens.put(token, user_id, payload.get("exp"))
         return user_id
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"JWT Verification Failed: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Token verification failed: {str(e)}")
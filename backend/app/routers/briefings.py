@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Optional, List
+from .auth import get_current_user
+from ..services.briefings import BriefingJob
+from ..services.sse import stream_events
+
+router = APIRouter(tags=["briefings"])
+
+class BriefingRequest(BaseModel):
+    bioguide_ids: Optional[List[str]] = None
+    state: Optional[str] = None # e.g. 'NJ'
+    committee: Optional[str] = None # committee name or system code, e.g. 'ssfr00'
+
+@router.post("/briefings")
+async def create_briefings(request: BriefingRequest, http_request: Request, user_id: str = Depends(get_current_user)):
+    """
+    Generate briefings for a list of members, a state delegation and/or a committee.
+    Streams SSE events: "members" (the selection), one "briefing" or
+    "briefing_error" per member as each completes, then "done".
+    """
+    if not (request.bioguide_ids or request.state or request.committee):
+        raise HTTPException(status_code=400, detail="Provide bioguide_ids, a state or a committee")
+
+    job = BriefingJob()
+
+    async def produce(emit):
+        await job.run(emit, request.bioguide_ids, request.state, request.committee)
+
+    return StreamingResponse(
+        stream_events(produce, http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
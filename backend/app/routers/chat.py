@@ -1,15 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from ..database import get_db, Conversation, Message, SessionLocal, TrackedBill
-from ..services.cosint.agent import get_cosint_agent
+from ..services.answer_cache import answer_cache, replay_chunks
+from ..services.intel_packets import already_extracted, record_packet
+from ..services.cache_service import record_dependencies
+from ..services.brave_search_client import search_memo
+from ..services.telemetry import record_time_to_first_token
+from ..services.sse import stream_events
+from ..services.deadlines import agent_slot, deadline_scope, run_blocking, DeadlineExceeded, AGENT_RUN_TIMEOUT, TOOL_TIMEOUT
+import asyncio
+import time
 from .auth import get_current_user
 import re
+import uuid
 
 router = APIRouter(tags=["chat"])
 
+INTEL_PACKET_RE = re.compile(r"\s*\[INTEL_PACKET:\s*([^|]+)\|\s*([\s\S]*?)\|END_PACKET\]")
+
+def tool_source(tool_name: str) -> str:
+    """Where a tool gets its data, for the client's progress indicator."""
+    if "congress" in tool_name or "member" in tool_name:
+        return "Congress.gov"
+    if "address" in tool_name or "civic" in tool_name:
+        return "Google Civic Data"
+    if "search" in tool_name:
+        return "Brave Web Search"
+    return "external sources"
+
 class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
@@ -18,18 +39,22 @@ class ChatRequest(BaseModel):
 
 @router.get("/conversations/{conversation_id}/messages")
 async def get_messages(conversation_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conv = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    try:
+        conv_uuid = uuid.UUID(conversation_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    conv = db.query(Conversation).filter(Conversation.id == conv_uuid).first()
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
     if conv.user_id and str(conv.user_id) != user_id:
         raise HTTPException(status_code=403, detail="Forbidden")
     
-    messages = db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at.asc()).all()
+    messages = db.query(Message).filter(Message.conversation_id == conv_uuid).order_by(Message.created_at.asc()).all()
     return [{"role": m.role, "content": m.content} for m in messages]
 
 @router.post("/chat/stream")
-async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+async def chat_stream_endpoint(request: ChatRequest, http_request: Request, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
     # 1. Ensure conversation exists and belongs to user
     if not request.conversation_id:
         conv = Conversation(
@@ -40,9 +65,14 @@ async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_
         db.commit()
         db.refresh(conv)
         conv_id = str(conv.id)
+        conv_uuid = conv.id
     else:
         conv_id = request.conversation_id
-        conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
+        try:
+            conv_uuid = uuid.UUID(conv_id)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        conv = db.query(Conversation).filter(Conversation.id == conv_uuid).first()
         
         if conv and conv.user_id and str(conv.user_id) != user_id:
             raise HTTPException(status_code=403, detail="Forbidden")
@@ -52,61 +82,135 @@ async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_
             db.commit()
 
     # 2. Get history from DB
-    db_messages = db.query(Message).filter(Message.conversation_id == conv_id).order_by(Message.created_at.asc()).all()
+    db_messages = db.query(Message).filter(Message.conversation_id == conv_uuid).order_by(Message.created_at.asc()).all()
     history = [(m.role, m.content) for m in db_messages]
 
     # 3. Save user message to DB
-    user_msg = Message(conversation_id=conv_id, role="human", content=request.message)
+    user_msg = Message(conversation_id=conv_uuid, role="human", content=request.message)
     db.add(user_msg)
     db.commit()
 
-    async def event_generator():
+    context = request.initial_context or "General inquiry mode."
+    # Only opening questions go through the answer cache; follow-ups depend on history
+    cacheable = not history
+    page_member = re.search(r"profile of (.+?) \(Bioguide", request.initial_context or "")
+
+    async def fast_path():
+        """(route, answer) when the turn needs no agent run, else None."""
+        from ..services.cosint.agent import route_turn, answer_route
+
+        route = route_turn(request.message)
+        if route is None:
+            return None
         try:
-            agent_executor = get_cosint_agent(streaming=True)
-            full_response = ""
-            
-            async for event in agent_executor.astream_events(
-                {
-                    "input": request.message, 
-                    "chat_history": history,
-                    "context": request.initial_context or "General inquiry mode."
-                },
-                version="v2"
-            ):
-                kind = event["event"]
-                if kind == "on_chat_model_stream":
-                    content = event["data"]["chunk"].content
-                    if content:
-                        full_response += content
-                        yield content
-                elif kind == "on_tool_start":
-                    tool_name = event['name']
-                    source = "external sources"
-                    if "congress" in tool_name or "member" in tool_name:
-                        source = "Congress.gov"
-                    elif "address" in tool_name or "civic" in tool_name:
-                        source = "Google Civic Data"
-                    elif "search" in tool_name:
-                        source = "Brave Web Search"
-                    yield f"\n\n*Accessing information from {source}...*\n\n"
+            answer = await run_blocking(answer_route, route, timeout=TOOL_TIMEOUT)
+        except Exception as e:
+            print(f"Fast path {route.name} failed, using the agent: {e}")
+            return None
+        return (route, answer) if answer else None
+
+    async def run_turn(emit, fast=None):
+        started = time.perf_counter()
+        first_chunk = True
+
+        def emit_token(text: str):
+            nonlocal first_chunk
+            if first_chunk:
+                record_time_to_first_token()
+                first_chunk = False
+            emit("token", {"text": text})
+
+        # LangChain is imported on first use (or by the startup preload), not with the router
+        from ..services.cosint.agent import get_cosint_agent, needs_extraction, route_ledger
+        from ..services.cosint.callbacks import TelemetryCallbackHandler
+
+        full_response = ""
+        telemetry = TelemetryCallbackHandler()
+
+        def store_packet(title: str, content: str, subject_name: Optional[str]):
+            with SessionLocal() as intel_db:
+                stored = record_packet(intel_db, user_id, request.bioguide_id, conv_uuid, title, content, subject_name, full_response)
+                return {"title": stored.title, "content": stored.content} if stored else None
+
+        def answer_extracted() -> bool:
+            with SessionLocal() as intel_db:
+                return already_extracted(intel_db, user_id, request.bioguide_id, full_response)
+
+        async def capture(title: str, content: str, subject_name: Optional[str]):
+            """Store the packet and send it to the client, unless the user already has it."""
+            stored = await run_blocking(store_packet, title, content, subject_name)
+            if stored:
+                emit("intel", stored)
+
+        cached_response, question_vector = await answer_cache.lookup(request.message, context) if cacheable and not fast else (None, None)
+        if fast:
+            # Answered without an LLM call, and nothing in it to extract
+            route, full_response = fast
+            for chunk in replay_chunks(full_response):
+                emit_token(chunk)
+            route_ledger.avoided(route.name, ["agent", "extraction"], time.perf_counter() - started)
+        elif cached_response:
+            packet = INTEL_PACKET_RE.search(cached_response)
+            full_response = INTEL_PACKET_RE.sub("", cached_response)
+            for chunk in replay_chunks(full_response):
+                emit_token(chunk)
+            if packet:
+                await capture(packet.group(1).strip(), packet.group(2).strip(), page_member.group(1).strip() if page_member else None)
+            route_ledger.avoided("answer_cache", ["agent", "extraction"], time.perf_counter() - started)
+        else:
+            # Record which cached Congress data the answer is built from, and
+            # let repeated web searches within this turn reuse the first result
+            with record_dependencies() as dependencies, search_memo():
+                agent_executor = get_cosint_agent(streaming=True)
+
+                async for event in agent_executor.astream_events(
+                    {
+                        "input": request.message,
+                        "chat_history": history,
+                        "context": context
+                    },
+                    version="v2",
+                    config={"callbacks": [telemetry]}
+                ):
+                    kind = event["event"]
+                    if kind == "on_chat_model_stream":
+                        content = event["data"]["chunk"].content
+                        if content:
+                            full_response += content
+                            emit_token(content)
+                    elif kind == "on_tool_start":
+                        emit("tool_start", {"tool": event["name"], "source": tool_source(event["name"])})
+                    elif kind == "on_tool_end":
+                        emit("tool_end", {"tool": event["name"]})
+            route_ledger.observe("agent", telemetry.cost(), time.perf_counter() - started)
 
             # 4. Intel Extraction Step
+            packet_tag = ""
             try:
                 from ..services.cosint.agent import get_intel_extraction_agent
-                extraction_agent = get_intel_extraction_agent()
 
-                intel = await extraction_agent.ainvoke({"response": full_response})
+                # Conversational replies hold no fact, and an answer the user
+                # already got a packet from would only yield the same one again
+                skip = not needs_extraction(full_response)
+                if not skip:
+                    skip = await run_blocking(answer_extracted)
+                intel = None
+                if skip:
+                    route_ledger.avoided("extraction_skipped", ["extraction"])
+                else:
+                    extraction_started, agent_cost = time.perf_counter(), telemetry.cost()
+                    extraction_agent = get_intel_extraction_agent()
+                    intel = await extraction_agent.ainvoke({"response": full_response}, config={"callbacks": [telemetry]})
+                    route_ledger.observe("extraction", telemetry.cost() - agent_cost, time.perf_counter() - extraction_started)
 
-                if intel.is_useful:
+                if intel and intel.is_useful:
                     # Hard relevance gate: if we're on a specific member's page,
                     # only allow intel that is actually about that member
                     if request.bioguide_id and request.initial_context:
-                        # Extract the member name from the initial_context
+                        # The member name comes from the initial_context
                         # Format: "The user is currently viewing the profile of NAME (Bioguide ID: ...)"
-                        import re as re_mod
-                        name_match = re_mod.search(r"profile of (.+?) \(Bioguide", request.initial_context)
-                        if name_match:
-                            page_member_name = name_match.group(1).strip().lower()
+                        if page_member:
+                            page_member_name = page_member.group(1).strip().lower()
                             intel_subject = intel.subject_name.strip().lower()
 
                             # Check if the intel subject matches the page member
@@ -125,57 +229,79 @@ async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_
                                 intel = None
 
                     if intel:
+                        await capture(intel.title, intel.content, intel.subject_name)
+                        # Cached replays carry the packet; the stored message doesn't
                         packet_tag = f"\n\n[INTEL_PACKET: {intel.title} | {intel.content} |END_PACKET]"
-                        yield packet_tag
-                        full_response += packet_tag
             except Exception as e:
                 print(f"Intel extraction failed: {e}")
 
-            # 5. Save assistant message to DB after stream finishes
-            with SessionLocal() as save_db:
-                assistant_msg = Message(conversation_id=conv_id, role="assistant", content=full_response)
-                save_db.add(assistant_msg)
+            # Tracking requests act on the user's notebook, so they are never replayed
+            if cacheable and full_response and "[TRACK_BILL" not in full_response:
+                await answer_cache.store(request.message, context, full_response + packet_tag, dependencies, question_vector)
+
+        # 5. Save assistant message to DB after stream finishes
+        with SessionLocal() as save_db:
+            assistant_msg = Message(conversation_id=conv_uuid, role="assistant", content=full_response)
+            save_db.add(assistant_msg)
                 
-                # CHECK FOR BILL TRACKING
-                track_match = re.search(r"\[TRACK_BILL:\s*(\d+)\s*\|\s*([^|]+)\|\s*([^|]+)\|\s*([^\]]+)\]", full_response)
-                if track_match:
-                    congress = int(track_match.group(1))
-                    bill_type = track_match.group(2).strip()
-                    bill_number = track_match.group(3).strip()
-                    title = track_match.group(4).strip()
-                    bill_id = f"{congress}-{bill_type}-{bill_number}".lower()
+            # CHECK FOR BILL TRACKING
+            track_match = re.search(r"\[TRACK_BILL:\s*(\d+)\s*\|\s*([^|]+)\|\s*([^|]+)\|\s*([^\]]+)\]", full_response)
+            if track_match:
+                congress = int(track_match.group(1))
+                bill_type = track_match.group(2).strip()
+                bill_number = track_match.group(3).strip()
+                title = track_match.group(4).strip()
+                bill_id = f"{congress}-{bill_type}-{bill_number}".lower()
                     
-                    existing = save_db.query(TrackedBill).filter(
-                        TrackedBill.user_id == user_id,
-                        TrackedBill.bill_id == bill_id
-                    ).first()
+                existing = save_db.query(TrackedBill).filter(
+                    TrackedBill.user_id == user_id,
+                    TrackedBill.bill_id == bill_id
+                ).first()
                     
-                    if not existing:
-                        new_track = TrackedBill(
-                            user_id=user_id,
-                            bill_id=bill_id,
-                            bill_type=bill_type,
-                            bill_number=bill_number,
-                            congress=congress,
-                            title=title
-                        )
-                        save_db.add(new_track)
+                if not existing:
+                    new_track = TrackedBill(
+                        user_id=user_id,
+                        bill_id=bill_id,
+                        bill_type=bill_type,
+                        bill_number=bill_number,
+                        congress=congress,
+                        title=title
+                    )
+                    save_db.add(new_track)
                 
-                save_db.commit()
+            save_db.commit()
 
-                # 6. PRUNING LOGIC
-                try:
-                    limit = 10
-                    all_msgs = save_db.query(Message).filter(Message.conversation_id == conv_id).order_by(Message.created_at.desc()).all()
-                    if len(all_msgs) > limit:
-                        msgs_to_delete = all_msgs[limit:]
-                        for m in msgs_to_delete:
-                            save_db.delete(m)
-                        save_db.commit()
-                except Exception as prune_err:
-                    print(f"Chat pruning failed: {prune_err}")
+            # 6. PRUNING LOGIC
+            try:
+                limit = 10
+                all_msgs = save_db.query(Message).filter(Message.conversation_id == conv_uuid).order_by(Message.created_at.desc()).all()
+                if len(all_msgs) > limit:
+                    msgs_to_delete = all_msgs[limit:]
+                    for m in msgs_to_delete:
+                        save_db.delete(m)
+                    save_db.commit()
+            except Exception as prune_err:
+                print(f"Chat pruning failed: {prune_err}")
 
-        except Exception as e:
-            yield f"\n\nError: {str(e)}"
+        emit("done", {"conversation_id": conv_id})
+
+    async def guarded_turn(emit):
+        # Fast-path turns make no LLM call, so they don't wait for an agent slot
+        fast = await fast_path()
+        if fast:
+            await run_turn(emit, fast)
+            return
+        # Bounded number of concurrent agent runs, each with a hard deadline
+        # that also caps every tool and upstream request made inside it
+        async with agent_slot():
+            with deadline_scope(AGENT_RUN_TIMEOUT):
+                try:
+                    await asyncio.wait_for(run_turn(emit), AGENT_RUN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded(f"The request took longer than {AGENT_RUN_TIMEOUT:.0f} seconds and was stopped.")
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream", headers={"X-Conversation-Id": conv_id})
+    return StreamingResponse(
+        stream_events(guarded_turn, http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"X-Conversation-Id": conv_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response
+from typing import List, Dict, Any
+import asyncio
+import csv
+import io
+from .auth import get_current_user
+from ..services.district_resolver import district_resolver, BATCH_RESOLVE_MAX_ADDRESSES
+
+router = APIRouter(tags=["districts"])
+
+OUTPUT_COLUMNS = [
+    "state", "district", "representative", "representative_bioguide_id", "senators",
+    "state_senate_district", "state_house_district", "county", "error",
+]
+
+def _flatten(result: Dict[str, Any]) -> Dict[str, Any]:
+    representatives = result.get("representatives") or []
+    divisions = result.get("divisions") or {}
+    return {
+        "state": result.get("state") or "",
+        "district": "" if result.get("district") is None else result["district"],
+        "representative": "; ".join(r.get("name") or "" for r in representatives),
+        "representative_bioguide_id": "; ".join(r.get("bioguideId") or "" for r in representatives),
+        "senators": "; ".join(s.get("name") or "" for s in result.get("senators") or []),
+        "state_senate_district": divisions.get("sldu") or "",
+        "state_house_district": divisions.get("sldl") or "",
+        "county": divisions.get("county") or "",
+        "error": result.get("error", ""),
+    }
+
+def _read_addresses(content: str):
+    """
+    Rows and the address of each row. Uses the "address" column when the CSV
+    has one, otherwise treats the first column as the address (no header).
+    """
+    rows = list(csv.reader(io.StringIO(content)))
+    if not rows:
+        return [], [], []
+    header = [h.strip().lower() for h in rows[0]]
+    if "address" in header:
+        index = header.index("address")
+        return rows[0], rows[1:], [row[index] if index < len(row) else "" for row in rows[1:]]
+    return [], rows, [row[0] if row else "" for row in rows]
+
+@router.get("/district")
+async def resolve_district(address: str, user_id: str = Depends(get_current_user)):
+    try:
+        result = await asyncio.to_thread(district_resolver.resolve_delegation, address)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return dict(result, address=address)
+
+@router.post("/district/batch")
+async def resolve_districts_batch(file: UploadFile = File(...), format: str = "csv", user_id: str = Depends(get_current_user)):
+    """
+    Resolve a CSV of constituent addresses to their districts and delegations.
+    Returns the uploaded rows with the resolution appended (CSV), or a JSON list.
+    """
+    content = (await file.read()).decode("utf-8-sig")
+    header, rows, addresses = _read_addresses(content)
+    if not addresses:
+        raise HTTPException(status_code=400, detail="No addresses found in the upload")
+    if len(addresses) > BATCH_RESOLVE_MAX_ADDRESSES:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_RESOLVE_MAX_ADDRESSES} addresses per upload")
+
+    try:
+        results = await district_resolver.resolve_addresses(addresses)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    if format == "json":
+        return results
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow((header or ["address"]) + OUTPUT_COLUMNS)
+    for row, result in zip(rows, results):
+        flat = _flatten(result)
+        writer.writerow((row if header else row[:1]) + [flat[c] for c in OUTPUT_COLUMNS])
+    return Response(
+        output.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="districts.csv"'},
+    )
@@ -1,86 +1,120 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from ..services.cosint.api_client import CongressAPIClient
-from ..services.cosint.agent import get_bill_analysis_agent
+from ..services.warmup_service import record_access
+from ..services.member_profiles import MemberProfiles, cached_profile
+from ..services.legislation_analytics import LegislationAnalytics
+from ..services.cosponsor_graph import current_graph
+from ..services.bill_index import similar_bills
+from typing import Optional
 import re
+import time
+import asyncio
 
 router = APIRouter(tags=["intelligence"])
 
 @router.get("/member/{bioguide_id}")
 async def get_member_dashboard(bioguide_id: str):
-    client = CongressAPIClient()
+    # Materialized by member_profiles.py as the response body; only a missing profile is built here
+    _, body = await asyncio.gather(
+        asyncio.to_thread(record_access, "member", bioguide_id),
+        asyncio.to_thread(cached_profile, bioguide_id),
+    )
+    if body is None:
+        try:
+            body = await asyncio.to_thread(lambda: MemberProfiles().get(bioguide_id))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=body, media_type="application/json")
+
+@router.get("/member/{bioguide_id}/legislation")
+async def get_member_legislation(bioguide_id: str, congress: Optional[int] = None):
+    """
+    Statistics over everything the member sponsored and cosponsored (optionally
+    one congress): counts by policy area, congress and status, pass rates and
+    co-sponsorship degree.
+    """
     try:
-        details = client.get_member_details(bioguide_id)
-        bills = client.get_sponsored_legislation(bioguide_id, limit=10)
-        
-        # Get recent votes - fetch more to allow for filtering
-        recent_votes_raw = client.get_recent_house_votes(limit=15)
-        votes = []
-        for v in recent_votes_raw:
-            # Skip amendments (H.Amdt / S.Amdt)
-            leg_type = v.get("legislationType", "").upper()
-            if "AMDT" in leg_type:
-                continue
-                
-            # Fetch bill title for more context
-            bill_details = {}
-            if v.get("legislationNumber") and v.get("legislationType"):
-                try:
-                    bill_details = client.get_bill_details(
-                        v.get("congress"), 
-                        v.get("legislationType"), 
-                        v.get("legislationNumber")
-                    )
-                except:
-                    pass
+        return await asyncio.to_thread(lambda: LegislationAnalytics().member_report(bioguide_id, congress))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            vote_cast = client.get_member_vote_on_roll_call(
-                v.get("congress"), 
-                v.get("sessionNumber"), 
-                v.get("rollCallNumber"), 
-                bioguide_id
-            )
-            votes.append({
-                "legislation": v.get("legislationNumber", "N/A"),
-                "legislationUrl": v.get("legislationUrl"),
-                "legislationTitle": bill_details.get("title", "No title available"),
-                "congress": v.get("congress"),
-                "type": v.get("legislationType"),
-                "number": v.get("legislationNumber"),
-                "question": v.get("voteQuestion"),
-                "vote": vote_cast or "Not Voting",
-                "result": v.get("result"),
-                "date": v.get("startDate")
-            })
+@router.get("/legislation/stats")
+async def get_legislation_stats(chamber: Optional[str] = None, congress: Optional[int] = None):
+    """Sponsorship statistics for every current member of the House, the Senate or both."""
+    chamber = chamber.lower() if chamber else None
+    if chamber not in (None, "house", "senate"):
+        raise HTTPException(status_code=400, detail="chamber must be 'house' or 'senate'")
+    try:
+        return await asyncio.to_thread(lambda: LegislationAnalytics().chamber_report(chamber, congress))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return {
-            "details": details,
-            "bills": bills,
-            "votes": votes
-        }
+@router.get("/cosponsorship/bridges")
+async def get_cosponsorship_bridges(k: int = 10, party: Optional[str] = None):
+    """Members whose co-sponsorships most often cross party lines (optionally within one party)."""
+    graph = await asyncio.to_thread(current_graph)
+    return {"members": graph.bridges(max(1, min(k, 100)), party)}
+
+@router.get("/cosponsorship/path")
+async def get_cosponsorship_path(source: str, target: str):
+    """Shortest chain of co-sponsorship partners linking two members."""
+    graph = await asyncio.to_thread(current_graph)
+    path = await asyncio.to_thread(lambda: graph.shortest_path(source, target))
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No co-sponsorship path between {source} and {target}")
+    return {"hops": len(path) - 1, "path": path}
+
+@router.get("/cosponsorship/{bioguide_id}")
+async def get_cosponsorship_collaborators(bioguide_id: str, k: int = 10):
+    """The member's most frequent co-sponsorship partners and bipartisan bridge score."""
+    graph = await asyncio.to_thread(current_graph)
+    result = graph.collaborators(bioguide_id, max(1, min(k, 100)))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No co-sponsorship data for {bioguide_id}")
+    return result
+
+@router.get("/bill/{congress}/{bill_type}/{bill_number}/similar")
+async def get_similar_bills(congress: int, bill_type: str, bill_number: str, k: int = 10):
+    """Bills whose titles or sections read most like this one, from the local bill index."""
+    sanitized_type = re.sub(r'[^a-zA-Z]', '', bill_type).lower()
+    try:
+        return await asyncio.to_thread(lambda: similar_bills(CongressAPIClient(), congress, sanitized_type, bill_number, max(1, min(k, 50))))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _bill_data(congress: int, bill_type: str, bill_number: str):
+    """Details, actions, cosponsors, text versions and raw text of a bill. Blocking."""
+    client = CongressAPIClient()
+    return (
+        client.get_bill_details(congress, bill_type, bill_number),
+        client.get_bill_actions(congress, bill_type, bill_number),
+        client.get_bill_cosponsors(congress, bill_type, bill_number),
+        client.get_bill_text(congress, bill_type, bill_number),
+        client.get_bill_text_content(congress, bill_type, bill_number),
+    )
+
 @router.get("/bill/{congress}/{bill_type}/{bill_number}")
 async def get_bill_dashboard(congress: int, bill_type: str, bill_number: str):
-    client = CongressAPIClient()
     try:
         # Sanitize bill_type (e.g., 'h.r.' -> 'hr')
         sanitized_type = re.sub(r'[^a-zA-Z]', '', bill_type).lower()
-        
-        details = client.get_bill_details(congress, sanitized_type, bill_number)
-        actions = client.get_bill_actions(congress, sanitized_type, bill_number)
-        cosponsors = client.get_bill_cosponsors(congress, sanitized_type, bill_number)
-        text_versions = client.get_bill_text(congress, sanitized_type, bill_number)
-        
-        # 1. Fetch raw text content
-        raw_text = client.get_bill_text_content(congress, sanitized_type, bill_number)
-        
+        await asyncio.to_thread(record_access, "bill", f"{congress}/{sanitized_type}/{bill_number}")
+
+        # 1. Fetch the bill data and raw text content
+        details, actions, cosponsors, text_versions, raw_text = await asyncio.to_thread(_bill_data, congress, sanitized_type, bill_number)
+
         # 2. Run Analysis Agent
         ai_summary = None
         if raw_text:
             try:
-                analysis_agent = get_bill_analysis_agent()
-                result = await analysis_agent.ainvoke({"bill_text": raw_text})
+                from ..services.cosint.agent import get_bill_analysis_agent, bill_analysis_model, route_ledger
+                from ..services.cosint.callbacks import TelemetryCallbackHandler
+                model = bill_analysis_model(raw_text)
+                analysis_agent = get_bill_analysis_agent(model)
+                telemetry = TelemetryCallbackHandler()
+                started = time.perf_counter()
+                result = await analysis_agent.ainvoke({"bill_text": raw_text}, config={"callbacks": [telemetry]})
+                route_ledger.bill_analysis(model, telemetry, time.perf_counter() - started)
                 ai_summary = result.content
             except Exception as e:
                 print(f"AI Bill Analysis failed: {e}")
@@ -4,6 +4,8 @@ from typing import List, Optional
 from pydantic import BaseModel
 from ..database import get_db, Conversation, TrackedBill, ResearchNote
 from .auth import get_current_user
+from ..services.bill_poller import tracked_bill_updates
+from ..services.intel_packets import member_packets
 from datetime import datetime
 
 router = APIRouter(tags=["notebook"])
@@ -118,6 +120,14 @@ async def list_tracked_bills(user_id: str = Depends(get_current_user), db: Sessi
     bills = db.query(TrackedBill).filter(TrackedBill.user_id == user_id).order_by(TrackedBill.created_at.desc()).all()
     return bills
 
+@router.get("/tracked-bills/updates")
+async def list_tracked_bill_updates(since: Optional[datetime] = None, limit: int = 50, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+    """
+    New actions on the user's tracked bills found by the bill poller, newest first.
+    Pass the latest `detected_at` seen as `since` to get only what is new.
+    """
+    return tracked_bill_updates(db, user_id, since, min(max(limit, 1), 200))
+
 @router.post("/tracked-bills")
 async def track_bill(request: BillTrackRequest, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
     existing = db.query(TrackedBill).filter(
@@ -198,6 +208,11 @@ async def create_member_note(bioguide_id: str, note: NoteCreate, user_id: str =
     db.refresh(new_note)
     return new_note
 
+@router.get("/member/{bioguide_id}/intel")
+async def list_member_intel(bioguide_id: str, limit: int = 100, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Intel packets extracted from the user's chats on this member's page, newest first."""
+    return member_packets(db, user_id, bioguide_id, max(1, min(limit, 500)))
+
 @router.patch("/notes/{note_id}")
 async def update_note(note_id: str, update: NoteUpdate, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
     note = db.query(ResearchNote).filter(ResearchNote.id == note_id, ResearchNote.user_id == user_id).first()
@@ -0,0 +1,233 @@
+import os
+import re
+import time
+import hashlib
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from .cache_service import cache, dependencies_changed
+from .deadlines import run_blocking
+
+# How long a cached chat answer may be replayed (web results and votes age too)
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "21600"))
+# Cosine similarity required for a nearest-neighbour hit
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+ANSWER_CACHE_EMBEDDING_MODEL = os.getenv("ANSWER_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Each cached question's embedding is its own entry under this prefix
+VECTOR_PREFIX = "answer:vector:"
+# How often a worker rescans the cache for questions other workers stored
+ANSWER_CACHE_INDEX_REFRESH = float(os.getenv("ANSWER_CACHE_INDEX_REFRESH", "60"))
+
+def normalize_question(text: str) -> str:
+    """
+    Lowercase, drop punctuation and collapse whitespace so trivial rewordings
+    ("Who represents NJ-8?" / "who represents nj 8") share a key.
+    """
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def _entry_key(normalized: str, context_hash: str) -> str:
+    return f"answer:{_hash(normalized + '|' + context_hash)}"
+
+def _vector_key(entry_key: str) -> str:
+    return VECTOR_PREFIX + entry_key[len("answer:"):]
+
+class AnswerCache:
+    """
+    Cache of final chat answers in front of the agent.
+    Lookups try the exact normalized (question, context) key first and then the
+    nearest cached question with the same context by embedding similarity.
+    Entries remember which api_cache data they were built from and are dropped
+    as soon as any of it is refetched.
+
+    Question embeddings are stored one entry each, expiring with their answer,
+    so no worker ever rewrites a shared index. Each worker searches its own
+    matrix of them, rebuilt from the cache every ANSWER_CACHE_INDEX_REFRESH
+    seconds and extended with its own stores in between.
+    """
+    def __init__(self, threshold: float = ANSWER_CACHE_SIMILARITY):
+        self.threshold = threshold
+        self._embeddings = None
+        self._scanned_at: Optional[float] = None
+        self._keys: List[str] = []
+        self._contexts: List[str] = []
+        self._created: List[float] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def _get_embeddings(self):
+        if self._embeddings is None:
+            from langchain_openai import OpenAIEmbeddings
+            # Questions are short, so skip client-side tokenization (and its tiktoken download)
+            self._embeddings = OpenAIEmbeddings(model=ANSWER_CACHE_EMBEDDING_MODEL, check_embedding_ctx_length=False)
+        return self._embeddings
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(await self._get_embeddings().aembed_query(text), dtype=np.float32)
+        except Exception as e:
+            print(f"Answer cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    # --- Local index ---
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """The newest ANSWER_CACHE_MAX_ENTRIES stored question vectors (blocking)."""
+        rows = []
+        for key in list(cache.iterkeys()):
+            if key.startswith(VECTOR_PREFIX):
+                row = cache.get(key)
+                if row:
+                    rows.append(row)
+        rows.sort(key=lambda row: row["created_at"])
+        return rows[-ANSWER_CACHE_MAX_ENTRIES:]
+
+    async def _refresh_index(self):
+        now = time.monotonic()
+        if self._scanned_at is not None and now - self._scanned_at < ANSWER_CACHE_INDEX_REFRESH:
+            return
+        # Set first so concurrent lookups don't start scans of their own
+        self._scanned_at = now
+        started = time.time()
+        try:
+            rows = await run_blocking(self._scan)
+        except Exception as e:
+            print(f"Answer cache index scan failed: {e}")
+            return
+        if rows:
+            # Vectors from an earlier embedding model can't be compared with the current ones
+            size = len(rows[-1]["vector"])
+            rows = [row for row in rows if len(row["vector"]) == size]
+        # Keep what this worker stored while the scan ran
+        scanned = {row["key"] for row in rows}
+        recent = [i for i, created in enumerate(self._created) if created >= started and self._keys[i] not in scanned]
+
+        vectors = [np.frombuffer(row["vector"], dtype=np.float32) for row in rows] + [self._matrix[i] for i in recent]
+        self._keys = [row["key"] for row in rows] + [self._keys[i] for i in recent]
+        self._contexts = [row["context"] for row in rows] + [self._contexts[i] for i in recent]
+        self._created = [row["created_at"] for row in rows] + [self._created[i] for i in recent]
+        self._matrix = np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def _add(self, entry_key: str, context_hash: str, created_at: float, vector: np.ndarray):
+        if entry_key in self._keys:
+            return
+        if self._matrix.size and self._matrix.shape[1] != vector.shape[0]:
+            return
+        self._keys.append(entry_key)
+        self._contexts.append(context_hash)
+        self._created.append(created_at)
+        self._matrix = vector[None, :] if self._matrix.size == 0 else np.vstack([self._matrix, vector])
+
+        # Forget the oldest questions once the index is full
+        overflow = len(self._keys) - ANSWER_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            self._keys = self._keys[overflow:]
+            self._contexts = self._contexts[overflow:]
+            self._created = self._created[overflow:]
+            self._matrix = self._matrix[overflow:]
+
+    def _forget(self, entry_key: str):
+        if entry_key in self._keys:
+            i = self._keys.index(entry_key)
+            del self._keys[i]
+            del self._contexts[i]
+            del self._created[i]
+            self._matrix = np.delete(self._matrix, i, axis=0)
+
+    # --- Shared store (blocking, run off the event loop) ---
+
+    @staticmethod
+    def _delete(entry_key: str):
+        cache.delete(entry_key)
+        cache.delete(_vector_key(entry_key))
+
+    def _valid_entry(self, entry_key: str) -> Optional[Dict[str, Any]]:
+        entry = cache.get(entry_key)
+        if entry is None:
+            return None
+        if dependencies_changed(entry["dependencies"]):
+            self._delete(entry_key)
+            return None
+        return entry
+
+    @staticmethod
+    def _write(entry_key: str, entry: Dict[str, Any], row: Optional[Dict[str, Any]]):
+        cache.set(entry_key, entry, expire=ANSWER_CACHE_TTL)
+        if row is not None:
+            cache.set(_vector_key(entry_key), row, expire=ANSWER_CACHE_TTL)
+
+    async def lookup(self, question: str, context: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        The cached answer (or None) and the question's embedding if the lookup
+        computed one, which store() can reuse.
+        """
+        normalized = normalize_question(question)
+        context_hash = _hash(context)
+        entry_key = _entry_key(normalized, context_hash)
+
+        entry = await run_blocking(self._valid_entry, entry_key)
+        if entry:
+            return entry["response"], None
+
+        await self._refresh_index()
+        candidates = [i for i, c in enumerate(self._contexts) if c == context_hash]
+        if not candidates:
+            return None, None
+
+        vector = await self._embed(normalized)
+        if vector is None or vector.shape[0] != self._matrix.shape[1]:
+            return None, vector
+        scores = self._matrix[candidates] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None, vector
+
+        best_key = self._keys[candidates[best]]
+        entry = await run_blocking(self._valid_entry, best_key)
+        if entry is None:
+            # Expired or invalidated; keep the index in step with the store
+            await run_blocking(self._delete, best_key)
+            self._forget(best_key)
+            return None, vector
+        return entry["response"], vector
+
+    async def store(self, question: str, context: str, response: str, dependencies: Dict[str, Any], vector: Optional[np.ndarray] = None):
+        """Cache an answer; `vector` is the question embedding from lookup(), if it made one."""
+        normalized = normalize_question(question)
+        context_hash = _hash(context)
+        entry_key = _entry_key(normalized, context_hash)
+        created_at = time.time()
+
+        if vector is None:
+            vector = await self._embed(normalized)
+        entry = {
+            "question": normalized,
+            "response": response,
+            "dependencies": dependencies,
+            "created_at": created_at,
+        }
+        row = None if vector is None else {
+            "key": entry_key,
+            "context": context_hash,
+            "created_at": created_at,
+            "vector": vector.astype(np.float32).tobytes(),
+        }
+        await run_blocking(self._write, entry_key, entry, row)
+        if vector is not None:
+            self._add(entry_key, context_hash, created_at, vector)
+
+def replay_chunks(response: str, chunk_size: int = 24):
+    """
+    Split a cached answer into small word-aligned chunks so the client renders
+    it the same way as a live stream.
+    """
+    words = re.findall(r"\s*\S+|\s+$", response)
+    for i in range(0, len(words), chunk_size):
+        yield "".join(words[i:i + chunk_size])
+
+answer_cache = AnswerCache()
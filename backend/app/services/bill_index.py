@@ -0,0 +1,355 @@
+import os
+import re
+import json
+import socket
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from .cache_service import cache, cache_dir, parse_key
+from .scheduler import LeaderScheduler
+
+BILL_INDEX_ENABLED = os.getenv("BILL_INDEX_ENABLED", "true").lower() == "true"
+# Seconds between passes embedding bills newly fetched into the cache
+BILL_INDEX_INTERVAL = int(os.getenv("BILL_INDEX_INTERVAL", "120"))
+BILL_INDEX_DIR = os.getenv("BILL_INDEX_DIR") or os.path.join(cache_dir, "bill_index")
+BILL_INDEX_EMBEDDING_MODEL = os.getenv("BILL_INDEX_EMBEDDING_MODEL", "text-embedding-3-small")
+BILL_INDEX_DIMENSIONS = int(os.getenv("BILL_INDEX_DIMENSIONS", "512"))
+# Passages sent per embedding request
+BILL_INDEX_BATCH_SIZE = int(os.getenv("BILL_INDEX_BATCH_SIZE", "64"))
+# Above this many passages, queries probe the nearest clusters (IVF) instead of scanning every vector
+BILL_INDEX_IVF_MIN_ROWS = int(os.getenv("BILL_INDEX_IVF_MIN_ROWS", "20000"))
+BILL_INDEX_NPROBE = int(os.getenv("BILL_INDEX_NPROBE", "8"))
+
+# Every host keeps its own copy of the index files, so the lock is per host
+BILL_INDEX_LOCK_KEY = f"lock:bill_index:{socket.gethostname()}"
+SECTION_CHARS = 2000
+MAX_SECTIONS = 8
+SCAN_CHUNK = 65536
+KMEANS_SAMPLE = 50000
+KMEANS_ITERATIONS = 10
+
+_SECTION_START = re.compile(r"(?=\b(?:SEC\.|SECTION)\s+\d+[A-Z]?\.)")
+_SECTION_LABEL = re.compile(r"^(?:SEC\.|SECTION)\s+\d+[A-Z]?\.")
+
+def bill_passages(details: Dict[str, Any], text: Optional[str]) -> List[Tuple[str, str]]:
+    """(label, text) passages embedded for a bill: its title, then the first sections of its text."""
+    passages = []
+    title = details.get("title")
+    if title:
+        policy_area = (details.get("policyArea") or {}).get("name")
+        passages.append(("title", f"{title} ({policy_area})" if policy_area else title))
+    if text:
+        for section in [s.strip() for s in _SECTION_START.split(text) if s.strip()][:MAX_SECTIONS]:
+            label = _SECTION_LABEL.match(section)
+            passages.append((label.group(0) if label else "text", section[:SECTION_CHARS]))
+    return passages
+
+def _digest(passages: List[Tuple[str, str]]) -> str:
+    return hashlib.md5(json.dumps(passages).encode()).hexdigest()
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+_embeddings = None
+
+def embed(texts: List[str]) -> np.ndarray:
+    """Unit-length embeddings of the texts, BILL_INDEX_BATCH_SIZE per request."""
+    global _embeddings
+    if _embeddings is None:
+        from langchain_openai import OpenAIEmbeddings
+        # Passages are capped well under the model's context, so skip client-side tokenization
+        _embeddings = OpenAIEmbeddings(model=BILL_INDEX_EMBEDDING_MODEL, dimensions=BILL_INDEX_DIMENSIONS, check_embedding_ctx_length=False)
+    vectors = []
+    for start in range(0, len(texts), BILL_INDEX_BATCH_SIZE):
+        vectors += _embeddings.embed_documents(texts[start:start + BILL_INDEX_BATCH_SIZE])
+    return _normalize(np.asarray(vectors, dtype=np.float32))
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid of each vector, a chunk at a time."""
+    return np.concatenate([np.argmax(vectors[s:s + SCAN_CHUNK] @ centroids.T, axis=1) for s in range(0, len(vectors), SCAN_CHUNK)] or
+                          [np.array([], dtype=np.int64)]).astype(np.int32)
+
+def _kmeans(vectors: np.ndarray, k: int) -> np.ndarray:
+    """Spherical k-means centroids over a sample of the vectors."""
+    rng = np.random.default_rng(0)
+    sample = vectors[np.sort(rng.choice(len(vectors), min(len(vectors), KMEANS_SAMPLE), replace=False))]
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.bincount(assignment, minlength=k) == 0
+        sums[empty] = centroids[empty]
+        centroids = _normalize(sums)
+    return centroids
+
+class BillIndex:
+    """
+    Vector index over the bills in the shared cache (titles, and section text
+    from the bill text cache), so "similar bills" is a local top-k search.
+    Each passage is one unit-length row of an append-only float32 file that
+    readers memory-map; state.json says which rows belong to which bill (a
+    contiguous range per bill) and how many rows are valid, and is replaced
+    atomically after every append, so readers never see a partial write.
+    - Indexing only embeds bills that are new or whose passages changed, a
+      batch of passages per request; a changed bill's old rows are left
+      behind and dropped when dead rows outnumber live ones.
+    - Past BILL_INDEX_IVF_MIN_ROWS passages, rows are clustered (spherical
+      k-means) and a query scores only the rows of its BILL_INDEX_NPROBE
+      nearest clusters. New rows join their nearest cluster; the clusters are
+      retrained whenever the index has doubled since.
+    """
+    def __init__(self, path: str = BILL_INDEX_DIR):
+        self.path = path
+        self.state = self._read_state()
+        self._loaded = False
+
+    # --- Files ---
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _vectors_file(self, generation: int) -> str:
+        return self._file(f"vectors.{generation}.f32")
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._file("state.json")) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            state = None
+        if not state or state.get("model") != [BILL_INDEX_EMBEDDING_MODEL, BILL_INDEX_DIMENSIONS]:
+            # Vectors from another model can't be compared with new ones, so start over
+            generation = state["generation"] + 1 if state else 0
+            state = {"model": [BILL_INDEX_EMBEDDING_MODEL, BILL_INDEX_DIMENSIONS], "generation": generation,
+                     "dim": None, "rows": 0, "bills": {}, "ivf": None}
+        return state
+
+    def _write_state(self):
+        tmp = self._file(f"state.json.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.state, f, separators=(",", ":"))
+        os.replace(tmp, self._file("state.json"))
+
+    def _write_rows(self, name: str, array: np.ndarray, start_row: int):
+        """Write rows at `start_row` of a raw array file, dropping anything an interrupted pass left after it."""
+        row_bytes = array.itemsize * (array.shape[1] if array.ndim > 1 else 1)
+        with open(self._file(name), "ab") as f:
+            f.truncate(start_row * row_bytes)
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    # --- Reading ---
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        state, dim, rows = self.state, self.state["dim"], self.state["rows"]
+        self.keys = list(state["bills"])
+        self.row_bill = np.full(rows, -1, dtype=np.int32)
+        for i, key in enumerate(self.keys):
+            entry = state["bills"][key]
+            self.row_bill[entry["start"]:entry["end"]] = i
+        self.vectors = (np.memmap(self._vectors_file(state["generation"]), dtype=np.float32, mode="r", shape=(rows, dim))
+                        if rows else np.zeros((0, dim or 1), dtype=np.float32))
+        self.centroids, self.list_order, self.list_ptr = None, None, None
+        ivf = state["ivf"]
+        if ivf and rows:
+            self.centroids = np.load(self._file(f"centroids.{ivf['generation']}.npy"))
+            lists = np.fromfile(self._file(f"lists.{ivf['generation']}.i32"), dtype=np.int32, count=rows)
+            # Inverted lists: row numbers grouped by cluster
+            self.list_order = np.argsort(lists, kind="stable").astype(np.int32)
+            self.list_ptr = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(lists, minlength=len(self.centroids)), out=self.list_ptr[1:])
+
+    def bill_vectors(self, key: str) -> Optional[np.ndarray]:
+        self._load()
+        entry = self.state["bills"].get(key)
+        return np.asarray(self.vectors[entry["start"]:entry["end"]]) if entry else None
+
+    def _candidates(self, queries: np.ndarray) -> Optional[np.ndarray]:
+        """Rows worth scoring: those in the queries' nearest clusters, or None for every row."""
+        if self.centroids is None:
+            return None
+        nprobe = min(BILL_INDEX_NPROBE, len(self.centroids))
+        probe = np.unique(np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe])
+        rows = np.concatenate([self.list_order[self.list_ptr[c]:self.list_ptr[c + 1]] for c in probe])
+        return np.sort(rows)
+
+    def search(self, queries: np.ndarray, k: int = 10, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The k bills with the passages closest to any of the query vectors."""
+        self._load()
+        if not self.state["rows"] or queries.shape[1] != self.state["dim"]:
+            return []
+        rows = self._candidates(queries)
+        if rows is None:
+            scores = np.concatenate([(self.vectors[s:s + SCAN_CHUNK] @ queries.T).max(axis=1) for s in range(0, self.state["rows"], SCAN_CHUNK)])
+            rows = np.arange(self.state["rows"])
+        else:
+            scores = (self.vectors[rows] @ queries.T).max(axis=1)
+        bills = self.row_bill[rows]
+        live = bills >= 0
+        if exclude in self.state["bills"]:
+            live &= bills != self.row_bill[self.state["bills"][exclude]["start"]]
+        rows, scores, bills = rows[live], scores[live], bills[live]
+        # Best passage per bill, best bills first
+        order = np.argsort(-scores, kind="stable")
+        _, first = np.unique(bills[order], return_index=True)
+        best = order[np.sort(first)][:k]
+        results = []
+        for i in best:
+            key = self.keys[bills[i]]
+            entry = self.state["bills"][key]
+            congress, bill_type, number = key.split("-", 2)
+            results.append({
+                "bill_id": key, "congress": int(congress), "bill_type": bill_type, "bill_number": number,
+                "title": entry.get("title"), "score": round(float(scores[i]), 4),
+                "matched": entry["parts"][int(rows[i]) - entry["start"]],
+            })
+        return results
+
+    # --- Indexing ---
+
+    def _cached_bills(self) -> Dict[str, Dict[str, Any]]:
+        """{bill id: {"details", "text"}} for every bill whose details are in the shared cache."""
+        found: Dict[str, Dict[str, Any]] = {}
+        for key in list(cache.iterkeys()):
+            parsed = parse_key(key)
+            if key.startswith("version:") or not parsed or parsed[1] not in ("get_bill_details", "get_bill_text_content"):
+                continue
+            if not (parsed[2] or "").startswith("bill:"):
+                continue
+            value = cache.get(key)
+            if value:
+                found.setdefault(parsed[2][len("bill:"):], {})["details" if parsed[1] == "get_bill_details" else "text"] = value
+        return {bill_id: entry for bill_id, entry in found.items() if "details" in entry}
+
+    def _append(self, group: List[Tuple[str, Dict[str, Any], List[Tuple[str, str]], str]], vectors: np.ndarray):
+        state, start = self.state, self.state["rows"]
+        vectors = vectors.astype(np.float32, copy=False)
+        state["dim"] = state["dim"] or vectors.shape[1]
+        self._write_rows(f"vectors.{state['generation']}.f32", vectors, start)
+        if state["ivf"]:
+            centroids = np.load(self._file(f"centroids.{state['ivf']['generation']}.npy"))
+            self._write_rows(f"lists.{state['ivf']['generation']}.i32", _assign(vectors, centroids), start)
+        row = start
+        for key, details, passages, digest in group:
+            state["bills"][key] = {"hash": digest, "start": row, "end": row + len(passages),
+                                   "title": details.get("title"), "parts": [label for label, _ in passages]}
+            row += len(passages)
+        state["rows"] = row
+        self._write_state()
+
+    def _maintain(self):
+        """Drop dead rows once they outnumber live ones, and (re)train the clusters as the index grows."""
+        state = self.state
+        live = sum(entry["end"] - entry["start"] for entry in state["bills"].values())
+        compact = state["rows"] - live > live
+        ivf = state["ivf"]
+        retrain = live >= BILL_INDEX_IVF_MIN_ROWS and (ivf is None or compact or live >= 2 * ivf["trained_rows"])
+        if not (compact or retrain):
+            return
+        vectors = np.memmap(self._vectors_file(state["generation"]), dtype=np.float32, mode="r", shape=(state["rows"], state["dim"]))
+        old_files = []
+        if compact:
+            generation, row, chunks = state["generation"] + 1, 0, []
+            for entry in state["bills"].values():
+                chunks.append(np.asarray(vectors[entry["start"]:entry["end"]]))
+                entry["start"], entry["end"] = row, row + len(chunks[-1])
+                row = entry["end"]
+            vectors = np.concatenate(chunks) if chunks else np.zeros((0, state["dim"]), dtype=np.float32)
+            vectors.tofile(self._vectors_file(generation))
+            old_files.append(self._vectors_file(state["generation"]))
+            state["generation"], state["rows"] = generation, row
+        if retrain or (compact and ivf):
+            if live >= BILL_INDEX_IVF_MIN_ROWS:
+                generation = ivf["generation"] + 1 if ivf else 0
+                centroids = _kmeans(vectors, int(np.sqrt(live)))
+                np.save(self._file(f"centroids.{generation}.npy"), centroids)
+                _assign(vectors, centroids).tofile(self._file(f"lists.{generation}.i32"))
+                state["ivf"] = {"generation": generation, "trained_rows": live}
+            else:
+                state["ivf"] = None
+            if ivf:
+                old_files += [self._file(f"centroids.{ivf['generation']}.npy"), self._file(f"lists.{ivf['generation']}.i32")]
+        self._write_state()
+        # Readers that already mapped the old files keep them until they reload
+        for name in old_files:
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+    def run_pass(self) -> Dict[str, int]:
+        stats = {"bills": 0, "embedded": 0, "passages": 0, "errors": 0}
+        os.makedirs(self.path, exist_ok=True)
+        pending, group, texts = [], [], 0
+        for key, entry in self._cached_bills().items():
+            stats["bills"] += 1
+            passages = bill_passages(entry["details"], entry.get("text"))
+            digest = _digest(passages)
+            if passages and (self.state["bills"].get(key) or {}).get("hash") != digest:
+                pending.append((key, entry["details"], passages, digest))
+
+        def flush(group):
+            try:
+                vectors = embed([text for _, _, passages, _ in group for _, text in passages])
+            except Exception as e:
+                stats["errors"] += 1
+                print(f"Bill index embedding failed: {e}")
+                return
+            self._append(group, vectors)
+            stats["embedded"] += len(group)
+            stats["passages"] += len(vectors)
+
+        for item in pending:
+            group.append(item)
+            texts += len(item[2])
+            if texts >= BILL_INDEX_BATCH_SIZE:
+                flush(group)
+                group, texts = [], 0
+        if group:
+            flush(group)
+        self._maintain()
+        print(f"Bill index pass complete: {stats}")
+        return stats
+
+_current: Optional[Tuple[Optional[float], BillIndex]] = None
+_load_lock = threading.Lock()
+
+def current_index() -> BillIndex:
+    """The saved index, reloaded whenever the indexer replaces its state."""
+    global _current
+    try:
+        mtime = os.stat(os.path.join(BILL_INDEX_DIR, "state.json")).st_mtime
+    except FileNotFoundError:
+        mtime = None
+    if _current is None or _current[0] != mtime:
+        with _load_lock:
+            if _current is None or _current[0] != mtime:
+                index = BillIndex()
+                index._load()
+                _current = (mtime, index)
+    return _current[1]
+
+def similar_bills(client, congress: int, bill_type: str, bill_number: str, k: int = 10) -> Dict[str, Any]:
+    """Bills most like this one; a bill not indexed yet is embedded on the spot (not stored)."""
+    from .cosint.mirror import bill_key
+    key = bill_key(congress, bill_type, bill_number)
+    index = current_index()
+    queries = index.bill_vectors(key)
+    indexed = queries is not None
+    if not indexed:
+        passages = bill_passages(client.get_bill_details(congress, bill_type, bill_number),
+                                 client.get_bill_text_content(congress, bill_type, bill_number))
+        queries = embed([text for _, text in passages]) if passages else None
+    similar = index.search(queries, k, exclude=key) if queries is not None else []
+    return {"bill_id": key, "indexed": indexed, "similar": similar}
+
+def search_bills(query: str, k: int = 10) -> List[Dict[str, Any]]:
+    """Indexed bills closest to a free-text description."""
+    return current_index().search(embed([query]), k)
+
+bill_index_scheduler = LeaderScheduler(BILL_INDEX_LOCK_KEY, BILL_INDEX_INTERVAL, lambda: BillIndex().run_pass(), "Bill index pass", run_first=False)
@@ -0,0 +1,240 @@
+import os
+import re
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from ..database import SessionLocal, TrackedBill, BillWatch, BillUpdate
+from .cache_service import evict
+from .scheduler import LeaderScheduler
+from .cosint.api_client import CongressAPIClient, BudgetExhausted
+from .cosint.mirror import bill_key
+from .cosint.bill_history import action_key
+
+BILL_POLL_ENABLED = os.getenv("BILL_POLL_ENABLED", "true").lower() == "true"
+# Seconds between polls of the tracked bills
+BILL_POLL_INTERVAL = int(os.getenv("BILL_POLL_INTERVAL", "1800"))
+# Bills persisted per batch, so an interrupted pass keeps what it already did
+BILL_POLL_BATCH_SIZE = int(os.getenv("BILL_POLL_BATCH_SIZE", "50"))
+# Pages of the "recently updated" bill list read per (congress, type) before
+# falling back to checking the remaining bills one by one
+BILL_POLL_MAX_LIST_PAGES = int(os.getenv("BILL_POLL_MAX_LIST_PAGES", "4"))
+
+BILL_POLL_LOCK_KEY = "lock:bill_poll"
+LIST_PAGE_SIZE = 250
+ACTIONS_PAGE_SIZE = 50
+# Overlap between list checks, so updates stamped while a poll ran aren't missed
+LIST_OVERLAP = timedelta(hours=1)
+
+Target = Tuple[int, str, str] # (congress, bill type, bill number)
+
+def _sanitize_type(bill_type: str) -> str:
+    # 'H.R.' -> 'hr', same as the bill dashboard
+    return re.sub(r"[^a-zA-Z]", "", bill_type or "").lower()
+
+def tracked_bill_target(bill: TrackedBill) -> Optional[Target]:
+    """(congress, type, number) of a tracked bill, falling back to its "118-hr-1" id."""
+    if bill.congress and bill.bill_type and bill.bill_number:
+        return bill.congress, _sanitize_type(bill.bill_type), str(bill.bill_number)
+    parts = (bill.bill_id or "").split("-")
+    if len(parts) == 3 and parts[0].isdigit():
+        return int(parts[0]), _sanitize_type(parts[1]), parts[2]
+    return None
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class BillPoller:
+    """
+    Detects movement on tracked bills. Each pass polls every distinct tracked
+    bill once, however many users track it:
+    1. per (congress, type), one listing of bills updated since the last check
+       shows which tracked bills changed (bills not settled by the listing are
+       checked one by one);
+    2. for changed bills, actions are read newest first only down to the bill's
+       watermark, and the new ones are stored as BillUpdate rows.
+    """
+    def __init__(self, client: Optional[CongressAPIClient] = None):
+        self.client = client or CongressAPIClient(low_priority=True)
+
+    def targets(self, db) -> List[Target]:
+        seen = {}
+        for bill in db.query(TrackedBill).all():
+            target = tracked_bill_target(bill)
+            if target:
+                seen.setdefault(bill_key(*target), target)
+        return list(seen.values())
+
+    def _recently_updated(self, congress: int, bill_type: str, since: datetime) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """
+        Bills of this congress and type updated since `since`: ({number: list item},
+        complete). Not complete when the page cap was hit first.
+        """
+        updated, offset = {}, 0
+        for _ in range(BILL_POLL_MAX_LIST_PAGES):
+            data = self.client._get(f"bill/{congress}/{bill_type}", params={
+                "fromDateTime": _format_datetime(since - LIST_OVERLAP),
+                "sort": "updateDate desc",
+                "limit": LIST_PAGE_SIZE,
+                "offset": offset,
+            })
+            bills = data.get("bills", [])
+            for item in bills:
+                updated.setdefault(str(item.get("number")), item)
+            if len(bills) < LIST_PAGE_SIZE or not (data.get("pagination") or {}).get("next"):
+                return updated, True
+            offset += LIST_PAGE_SIZE
+        return updated, False
+
+    def _new_actions(self, congress: int, bill_type: str, bill_number: str, watch: BillWatch) -> List[Dict[str, Any]]:
+        """
+        Actions newer than the watermark, newest first. Without a watermark only
+        the first page is read, which is enough to set one.
+        """
+        seen_on_watermark = set(json.loads(watch.watermark_keys or "[]"))
+        new, offset = [], 0
+        while True:
+            data = self.client._get(f"bill/{congress}/{bill_type}/{bill_number}/actions", params={"limit": ACTIONS_PAGE_SIZE, "offset": offset})
+            actions = data.get("actions", [])
+            for action in actions:
+                date = action.get("actionDate") or ""
+                if watch.action_watermark and date < watch.action_watermark:
+                    return new
+                if date == watch.action_watermark and action_key(action) in seen_on_watermark:
+                    continue
+                new.append(action)
+            if not watch.action_watermark or len(actions) < ACTIONS_PAGE_SIZE or not (data.get("pagination") or {}).get("next"):
+                return new
+            offset += ACTIONS_PAGE_SIZE
+
+    def check_bill(self, db, target: Target, listed: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Bring one bill's watch up to date and return how many new actions were
+        recorded. `listed` is its entry from the updated-bills listing, if any.
+        The first check of a bill only sets the watermark.
+        """
+        congress, bill_type, bill_number = target
+        key = bill_key(*target)
+        watch = db.get(BillWatch, key)
+        summary = listed or self.client._get(f"bill/{congress}/{bill_type}/{bill_number}").get("bill", {})
+        now = datetime.utcnow()
+
+        if watch is not None and watch.update_date and watch.update_date == summary.get("updateDate"):
+            watch.last_checked = now
+            return 0
+
+        # update_date is only set once a check completes, so an interrupted first check is redone
+        baseline = watch is None or watch.update_date is None
+        if watch is None:
+            watch = BillWatch(bill_key=key, congress=congress, bill_type=bill_type, bill_number=bill_number)
+            db.add(watch)
+
+        actions = self._new_actions(congress, bill_type, bill_number, watch)
+        if actions:
+            newest = max(a.get("actionDate") or "" for a in actions)
+            if newest != watch.action_watermark:
+                keys = set()
+            else:
+                keys = set(json.loads(watch.watermark_keys or "[]"))
+            keys.update(action_key(a) for a in actions if (a.get("actionDate") or "") == newest)
+            watch.action_watermark, watch.watermark_keys = newest, json.dumps(sorted(keys))
+
+        latest = summary.get("latestAction") or {}
+        watch.update_date = summary.get("updateDate")
+        watch.latest_action_date = latest.get("actionDate")
+        watch.latest_action_text = latest.get("text")
+        watch.last_checked = now
+        if baseline:
+            return 0
+        # The bill page and the agent refetch its details, actions and cosponsors next time
+        evict(entity=f"bill:{key}")
+        if not actions:
+            return 0
+
+        db.add_all(BillUpdate(
+            bill_key=key,
+            action_date=a.get("actionDate"),
+            action_code=a.get("actionCode"),
+            text=a.get("text"),
+            detected_at=now,
+        ) for a in reversed(actions))
+        watch.last_changed = now
+        return len(actions)
+
+    def run_pass(self) -> Dict[str, int]:
+        stats = {"bills": 0, "listed": 0, "checked": 0, "changed": 0, "new_actions": 0, "errors": 0}
+        with SessionLocal() as db:
+            targets = self.targets(db)
+            stats["bills"] = len(targets)
+            watches = {w.bill_key: w for w in db.query(BillWatch).all()}
+
+            groups: Dict[Tuple[int, str], List[Target]] = {}
+            for target in targets:
+                groups.setdefault(target[:2], []).append(target)
+
+            pending = 0
+            try:
+                for (congress, bill_type), group in groups.items():
+                    known = [t for t in group if bill_key(*t) in watches]
+                    listed, complete = {}, False
+                    if known:
+                        since = min(watches[bill_key(*t)].last_checked or datetime.min for t in known)
+                        if since > datetime.min:
+                            listed, complete = self._recently_updated(congress, bill_type, since)
+                            stats["listed"] += 1
+
+                    for target in group:
+                        key = bill_key(*target)
+                        item = listed.get(target[2])
+                        try:
+                            if key in watches and complete and item is None:
+                                # Not in the complete "updated since" listing: unchanged
+                                watches[key].last_checked = datetime.utcnow()
+                            else:
+                                new = self.check_bill(db, target, item)
+                                stats["checked"] += 1
+                                if new:
+                                    stats["changed"] += 1
+                                    stats["new_actions"] += new
+                        except BudgetExhausted:
+                            raise
+                        except Exception as e:
+                            stats["errors"] += 1
+                            print(f"Bill poll failed for {key}: {e}")
+                        pending += 1
+                        if pending >= BILL_POLL_BATCH_SIZE:
+                            db.commit()
+                            pending = 0
+            except BudgetExhausted:
+                print("Bill poll paused: low-priority Congress.gov budget exhausted")
+            db.commit()
+
+        print(f"Bill poll complete: {stats}")
+        return stats
+
+def tracked_bill_updates(db, user_id: str, since: Optional[datetime] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Recent actions on the bills a user tracks, newest first."""
+    tracked = {}
+    for bill in db.query(TrackedBill).filter(TrackedBill.user_id == user_id).all():
+        target = tracked_bill_target(bill)
+        if target:
+            tracked[bill_key(*target)] = bill
+    if not tracked:
+        return []
+
+    query = db.query(BillUpdate).filter(BillUpdate.bill_key.in_(list(tracked)))
+    if since:
+        query = query.filter(BillUpdate.detected_at > since)
+    updates = query.order_by(BillUpdate.detected_at.desc(), BillUpdate.id.desc()).limit(limit).all()
+    return [{
+        "bill_id": tracked[u.bill_key].bill_id,
+        "title": tracked[u.bill_key].title,
+        "congress": tracked[u.bill_key].congress,
+        "bill_type": tracked[u.bill_key].bill_type,
+        "bill_number": tracked[u.bill_key].bill_number,
+        "action_date": u.action_date,
+        "action_code": u.action_code,
+        "text": u.text,
+        "detected_at": u.detected_at,
+    } for u in updates]
+
+bill_poll_scheduler = LeaderScheduler(BILL_POLL_LOCK_KEY, BILL_POLL_INTERVAL, lambda: BillPoller().run_pass(), "Bill poll")
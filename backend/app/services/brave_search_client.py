@@ -1,22 +1,146 @@
 import os
+import re
+import asyncio
+import hashlib
+import threading
+import weakref
 import httpx
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
+from .cache_service import cache
+from .telemetry import upstream_call, record_cache_lookup
+from .deadlines import http_timeout, run_blocking
 
 load_dotenv()
 
+# Web results go stale quickly, so they are cached for a short time only
+BRAVE_SEARCH_CACHE_TTL = int(os.getenv("BRAVE_SEARCH_CACHE_TTL", "3600"))
+
+# Apostrophes anywhere, other punctuation only at the ends of a word. Quotes
+# and punctuation inside a word are kept, since Brave reads them: a quoted
+# phrase, an operator ("site:congress.gov") or a domain is a different search.
+_QUERY_NOISE_RE = re.compile(r"'|(?:^|(?<=\s))[?!.,;:]+|[?!.,;:]+(?=\s|$)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_query(query: str) -> str:
+    """
+    Fold queries that only differ in case, spacing or punctuation around words
+    ("Who is Cory Booker?" / "who is cory booker") onto one cache entry.
+    Only used for the cache key; Brave gets the query as written.
+    """
+    return _WHITESPACE_RE.sub(" ", _QUERY_NOISE_RE.sub(" ", query.lower())).strip()
+
+def search_cache_key(normalized_query: str, count: int) -> str:
+    digest = hashlib.md5(f"{normalized_query}:{count}".encode()).hexdigest()
+    # Same "<namespace>:<function>:<entity>:<hash>" shape as api_cache keys
+    return f"search:brave_search:-:{digest}"
+
+# Searches already made in the current chat turn: {cache key: response}
+_search_memo: ContextVar = ContextVar("search_memo", default=None)
+
+@contextmanager
+def search_memo():
+    """
+    Remember every search made inside this block, so the agent repeating a
+    query within one turn gets the earlier result without a cache or API hit.
+    """
+    memo = {}
+    token = _search_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        try:
+            _search_memo.reset(token)
+        except ValueError:
+            # Streaming generators can be closed from a different context
+            _search_memo.set(None)
+
+class _SingleFlight:
+    """
+    Collapses concurrent identical calls from worker threads into one: the
+    first caller runs it, the others wait for and share its result.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+
+    def run(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["done"].set()
+
+_sync_flights = _SingleFlight()
+# In-flight async searches per event loop: {loop: {cache key: task}}
+_async_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+# Connection pools shared by every BraveSearchClient. Async clients are bound to
+# the event loop they were created on, so there is one per loop.
+_sync_client: Optional[httpx.Client] = None
+_sync_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _get_sync_client() -> httpx.Client:
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(timeout=15)
+        return _sync_client
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient(timeout=15)
+    return client
+
+async def close_clients():
+    """Close the shared connection pools (app shutdown)."""
+    global _sync_client
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+    with _sync_client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+def reset_clients():
+    """
+    Drop pools inherited from a parent process without closing them (closing
+    would shut the parent's sockets too); each worker opens its own on first use.
+    """
+    global _sync_client
+    _sync_client = None
+    _async_clients.clear()
+
 class BraveSearchClient:
-    BASE_URL = "https://api.search.brave.com/res/v1/web/search"
+    BASE_URL = os.getenv("BRAVE_SEARCH_API_URL", "https://api.search.brave.com/res/v1/web/search")
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("BRAVE_SEARCH_API_KEY")
         if not self.api_key:
             print("[BraveSearch] WARNING: BRAVE_SEARCH_API_KEY not found in environment")
 
-    def search(self, query: str, count: int = 5) -> Dict[str, Any]:
-        """
-        Perform a web search using Brave Search API (sync).
-        """
+    def _request_args(self, query: str, count: int) -> Dict[str, Any]:
         if not self.api_key or "your_brave_search_api_key" in self.api_key:
             raise ValueError("BRAVE_SEARCH_API_KEY is not set or is a placeholder.")
 
@@ -29,33 +153,74 @@ class BraveSearchClient:
             "q": query,
             "count": count
         }
+        return {"headers": headers, "params": params}
 
-        with httpx.Client(timeout=15) as client:
-            response = client.get(self.BASE_URL, headers=headers, params=params)
+    def _memoized(self, key: str) -> Optional[Dict[str, Any]]:
+        memo = _search_memo.get()
+        return memo.get(key) if memo is not None else None
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        result = cache.get(key)
+        record_cache_lookup("search", "brave_search", result is not None)
+        return result
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        memo = _search_memo.get()
+        if memo is not None:
+            memo[key] = result
+
+    def _fetch(self, query: str, count: int, key: str) -> Dict[str, Any]:
+        with upstream_call("brave", "web/search"):
+            response = _get_sync_client().get(self.BASE_URL, timeout=http_timeout(), **self._request_args(query, count))
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        cache.set(key, result, expire=BRAVE_SEARCH_CACHE_TTL)
+        return result
+
+    async def _afetch(self, query: str, count: int, key: str) -> Dict[str, Any]:
+        with upstream_call("brave", "web/search"):
+            response = await _get_async_client().get(self.BASE_URL, timeout=http_timeout(), **self._request_args(query, count))
+            response.raise_for_status()
+            result = response.json()
+        await run_blocking(cache.set, key, result, expire=BRAVE_SEARCH_CACHE_TTL)
+        return result
+
+    def search(self, query: str, count: int = 5) -> Dict[str, Any]:
+        """
+        Perform a web search using Brave Search API (sync).
+        Served from the turn memo or the search cache when possible.
+        """
+        normalized = normalize_query(query)
+        key = search_cache_key(normalized, count)
+        result = self._memoized(key)
+        if result is None:
+            result = self._read(key)
+        if result is None:
+            result = _sync_flights.run(key, lambda: self._fetch(query, count, key))
+        self._remember(key, result)
+        return result
 
     async def async_search(self, query: str, count: int = 5) -> Dict[str, Any]:
         """
         Perform a web search using Brave Search API (async).
+        Concurrent identical searches share one request, and the shared cache
+        is read and written off the event loop.
         """
-        if not self.api_key or "your_brave_search_api_key" in self.api_key:
-            raise ValueError("BRAVE_SEARCH_API_KEY is not set or is a placeholder.")
-
-        headers = {
-            "Accept": "application/json",
-            "Accept-Encoding": "gzip",
-            "X-Subscription-Token": self.api_key
-        }
-        params = {
-            "q": query,
-            "count": count
-        }
-
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(self.BASE_URL, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        normalized = normalize_query(query)
+        key = search_cache_key(normalized, count)
+        result = self._memoized(key)
+        if result is None:
+            result = await run_blocking(self._read, key)
+        if result is None:
+            flights = _async_flights.setdefault(asyncio.get_running_loop(), {})
+            task = flights.get(key)
+            if task is None:
+                task = flights[key] = asyncio.ensure_future(self._afetch(query, count, key))
+                task.add_done_callback(lambda _: flights.pop(key, None))
+            # Shielded so one cancelled caller doesn't cancel the search for the others
+            result = await asyncio.shield(task)
+        self._remember(key, result)
+        return result
 
     def format_search_results(self, data: Dict[str, Any]) -> str:
         """
@@ -0,0 +1,220 @@
+import os
+import re
+import json
+import time
+import asyncio
+from typing import Optional, Dict, Any, List, Callable
+from .cosint.api_client import CongressAPIClient
+from .district_resolver import DistrictResolver, district_resolver
+from .deadlines import run_blocking, deadline_scope, TOOL_TIMEOUT, AGENT_RUN_TIMEOUT
+
+# Largest selection one job will brief
+BRIEFING_MAX_MEMBERS = int(os.getenv("BRIEFING_MAX_MEMBERS", "100"))
+# Briefings generated at once (LLM calls) and Congress.gov lookups in flight per job
+BRIEFING_LLM_CONCURRENCY = int(os.getenv("BRIEFING_LLM_CONCURRENCY", "8"))
+BRIEFING_FETCH_CONCURRENCY = int(os.getenv("BRIEFING_FETCH_CONCURRENCY", "16"))
+# Recent House roll calls included in each House member's profile
+BRIEFING_RECENT_VOTES = int(os.getenv("BRIEFING_RECENT_VOTES", "10"))
+
+_BIOGUIDE_RE = re.compile(r"^[A-Z]\d{6}$")
+
+Emit = Callable[[str, Dict[str, Any]], None]
+
+def _terms(details: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Member detail responses list terms directly; member list entries nest them under "item"
+    terms = details.get("terms") or []
+    if isinstance(terms, dict):
+        return terms.get("item") or []
+    return terms
+
+def _bill_ref(congress, bill_type, number) -> Optional[str]:
+    if not (congress and bill_type and number):
+        return None
+    return f"{congress}/{str(bill_type).lower()}/{number}"
+
+class BriefingJob:
+    """
+    Briefings for a list of members, a state delegation or a committee.
+    Data that members share (the recent roll calls, their member-vote lists and
+    bill titles) is fetched once per job; each member's own details, committees
+    and sponsored bills are fetched concurrently. Each briefing is generated as
+    soon as its member's data is in, with at most BRIEFING_LLM_CONCURRENCY LLM
+    calls at a time, and emitted as it completes.
+    """
+    def __init__(self, client: Optional[CongressAPIClient] = None, resolver: Optional[DistrictResolver] = None):
+        self.client = client or CongressAPIClient()
+        self.resolver = resolver or district_resolver
+        self._fetch_slots = asyncio.Semaphore(BRIEFING_FETCH_CONCURRENCY)
+        self._llm_slots = asyncio.Semaphore(BRIEFING_LLM_CONCURRENCY)
+        # Shared lookups in flight or done: {key: task}
+        self._shared: Dict[tuple, asyncio.Task] = {}
+
+    async def _call(self, fn, *args, **kwargs):
+        async with self._fetch_slots:
+            return await run_blocking(fn, *args, timeout=TOOL_TIMEOUT, **kwargs)
+
+    def _once(self, key: tuple, fn, *args) -> asyncio.Task:
+        """One lookup per key for the whole job, however many members need it."""
+        task = self._shared.get(key)
+        if task is None:
+            task = self._shared[key] = asyncio.ensure_future(self._call(fn, *args))
+        return task
+
+    async def select_members(self, bioguide_ids: Optional[List[str]] = None, state: Optional[str] = None, committee: Optional[str] = None) -> List[str]:
+        """
+        Bioguide IDs to brief, in order and without duplicates. IDs and a state
+        delegation are combined; a committee (name or system code, e.g. "ssfr00")
+        filters them, or all current members if neither was given.
+        """
+        selected = [b.strip().upper() for b in bioguide_ids or [] if b.strip()]
+        invalid = [b for b in selected if not _BIOGUIDE_RE.match(b)]
+        if invalid:
+            raise ValueError(f"Invalid Bioguide IDs: {', '.join(invalid)}")
+
+        if state or (committee and not selected):
+            table = await asyncio.to_thread(self.resolver.get_delegation_table)
+            states = [state.upper()] if state else sorted(table)
+            if state and state.upper() not in table:
+                raise ValueError(f"No delegation found for state '{state}'")
+            for code in states:
+                entry = table[code]
+                selected += [m["bioguideId"] for m in entry.get("senators", [])]
+                for district in sorted(entry.get("districts", {}), key=int):
+                    selected += [m["bioguideId"] for m in entry["districts"][district]]
+        selected = list(dict.fromkeys(b for b in selected if b))
+
+        if committee:
+            needle = committee.strip().lower()
+            assignments = await asyncio.gather(*(self._call(self.client.get_member_committees, b) for b in selected), return_exceptions=True)
+            selected = [
+                b for b, committees in zip(selected, assignments)
+                if not isinstance(committees, BaseException)
+                and any(needle in (c.get("name") or "").lower() or needle == (c.get("systemCode") or "").lower() for c in committees)
+            ]
+        return selected
+
+    async def recent_votes(self) -> List[Dict[str, Any]]:
+        """The recent House roll calls (amendments skipped), with bill titles."""
+        raw = await self._once(("recent_votes",), self.client.get_recent_house_votes, BRIEFING_RECENT_VOTES + 5)
+        votes = [v for v in raw if "AMDT" not in (v.get("legislationType") or "").upper()][:BRIEFING_RECENT_VOTES]
+
+        async def title(v):
+            ref = _bill_ref(v.get("congress"), v.get("legislationType"), v.get("legislationNumber"))
+            if not ref:
+                return None
+            try:
+                details = await self._once(("bill", ref), self.client.get_bill_details, v["congress"], v["legislationType"], v["legislationNumber"])
+                return details.get("title")
+            except Exception:
+                return None
+
+        titles = await asyncio.gather(*(title(v) for v in votes))
+        return [dict(v, title=t) for v, t in zip(votes, titles)]
+
+    async def member_votes(self, bioguide_id: str, votes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        async def cast(v):
+            key = (v.get("congress"), v.get("sessionNumber"), v.get("rollCallNumber"))
+            if None in key:
+                return None
+            try:
+                return (await self._once(("roll_call",) + key, self.client.get_roll_call_votes, *key)).get(bioguide_id)
+            except Exception:
+                return None
+
+        casts = await asyncio.gather(*(cast(v) for v in votes))
+        return [{
+            "bill": f"{v.get('legislationType')} {v.get('legislationNumber')}",
+            "congress": v.get("congress"),
+            "title": v.get("title"),
+            "question": v.get("voteQuestion"),
+            "vote": c or "Not Voting",
+            "result": v.get("result"),
+            "date": v.get("startDate"),
+        } for v, c in zip(votes, casts)]
+
+    async def profile(self, bioguide_id: str) -> Dict[str, Any]:
+        """Everything the briefing is written from, trimmed to what the LLM needs."""
+        details, committees, sponsored = await asyncio.gather(
+            self._call(self.client.get_member_details, bioguide_id),
+            self._call(self.client.get_member_committees, bioguide_id),
+            self._call(self.client.get_sponsored_legislation, bioguide_id, limit=10),
+        )
+        if not details:
+            raise ValueError(f"No member found for {bioguide_id}")
+        terms = _terms(details)
+        chamber = terms[-1].get("chamber") if terms else None
+        parties = details.get("partyHistory") or []
+        profile = {
+            "bioguide_id": bioguide_id,
+            "name": details.get("directOrderName") or f"{details.get('firstName', '')} {details.get('lastName', '')}".strip(),
+            "party": parties[-1].get("partyName") if parties else None,
+            "state": details.get("state"),
+            "district": details.get("district"),
+            "chamber": chamber,
+            "serving_since": terms[0].get("startYear") if terms else None,
+            "committees": [c.get("name") for c in committees if c.get("name")],
+            "sponsored_legislation": [{
+                "bill": f"{b.get('type')} {b.get('number')}",
+                "congress": b.get("congress"),
+                "title": b.get("title"),
+                "policy_area": (b.get("policyArea") or {}).get("name"),
+                "introduced": b.get("introducedDate"),
+                "latest_action": (b.get("latestAction") or {}).get("text"),
+            } for b in sponsored],
+            "recent_votes": [],
+        }
+        if chamber == "House of Representatives":
+            profile["recent_votes"] = await self.member_votes(bioguide_id, await self.recent_votes())
+        return profile
+
+    async def brief(self, bioguide_id: str, agent, callbacks: List[Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        profile = await self.profile(bioguide_id)
+        async with self._llm_slots:
+            with deadline_scope(AGENT_RUN_TIMEOUT):
+                result = await asyncio.wait_for(
+                    agent.ainvoke({"profile": json.dumps(profile)}, config={"callbacks": callbacks}),
+                    AGENT_RUN_TIMEOUT,
+                )
+        return {
+            "bioguide_id": bioguide_id,
+            "name": profile["name"],
+            "briefing": result.content,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    async def run(self, emit: Emit, bioguide_ids: Optional[List[str]] = None, state: Optional[str] = None, committee: Optional[str] = None):
+        """
+        Select the members and stream their briefings: a "members" event with
+        the selection, a "briefing" (or "briefing_error") event per member in
+        completion order, then "done".
+        """
+        from .cosint.agent import get_member_briefing_agent
+        from .cosint.callbacks import TelemetryCallbackHandler
+
+        start = time.perf_counter()
+        members = await self.select_members(bioguide_ids, state, committee)
+        if not members:
+            raise ValueError("No members matched the selection")
+        if len(members) > BRIEFING_MAX_MEMBERS:
+            raise ValueError(f"{len(members)} members selected; at most {BRIEFING_MAX_MEMBERS} per job")
+        emit("members", {"count": len(members), "bioguide_ids": members})
+
+        agent = get_member_briefing_agent()
+        callbacks = [TelemetryCallbackHandler()]
+        failures = 0
+
+        async def one(bioguide_id: str):
+            nonlocal failures
+            try:
+                emit("briefing", await self.brief(bioguide_id, agent, callbacks))
+            except Exception as e:
+                failures += 1
+                emit("briefing_error", {"bioguide_id": bioguide_id, "message": str(e) or type(e).__name__})
+
+        try:
+            await asyncio.gather(*(one(b) for b in members))
+        finally:
+            for task in self._shared.values():
+                task.cancel()
+        emit("done", {"count": len(members), "failed": failures, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)})
@@ -0,0 +1,194 @@
+import os
+import math
+import pickle
+import threading
+from typing import Dict, Optional
+from diskcache import Disk
+from diskcache.core import UNKNOWN
+
+# Value codec used by the disk cache: "orjson-zstd" (default) or "pickle"
+CACHE_CODEC = os.getenv("CACHE_CODEC", "orjson-zstd")
+CACHE_ZSTD_LEVEL = int(os.getenv("CACHE_ZSTD_LEVEL", "3"))
+# Optional zstd dictionary trained on Congress.gov payloads (see train_zstd_dictionary)
+CACHE_ZSTD_DICT = os.getenv("CACHE_ZSTD_DICT")
+# Payloads smaller than this are stored uncompressed
+COMPRESS_MIN_BYTES = 256
+
+# One-byte headers identifying how a value was encoded
+JSON_RAW = b"j"
+JSON_ZSTD = b"z"
+JSON_ZSTD_DICT = b"d"
+PICKLE_RAW = b"p"
+
+_JSON_SCALARS = {str, int, float, bool, type(None)}
+
+def _json_native(value) -> bool:
+    """
+    Whether JSON round-trips the value unchanged: dicts with string keys, lists
+    and plain scalars. orjson would also encode tuples, datetimes, dataclasses
+    and str/int subclasses, but they'd come back as lists, strings and dicts,
+    and it writes NaN and infinities as null. (Ints beyond 64 bits make it
+    raise, which encode also catches.)
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            for key, child in item.items():
+                if type(key) is not str:
+                    return False
+                stack.append(child)
+        elif kind is list:
+            stack.extend(item)
+        elif kind is float:
+            if not math.isfinite(item):
+                return False
+        elif kind not in _JSON_SCALARS:
+            return False
+    return True
+
+class PickleCodec:
+    """Plain pickle, i.e. what diskcache does by default."""
+    name = "pickle"
+
+    def encode(self, value) -> bytes:
+        return PICKLE_RAW + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes):
+        if data[:1] != PICKLE_RAW:
+            raise ValueError("Not a pickle-encoded cache value")
+        return pickle.loads(data[1:])
+
+class OrjsonZstdCodec:
+    """
+    orjson serialization compressed with zstd, optionally with a shared dictionary.
+    Congress.gov payloads repeat the same keys and URL prefixes, which is exactly
+    what a trained dictionary captures. Values that aren't JSON-native (see
+    _json_native) fall back to pickle, so every value decodes to what was stored.
+    zstd (de)compressor objects aren't thread-safe, so each thread gets its own.
+    """
+    name = "orjson-zstd"
+
+    def __init__(self, level: int = CACHE_ZSTD_LEVEL, dict_path: Optional[str] = CACHE_ZSTD_DICT):
+        import orjson
+        import zstandard
+        self._orjson = orjson
+        self._pickle = PickleCodec()
+        self._dict = None
+        if dict_path and os.path.exists(dict_path):
+            with open(dict_path, "rb") as f:
+                self._dict = zstandard.ZstdCompressionDict(f.read())
+        self._zstandard = zstandard
+        self._level = level
+        self._local = threading.local()
+
+    def _codecs(self):
+        """This thread's (compressor, decompressor), using the dictionary if one is loaded."""
+        codecs = getattr(self._local, "codecs", None)
+        if codecs is None:
+            kwargs = {"dict_data": self._dict} if self._dict is not None else {}
+            codecs = self._local.codecs = (
+                self._zstandard.ZstdCompressor(level=self._level, **kwargs),
+                self._zstandard.ZstdDecompressor(**kwargs),
+                self._zstandard.ZstdDecompressor(),
+            )
+        return codecs
+
+    def encode(self, value) -> bytes:
+        if not _json_native(value):
+            return self._pickle.encode(value)
+        try:
+            payload = self._orjson.dumps(value)
+        except TypeError:
+            return self._pickle.encode(value)
+        if len(payload) < COMPRESS_MIN_BYTES:
+            return JSON_RAW + payload
+        header = JSON_ZSTD_DICT if self._dict is not None else JSON_ZSTD
+        return header + self._codecs()[0].compress(payload)
+
+    def decode(self, data: bytes):
+        header, body = data[:1], data[1:]
+        if header == JSON_RAW:
+            return self._orjson.loads(body)
+        if header == JSON_ZSTD:
+            return self._orjson.loads(self._codecs()[2].decompress(body))
+        if header == JSON_ZSTD_DICT:
+            if self._dict is None:
+                raise ValueError("Cache value needs a zstd dictionary that isn't loaded")
+            return self._orjson.loads(self._codecs()[1].decompress(body))
+        return self._pickle.decode(data)
+
+CODECS = {
+    PickleCodec.name: PickleCodec,
+    OrjsonZstdCodec.name: OrjsonZstdCodec,
+}
+
+def get_codec(name: str = CACHE_CODEC):
+    if name not in CODECS:
+        raise ValueError(f"Unknown cache codec '{name}'. Available: {', '.join(CODECS)}")
+    return CODECS[name]()
+
+class CodecDisk(Disk):
+    """
+    diskcache Disk that stores every value through the configured codec.
+    Entries written before the codec was enabled (pickled by diskcache itself)
+    are still readable; values that fail to decode are treated as misses.
+    """
+    def __init__(self, directory, **kwargs):
+        self.codec = get_codec()
+        super().__init__(directory, **kwargs)
+
+    def store(self, value, read, key=UNKNOWN):
+        if not read:
+            value = self.codec.encode(value)
+        return super().store(value, read, key=key)
+
+    def fetch(self, mode, filename, value, read):
+        data = super().fetch(mode, filename, value, read)
+        if read or not isinstance(data, bytes):
+            return data
+        try:
+            return self.codec.decode(data)
+        except Exception as e:
+            print(f"Cache value could not be decoded, treating as a miss: {e}")
+            return None
+
+def train_zstd_dictionary(cache, output_path: str, namespace: str = "congress", max_samples: int = 2000, dict_size: int = 112640) -> Dict[str, int]:
+    """
+    Train a zstd dictionary on cached payloads from one namespace and write it
+    to output_path. Point CACHE_ZSTD_DICT at the file and restart to use it.
+    """
+    import orjson
+    import zstandard
+
+    samples = []
+    for key in cache.iterkeys():
+        if not isinstance(key, str) or not key.startswith(f"{namespace}:"):
+            continue
+        value = cache.get(key)
+        if value is None:
+            continue
+        try:
+            samples.append(orjson.dumps(value))
+        except TypeError:
+            continue
+        if len(samples) >= max_samples:
+            break
+
+    if not samples:
+        raise ValueError(f"No cached '{namespace}' payloads to train on")
+
+    dictionary = zstandard.train_dictionary(dict_size, samples)
+    with open(output_path, "wb") as f:
+        f.write(dictionary.as_bytes())
+    return {"samples": len(samples), "dict_bytes": len(dictionary.as_bytes())}
+
+if __name__ == "__main__":
+    # python -m app.services.cache_codec <output_path> [namespace]
+    import sys
+    from .cache_service import cache
+    if len(sys.argv) < 2:
+        print("Usage: python -m app.services.cache_codec <output_path> [namespace]")
+        sys.exit(1)
+    print(train_zstd_dictionary(cache, sys.argv[1], *sys.argv[2:3]))
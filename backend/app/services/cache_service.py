@@ -1,35 +1,239 @@
 import os
+import time
+import asyncio
+import inspect
+from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
 from diskcache import Cache
+from .cache_codec import CodecDisk, CACHE_CODEC
+from .telemetry import record_cache_lookup
+from .deadlines import check_deadline
 from functools import wraps
 import json
 import hashlib
 
 # Initialize a persistent cache in the project's temporary directory or local app folder
-cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache")
-cache = Cache(cache_dir)
+cache_dir = os.getenv("CACHE_DIR") or os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache")
+# Bound the on-disk footprint; diskcache culls entries past the limit using the policy
+CACHE_SIZE_LIMIT = int(os.getenv("CACHE_SIZE_LIMIT", str(256 * 1024 * 1024)))
+CACHE_EVICTION_POLICY = os.getenv("CACHE_EVICTION_POLICY", "least-recently-stored")
+# Hit/miss counters cost a write per read, so they are opt-in
+CACHE_STATISTICS = os.getenv("CACHE_STATISTICS", "false").lower() == "true"
+# "disk" (one host, shared by its worker processes) or "redis" (shared by every host)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "disk").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# How long other workers wait for the one fetching a missing entry before fetching it themselves
+CACHE_SINGLE_FLIGHT_TIMEOUT = float(os.getenv("CACHE_SINGLE_FLIGHT_TIMEOUT", "30"))
+CACHE_SINGLE_FLIGHT_POLL = 0.05
 
-def api_cache(expire=86400): # Default 24 hours
+if CACHE_BACKEND == "redis":
+    from .redis_cache import RedisCache
+    cache = RedisCache.from_url(REDIS_URL)
+else:
+    # The tag index makes evicting a single member or bill (its entity tag) an indexed delete.
+    # Values go through the configured codec (see cache_codec.py) instead of plain pickle.
+    cache = Cache(
+        cache_dir,
+        tag_index=True,
+        disk=CodecDisk,
+        size_limit=CACHE_SIZE_LIMIT,
+        eviction_policy=CACHE_EVICTION_POLICY,
+        statistics=CACHE_STATISTICS,
+    )
+
+# When set, every api_cache read is recorded here as {key: version}
+_dependency_recorder: ContextVar = ContextVar("api_cache_dependencies", default=None)
+
+def version_key(key):
+    return f"version:{key}"
+
+@contextmanager
+def record_dependencies():
+    """
+    Collect the api_cache entries read inside this block (including from worker
+    threads started with asyncio.to_thread) together with their version stamps.
+    """
+    recorded = {}
+    token = _dependency_recorder.set(recorded)
+    try:
+        yield recorded
+    finally:
+        try:
+            _dependency_recorder.reset(token)
+        except ValueError:
+            # Streaming generators can be closed from a different context
+            _dependency_recorder.set(None)
+
+def dependencies_changed(dependencies):
+    """
+    True if any recorded entry was refetched or evicted since it was recorded.
+    """
+    return any(cache.get(version_key(key)) != version for key, version in dependencies.items())
+
+def make_key(namespace, func, entity_tag, args, kwargs):
+    # Create a unique key based on function name and arguments
+    # We skip the first arg (self) for class methods
+    key_parts = [func.__name__] + list(args[1:]) + [f"{k}:{v}" for k, v in sorted(kwargs.items())]
+    key_str = ":".join(map(str, key_parts))
+    digest = hashlib.md5(key_str.encode()).hexdigest()
+    # Readable prefix so entries can be targeted by namespace, function or entity
+    return f"{namespace}:{func.__name__}:{entity_tag or '-'}:{digest}"
+
+def parse_key(key):
+    """
+    Split an api_cache key (or its version key) into (namespace, function, entity).
+    Returns None for keys without a namespace.
+    """
+    if not isinstance(key, str):
+        return None
+    if key.startswith("version:"):
+        key = key[len("version:"):]
+    parts = key.split(":")
+    if len(parts) < 2:
+        return None
+    if len(parts) < 4:
+        # Other namespaced entries (e.g. "answer:<hash>") only carry a namespace
+        return parts[0], None, None
+    return parts[0], parts[1], ":".join(parts[2:-1])
+
+def evict(namespace: Optional[str] = None, function: Optional[str] = None, entity: Optional[str] = None) -> int:
+    """
+    Remove cached entries matching every given filter and return how many were removed.
+    Entity-only evictions go through the tag index; the others scan the keys.
+    """
+    entity = entity.lower() if entity else None
+    if entity and not namespace and not function:
+        return cache.evict(entity)
+
+    removed = 0
+    for key in list(cache.iterkeys()):
+        parsed = parse_key(key)
+        if parsed is None:
+            continue
+        key_namespace, key_function, key_entity = parsed
+        if namespace and key_namespace != namespace:
+            continue
+        if function and key_function != function:
+            continue
+        if entity and key_entity != entity:
+            continue
+        if cache.delete(key):
+            removed += 1
+    return removed
+
+def lock_key(key):
+    return f"lock:{key}"
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def single_flight(key, compute):
+    """
+    Run `compute` for a missing cache entry once across every thread and worker
+    sharing the cache. The caller that takes the lock computes; the others poll
+    until the entry shows up, then read it. If the holder dies or gives up
+    (its lock expires or is released without a value), waiters compute it
+    themselves rather than fail. Cached calls belong in a worker thread
+    (asyncio.to_thread / run_blocking); one made on an event loop computes
+    instead of polling, since waiting there would stall the whole worker.
+    """
+    lock = lock_key(key)
+    if cache.add(lock, os.getpid(), expire=CACHE_SINGLE_FLIGHT_TIMEOUT):
+        try:
+            return compute()
+        finally:
+            cache.delete(lock)
+    if _on_event_loop():
+        return compute()
+
+    give_up_at = time.monotonic() + CACHE_SINGLE_FLIGHT_TIMEOUT
+    while time.monotonic() < give_up_at:
+        check_deadline()
+        time.sleep(CACHE_SINGLE_FLIGHT_POLL)
+        result = cache.get(key)
+        if result is not None:
+            return result
+        if cache.get(lock) is None:
+            break
+    return compute()
+
+def cache_stats():
+    """
+    Size accounting for the cache.
+    """
+    hits, misses = cache.stats()
+    return {
+        "backend": CACHE_BACKEND,
+        "codec": CACHE_CODEC,
+        "entries": len(cache),
+        "volume_bytes": cache.volume(),
+        "size_limit_bytes": CACHE_SIZE_LIMIT,
+        "eviction_policy": CACHE_EVICTION_POLICY,
+        "hits": hits,
+        "misses": misses,
+    }
+
+def api_cache(expire=86400, namespace="congress", entity=None): # Default 24 hours
     """
     Decorator to cache the results of a function based on its arguments.
+    Keys look like "<namespace>:<function>:<entity>:<hash>". `entity` is a format
+    string over the function's arguments (e.g. "member:{bioguide_id}"); it is also
+    stored as the entry's tag so one member or bill can be evicted on its own.
+    The wrapper also exposes `refresh` (refetch and overwrite the entry) and
+    `expires_at` (unix time the entry expires, None if absent) for warm-up jobs.
     """
     def decorator(func):
+        signature = inspect.signature(func)
+
+        def key_for(args, kwargs):
+            entity_tag = None
+            if entity:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                entity_tag = entity.format(**bound.arguments).lower()
+            return make_key(namespace, func, entity_tag, args, kwargs), entity_tag
+
+        def store(key, entity_tag, args, kwargs):
+            result = func(*args, **kwargs)
+
+            # Store in cache along with a version stamp for dependency tracking.
+            # The stamp goes first so workers waiting on the entry never see it without one.
+            cache.set(version_key(key), time.time_ns(), expire=expire, tag=entity_tag)
+            cache.set(key, result, expire=expire, tag=entity_tag)
+            return result
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Create a unique key based on function name and arguments
-            # We skip the first arg (self) for class methods
-            key_parts = [func.__name__] + list(args[1:]) + [f"{k}:{v}" for k, v in sorted(kwargs.items())]
-            key_str = ":".join(map(str, key_parts))
-            key = hashlib.md5(key_str.encode()).hexdigest()
+            key, entity_tag = key_for(args, kwargs)
 
             result = cache.get(key)
-            if result is not None:
-                return result
+            record_cache_lookup(namespace, func.__name__, result is not None)
+            if result is None:
+                # If not in cache, call the function (once across workers)
+                result = single_flight(key, lambda: store(key, entity_tag, args, kwargs))
 
-            # If not in cache, call the function
-            result = func(*args, **kwargs)
-            
-            # Store in cache
-            cache.set(key, result, expire=expire)
+            recorder = _dependency_recorder.get()
+            if recorder is not None:
+                recorder[key] = cache.get(version_key(key))
             return result
+
+        def refresh(*args, **kwargs):
+            key, entity_tag = key_for(args, kwargs)
+            return store(key, entity_tag, args, kwargs)
+
+        def expires_at(*args, **kwargs):
+            key, _ = key_for(args, kwargs)
+            value, expire_time = cache.get(key, expire_time=True)
+            if value is None:
+                return None
+            return expire_time or float("inf")
+
+        wrapper.refresh = refresh
+        wrapper.expires_at = expires_at
         return wrapper
     return decorator
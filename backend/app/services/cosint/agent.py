@@ -1,6 +1,7 @@
 import os
+import re
 import asyncio
-from typing import Type
+from typing import Type, Optional, NamedTuple, List
 from pydantic import BaseModel, Field
 from langchain.tools import BaseTool
 from langchain_openai import ChatOpenAI
@@ -9,18 +10,35 @@ from langchain_classic.agents.openai_tools.base import create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from dotenv import load_dotenv
 from .api_client import CongressAPIClient
-from ..google_civic_client import GoogleCivicClient
+from .mirror import US_STATE_CODES
+from ..district_resolver import DistrictResolver, district_resolver
 from ..brave_search_client import BraveSearchClient
+from ..cosponsor_graph import current_graph
+from ..bill_index import similar_bills, search_bills
+from ..deadlines import run_blocking, TOOL_TIMEOUT, LLM_TIMEOUT
+from ..telemetry import record_route
 
 
 class AsyncCompatTool(BaseTool):
-    """Base tool that wraps sync _run in asyncio.to_thread to prevent blocking the event loop."""
+    """
+    Base tool that runs sync _run on the tool executor to prevent blocking the event loop.
+    The call gets TOOL_TIMEOUT seconds; when it times out or the agent run is cancelled,
+    the tool's pending upstream requests are abandoned at the next HTTP call.
+    """
     async def _arun(self, *args, **kwargs):
-        return await asyncio.to_thread(self._run, *args, **kwargs)
+        try:
+            return await run_blocking(self._run, *args, timeout=TOOL_TIMEOUT, **kwargs)
+        except asyncio.TimeoutError:
+            return f"Error: {self.name} timed out after {TOOL_TIMEOUT:.0f} seconds"
 
 load_dotenv()
 
 COSINT_AGENT_MODEL = "gpt-4o-mini"
+COSINT_ANALYSIS_MODEL = "gpt-4o"
+# Bill texts shorter than this (resolutions, placeholders, one-section bills) are analyzed by COSINT_AGENT_MODEL
+BILL_ANALYSIS_LARGE_MIN_CHARS = int(os.getenv("BILL_ANALYSIS_LARGE_MIN_CHARS", "6000"))
+# Answers shorter than this many words are conversational and skip intel extraction
+INTEL_MIN_WORDS = int(os.getenv("INTEL_MIN_WORDS", "25"))
 
 class MemberSearchInput(BaseModel):
     name: str = Field(description="The name of the Congress member to search for")
@@ -146,35 +164,28 @@ class GoogleCivicTool(AsyncCompatTool):
     name: str = "get_representatives_by_address"
     description: str = "Find your Congressional district and representatives for a specific address or location"
     args_schema: Type[BaseModel] = CivicInfoInput
-    civic_client: GoogleCivicClient = Field(default_factory=GoogleCivicClient)
-    congress_client: CongressAPIClient = Field(default_factory=CongressAPIClient)
+    resolver: DistrictResolver = Field(default_factory=lambda: district_resolver)
 
     def _run(self, address: str):
         try:
-            # 1. Get divisions from Google Civic API
-            division_data = self.civic_client.get_divisions_by_address(address)
-            state, district = self.civic_client.extract_district_info(division_data)
+            # 1. Resolve the district (cached per normalized address)
+            state, district = self.resolver.resolve_address(address)
             
             result = f"I found the following for: {address}\n"
             
-            # 2. Get specific Congressional District info if found
+            # 2. Look up the delegation in the precomputed district table
             if state and district is not None:
                 result += f"District: {state}-{district}\n"
+                delegation = self.resolver.get_delegation(state, district)
                 
-                # Fetch members for this specific district
-                district_members = self.congress_client.get_members(state=state, district=district, current_member=True)
-                if district_members:
+                if delegation["representatives"]:
                     result += "\nCurrent Representative:\n"
-                    for m in district_members:
+                    for m in delegation["representatives"]:
                         result += f"- {m.get('name')} (Bioguide ID: {m.get('bioguideId')})\n"
                 
-                # Fetch all members for the state to find Senators
-                all_state_members = self.congress_client.get_members(state=state, current_member=True, limit=50)
-                senators = [m for m in all_state_members if m.get('district') is None]
-                
-                if senators:
+                if delegation["senators"]:
                     result += f"\nCurrent Senators for {state}:\n"
-                    for s in senators:
+                    for s in delegation["senators"]:
                         result += f"- {s.get('name')} (Bioguide ID: {s.get('bioguideId')})\n"
                 
                 result += f"\nYou can ask me for more details about any of these members by name!"
@@ -208,7 +219,7 @@ class BraveSearchTool(BaseTool):
     async def _arun(self, query: str):
         try:
             print(f"[BraveSearch] Executing async search for: '{query}'")
-            data = await self.client.async_search(query)
+            data = await asyncio.wait_for(self.client.async_search(query), TOOL_TIMEOUT)
             results = self.client.format_search_results(data)
             if results and "No web search results found" not in results:
                 print(f"[BraveSearch] Async success - got results for: '{query}'")
@@ -245,11 +256,60 @@ class SummarizeBillTool(AsyncCompatTool):
         except Exception as e:
             return f"Error fetching bill summary: {str(e)}"
 
+class CosponsorshipNetworkInput(BaseModel):
+    bioguide_id: Optional[str] = Field(default=None, description="Bioguide ID of the member whose top co-sponsorship partners and bridge score to get. Omit to rank the most bipartisan members.")
+    target_bioguide_id: Optional[str] = Field(default=None, description="Second member's Bioguide ID, to find the shortest chain of co-sponsors linking the two members")
+    party: Optional[str] = Field(default=None, description="When ranking bipartisan members, limit to one party: 'D', 'R' or 'I'")
+
+class CosponsorshipNetworkTool(AsyncCompatTool):
+    name: str = "get_cosponsorship_network"
+    description: str = (
+        "Analyze the co-sponsorship network: a member's most frequent co-sponsorship partners and bipartisan "
+        "bridge score (share of co-sponsorships across party lines), the most bipartisan members, or the shortest "
+        "chain of co-sponsors between two members"
+    )
+    args_schema: Type[BaseModel] = CosponsorshipNetworkInput
+
+    def _run(self, bioguide_id: Optional[str] = None, target_bioguide_id: Optional[str] = None, party: Optional[str] = None):
+        graph = current_graph()
+        if bioguide_id and target_bioguide_id:
+            path = graph.shortest_path(bioguide_id, target_bioguide_id)
+            if path is None:
+                return f"No co-sponsorship path found between {bioguide_id} and {target_bioguide_id}"
+            return {"hops": len(path) - 1, "path": path}
+        if bioguide_id:
+            result = graph.collaborators(bioguide_id, 10)
+            return result or f"No co-sponsorship data for Bioguide ID: {bioguide_id}"
+        return graph.bridges(10, party) or "No co-sponsorship data available yet"
+
+class SimilarBillsInput(BaseModel):
+    query: Optional[str] = Field(default=None, description="A description of the legislation to look for (e.g. 'tax credits for rural broadband'). Omit when giving a bill.")
+    congress: Optional[int] = Field(default=None, description="Congress number of a bill to find related bills for (e.g., 118)")
+    bill_type: Optional[str] = Field(default=None, description="Type of that bill (e.g., 'hr', 's', 'hres')")
+    bill_number: Optional[str] = Field(default=None, description="Number of that bill")
+
+class SimilarBillsTool(AsyncCompatTool):
+    name: str = "find_similar_bills"
+    description: str = "Find related legislation: bills similar to a given bill, or bills matching a topic description"
+    args_schema: Type[BaseModel] = SimilarBillsInput
+    client: CongressAPIClient = Field(default_factory=CongressAPIClient)
+
+    def _run(self, query: Optional[str] = None, congress: Optional[int] = None, bill_type: Optional[str] = None, bill_number: Optional[str] = None):
+        try:
+            if congress and bill_type and bill_number:
+                result = similar_bills(self.client, congress, bill_type.lower().replace(".", ""), str(bill_number), 8)
+                return result["similar"] or f"No similar bills found for {bill_type.upper()} {bill_number}"
+            if query:
+                return search_bills(query, 8) or f"No indexed bills match: {query}"
+            return "Provide either a bill (congress, type and number) or a description to search for"
+        except Exception as e:
+            return f"Error finding similar bills: {str(e)}"
+
 def get_cosint_agent(streaming: bool = False):
     from datetime import datetime
     current_date = datetime.now().strftime("%A, %B %d, %Y")
     
-    llm = ChatOpenAI(model=COSINT_AGENT_MODEL, temperature=0, streaming=streaming)
+    llm = ChatOpenAI(model=COSINT_AGENT_MODEL, temperature=0, streaming=streaming, stream_usage=True, timeout=LLM_TIMEOUT)
     tools = [
         MemberSearchTool(), 
         MemberStateSearchTool(), 
@@ -259,7 +319,9 @@ def get_cosint_agent(streaming: bool = False):
         MemberVotesTool(),
         GoogleCivicTool(),
         BraveSearchTool(),
-        SummarizeBillTool()
+        SummarizeBillTool(),
+        CosponsorshipNetworkTool(),
+        SimilarBillsTool()
     ]
     
     # Define the prompt locally to avoid dependency on LangSmith Hub
@@ -273,6 +335,8 @@ def get_cosint_agent(streaming: bool = False):
                    "- Use 'search_congress_member_by_name' when you have a specific person's name. "
                    "- Use 'get_congress_member_details' to get full info once you have a Bioguide ID. "
                    "- Use 'get_member_recent_votes' to see how a House representative voted on recent bills. "
+                   "- Use 'get_cosponsorship_network' for who a member works with most, how bipartisan members are, or how two members are connected through co-sponsored bills. "
+                   "- Use 'find_similar_bills' to find legislation related to a bill or matching a topic when the user doesn't know the exact bill number. "
                    "- Use 'summarize_congressional_bill' if a user asks for a summary or explanation of a specific bill (HR 1, etc.). "
                    "- Use 'web_search' to supplement Congress.gov data with up-to-date information. ALWAYS use web_search alongside official tools when answering 'Who is...', biographical questions, or questions about a member's current role/status — Congress.gov data can lag behind real-world changes (e.g., a member moving from House to Senate). Also use it for recent news, scandals, or biographical details not in official records. "
                    "If you cannot find a member, explain why or suggest alternative names. "
@@ -310,7 +374,7 @@ def get_intel_extraction_agent():
     A specialized agent responsible for analyzing chat messages and extracting
     modular information for the Research Notebook with extreme conciseness.
     """
-    llm = ChatOpenAI(model=COSINT_AGENT_MODEL, temperature=0)
+    llm = ChatOpenAI(model=COSINT_AGENT_MODEL, temperature=0, timeout=LLM_TIMEOUT)
     structured_llm = llm.with_structured_output(IntelPacket)
 
     prompt = ChatPromptTemplate.from_messages([
@@ -328,12 +392,13 @@ def get_intel_extraction_agent():
 
     return prompt | structured_llm
 
-def get_bill_analysis_agent():
+def get_bill_analysis_agent(model: str = COSINT_ANALYSIS_MODEL):
     """
     An agent specialized in reading raw legislative text and providing
-    an executive 'plain English' summary for non-lawyers.
+    an executive 'plain English' summary for non-lawyers. See
+    bill_analysis_model for which model a given text needs.
     """
-    llm = ChatOpenAI(model="gpt-4o", temperature=0) # Use gpt-4o for better reasoning on legal text
+    llm = ChatOpenAI(model=model, temperature=0, timeout=LLM_TIMEOUT)
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a Senior Legislative Analyst. Your job is to read the raw text of a Congressional bill and provide a high-precision 'Plain English' summary. "
@@ -348,3 +413,201 @@ def get_bill_analysis_agent():
     ])
     
     return prompt | llm
+
+def get_member_briefing_agent():
+    """
+    Writes an analyst briefing for one member from data gathered up front,
+    so bulk briefings need no tool calls.
+    """
+    llm = ChatOpenAI(model=COSINT_AGENT_MODEL, temperature=0, timeout=LLM_TIMEOUT)
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are an OSINT Intelligence Analyst preparing a briefing on a member of Congress for a policy team. "
+                   "Use ONLY the JSON profile provided; do not invent facts, dates or votes. "
+                   "Structure the briefing in Markdown with these sections:\n"
+                   "- **Overview**: name, party, state/district, chamber and tenure in one or two sentences.\n"
+                   "- **Committees**: their assignments and what they suggest about the member's focus.\n"
+                   "- **Legislative Focus**: themes in their recently sponsored bills, citing 2-3 bills as [BILL_TYPE BILL_NUMBER](/bill/CONGRESS/BILL_TYPE/BILL_NUMBER).\n"
+                   "- **Recent Votes**: notable recent House votes and how they voted (omit for senators or if no votes are listed).\n"
+                   "- **Key Takeaways**: 2-3 bullet points.\n"
+                   "Keep it under 300 words and strictly neutral."),
+        ("human", "Member profile:\n\n{profile}")
+    ])
+
+    return prompt | llm
+
+# --- Routing ---
+# Turns that need no agent run: small talk gets a canned reply and direct
+# delegation lookups ("who is the rep for NJ-8") are answered from the
+# district table. Anything else, or a lookup the table can't answer, goes to
+# the agent. Savings of each route are recorded by route_ledger.
+
+_STATE_BY_NAME = {name.lower(): code for name, code in US_STATE_CODES.items()}
+_STATE_NAME = {code: name for name, code in US_STATE_CODES.items()}
+_STATE = "|".join(sorted(list(_STATE_BY_NAME) + [code.lower() for code in _STATE_NAME], key=len, reverse=True))
+
+# Whole-message forms, matched against normalize_question() output ("NJ-8th" ->
+# "nj 8th", "New Jersey's" -> "new jersey s", "U.S." -> "u s"). Only a bare
+# "who holds this seat" question is routed; anything added to it, such as a
+# vote, a stance or a follow-up clause, makes the message miss every form.
+_SEAT = rf"(?:the )?(?P<state>{_STATE})(?: s)?(?: congressional)?(?: district)? (?P<district>\d{{1,2}}|at large|al)(?:st|nd|rd|th)?(?: congressional)?(?: district)?"
+_HOUSE_ROLE = r"(?:reps?|representatives?|congress(?:man|woman|person)|member of congress)"
+_AND_SENATORS = r"(?P<senators> and (?:its|their|the) (?:us |u s )?senators)?"
+_DISTRICT_FORMS = [re.compile(form) for form in (
+    rf"^(?:who (?:is|s) )?(?:my |the )?(?:current )?{_HOUSE_ROLE} (?:for|from|of|in) {_SEAT}{_AND_SENATORS}$",
+    rf"^who (?:represents|is representing) {_SEAT}{_AND_SENATORS}$",
+    rf"^(?:who (?:is|s) )?{_SEAT} {_HOUSE_ROLE}{_AND_SENATORS}$",
+)]
+# Without a district number, codes that are also words ("senators for me") aren't states
+_STATE_WORDS = "|".join(sorted(list(_STATE_BY_NAME) + [code.lower() for code in _STATE_NAME if code not in ("IN", "ME", "OR", "HI", "OK", "OH")], key=len, reverse=True))
+_SENATE_ROLE = r"(?:us |u s )?senators?"
+_SENATOR_FORMS = [re.compile(form) for form in (
+    rf"^(?:who (?:are|is|s) )?(?:my |the )?(?:current )?{_SENATE_ROLE} (?:for|from|of|in) (?P<state>{_STATE_WORDS})$",
+    rf"^(?:who (?:are|is|s) )?(?:the )?(?P<state>{_STATE_WORDS})(?: s)? {_SENATE_ROLE}$",
+    rf"^who represents (?P<state>{_STATE_WORDS}) in the senate$",
+)]
+_GREETING_RE = re.compile(r"^(?:hi|hello|hey|good (?:morning|afternoon|evening))(?: there)?$")
+_THANKS_RE = re.compile(r"^(?:thanks?|thank you|thx|ty)(?: (?:so|very) much| a lot)?$|^(?:bye|goodbye)$")
+
+class TurnRoute(NamedTuple):
+    name: str # "small_talk", "district_lookup" or "senator_lookup"
+    state: Optional[str] = None
+    district: Optional[int] = None
+    with_senators: bool = False
+    reply: Optional[str] = None
+
+def route_turn(message: str) -> Optional[TurnRoute]:
+    """
+    The fast path for a chat message, or None if it needs the agent. Cheap
+    (regular expressions only); answer_route does the lookup.
+    """
+    from ..answer_cache import normalize_question
+
+    text = normalize_question(message)
+    if _GREETING_RE.match(text):
+        return TurnRoute("small_talk", reply="Hello! I can look up members of Congress, who represents a district or address, bills and votes. What would you like to know?")
+    if _THANKS_RE.match(text):
+        return TurnRoute("small_talk", reply="You're welcome! Let me know if there's anything else you'd like to look up.")
+
+    for form in _DISTRICT_FORMS:
+        match = form.match(text)
+        if match:
+            district = match.group("district")
+            district = 0 if district in ("at large", "al") else int(district)
+            return TurnRoute("district_lookup", _state_code(match.group("state")), district, with_senators=bool(match.group("senators")))
+    for form in _SENATOR_FORMS:
+        match = form.match(text)
+        if match:
+            return TurnRoute("senator_lookup", _state_code(match.group("state")))
+    return None
+
+def _state_code(state: str) -> str:
+    return _STATE_BY_NAME.get(state) or state.upper()
+
+def _display_name(name: Optional[str]) -> str:
+    # The member list gives "Last, First M."
+    last, _, first = (name or "").partition(", ")
+    return f"{first} {last}" if first else last
+
+def _profile_link(member) -> str:
+    return f"[{_display_name(member.get('name'))}](https://www.congress.gov/member/{member.get('bioguideId')})"
+
+def _senators_sentence(state: str, senators) -> str:
+    names = [f"**{_profile_link(s)}** ({s.get('party')})" for s in senators]
+    listed = " and ".join([", ".join(names[:-1]), names[-1]] if len(names) > 1 else names)
+    return f"The U.S. Senators for {_STATE_NAME.get(state, state)} are {listed}."
+
+def answer_route(route: TurnRoute) -> Optional[str]:
+    """
+    The reply for a fast-path turn, built from the district table in the
+    agent's answer format; None when the table can't answer it and the turn
+    should go to the agent. Blocking (the table may need building).
+    """
+    if route.reply:
+        return route.reply
+    if route.state not in _STATE_NAME:
+        return None
+    delegation = district_resolver.get_delegation(route.state, route.district)
+    senators = delegation["senators"]
+
+    if route.name == "senator_lookup":
+        if not senators:
+            return None
+        answer = _senators_sentence(route.state, senators)
+        if len(senators) == 1:
+            answer += f"\n\n[CREATE_PAGE_ACTION: {_display_name(senators[0].get('name'))} | {senators[0].get('bioguideId')}]"
+        return answer
+
+    representatives = delegation["representatives"]
+    if not representatives and route.district == 1:
+        # At-large seats are listed as district 0
+        representatives = district_resolver.get_delegation(route.state, 0)["representatives"]
+    if len(representatives) != 1:
+        return None
+    member = representatives[0]
+    name = _display_name(member.get("name"))
+    seat = f"{route.state}-{route.district}" if route.district else f"{route.state} (at-large)"
+    answer = (f"The U.S. Representative for {seat} is **{name}** ({member.get('party')}). "
+              f"For more information, you can [visit their official profile](https://www.congress.gov/member/{member.get('bioguideId')}) "
+              f"or create a new COSINT page.")
+    if route.with_senators and senators:
+        answer += "\n\n" + _senators_sentence(route.state, senators)
+    return answer + f"\n\n[CREATE_PAGE_ACTION: {name} | {member.get('bioguideId')}]"
+
+_ACTION_TAG_RE = re.compile(r"\[[A-Z_]+:[^\]]*\]")
+
+def needs_extraction(response: str) -> bool:
+    """Whether an agent answer is substantial enough to be worth an intel extraction call."""
+    return len(_ACTION_TAG_RE.sub(" ", response).split()) >= INTEL_MIN_WORDS
+
+_AMENDMENT_RE = re.compile(r"\bis (?:further )?amended\b|\bby striking\b|\bnotwithstanding\b", re.IGNORECASE)
+
+def bill_analysis_model(bill_text: str) -> str:
+    """
+    Long bills and ones that rewrite existing law need the large model's legal
+    reasoning; short bills, resolutions and placeholder texts don't.
+    """
+    if len(bill_text) >= BILL_ANALYSIS_LARGE_MIN_CHARS or len(_AMENDMENT_RE.findall(bill_text)) >= 3:
+        return COSINT_ANALYSIS_MODEL
+    return COSINT_AGENT_MODEL
+
+class RouteLedger:
+    """
+    Estimated cost and latency each routing decision saved, recorded as
+    Prometheus counters. A route's saving is what the path it avoided costs
+    on average, kept as running averages of that path in this process (with
+    rough starting estimates until it has run).
+    """
+    SMOOTHING = 0.1
+
+    def __init__(self):
+        # path -> [USD, seconds]
+        self.baselines = {
+            "agent": [0.0012, 5.0],
+            "extraction": [0.0002, 1.0],
+            "bill_analysis_large": [0.02, 12.0],
+        }
+
+    def observe(self, path: str, usd: float, seconds: float):
+        """Record a run of a full-cost path and fold it into its baseline."""
+        baseline = self.baselines.setdefault(path, [usd, seconds])
+        baseline[0] += self.SMOOTHING * (usd - baseline[0])
+        baseline[1] += self.SMOOTHING * (seconds - baseline[1])
+        record_route(path)
+
+    def avoided(self, route: str, paths: List[str], seconds: float = 0.0):
+        """Record a route that skipped `paths` entirely, taking `seconds` itself."""
+        usd = sum(self.baselines[path][0] for path in paths)
+        saved_seconds = sum(self.baselines[path][1] for path in paths) - seconds
+        record_route(route, usd, max(saved_seconds, 0.0))
+
+    def bill_analysis(self, model: str, usage, seconds: float):
+        """Record a bill analysis; `usage` is its TelemetryCallbackHandler."""
+        if model == COSINT_ANALYSIS_MODEL:
+            self.observe("bill_analysis_large", usage.cost(), seconds)
+            return
+        # Same tokens, priced on the large model
+        saved_usd = usage.cost(COSINT_ANALYSIS_MODEL) - usage.cost()
+        record_route("bill_analysis_small", saved_usd, max(self.baselines["bill_analysis_large"][1] - seconds, 0.0))
+
+route_ledger = RouteLedger()
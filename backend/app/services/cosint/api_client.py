@@ -1,28 +1,108 @@
 import os
+import time
+import threading
+from collections import deque
 import requests
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from dotenv import load_dotenv
 from ..cache_service import api_cache
+from ..telemetry import upstream_call
+from ..deadlines import http_timeout, TOOL_MAX_WORKERS
+from .mirror import CONGRESS_MIRROR_ENABLED, MISSING, get_mirror
+from .bill_history import BillHistory
 
 load_dotenv()
 
+# Congress.gov allows 5,000 requests per hour per key
+CONGRESS_API_HOURLY_LIMIT = int(os.getenv("CONGRESS_API_HOURLY_LIMIT", "5000"))
+# Share of the hourly limit that background jobs (warm-up, polling) may use
+CONGRESS_API_LOW_PRIORITY_SHARE = float(os.getenv("CONGRESS_API_LOW_PRIORITY_SHARE", "0.3"))
+# Worker processes sharing the API key; each one keeps to its share of the hourly limit
+WEB_CONCURRENCY = max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+
+class BudgetExhausted(Exception):
+    """Raised when a low-priority client would exceed its share of the hourly limit."""
+
+class RequestBudget:
+    """
+    Sliding one-hour window of Congress.gov requests shared by every client in the process.
+    User-facing requests are always let through; low-priority requests are refused once
+    the window holds more than their share of the limit.
+    """
+    def __init__(self, hourly_limit: int, low_priority_share: float):
+        self.hourly_limit = hourly_limit
+        self.low_priority_limit = int(hourly_limit * low_priority_share)
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, low_priority: bool = False) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            while self._timestamps and now - self._timestamps[0] > 3600:
+                self._timestamps.popleft()
+            if low_priority and len(self._timestamps) >= self.low_priority_limit:
+                return False
+            self._timestamps.append(now)
+            return True
+
+    def remaining(self) -> int:
+        with self._lock:
+            return max(self.hourly_limit - len(self._timestamps), 0)
+
+# One connection pool for every client in the process (worker threads, batch CLI runs)
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=TOOL_MAX_WORKERS))
+
+request_budget = RequestBudget(CONGRESS_API_HOURLY_LIMIT // WEB_CONCURRENCY, CONGRESS_API_LOW_PRIORITY_SHARE)
+
 class CongressAPIClient:
-    BASE_URL = "https://api.congress.gov/v3"
+    BASE_URL = os.getenv("CONGRESS_API_BASE_URL", "https://api.congress.gov/v3")
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, low_priority: bool = False, read_through: Optional[bool] = None):
         self.api_key = api_key or os.getenv("CONGRESS_API_KEY")
         if not self.api_key:
             raise ValueError("CONGRESS_API_KEY not found. Please set it in your environment or .env file.")
+        self.low_priority = low_priority
+        # Read-through mode answers from the local mirror (see mirror.py) before calling the API
+        if read_through is None:
+            read_through = CONGRESS_MIRROR_ENABLED
+        self.mirror = get_mirror() if read_through else None
+        # Complete, incrementally refreshed actions and cosponsors of each bill (see bill_history.py)
+        self.history = BillHistory(self)
+
+    def _read_through(self, resource: str, lookup: Callable[[], Any], fetch: Callable[[], Any]) -> Any:
+        """
+        Serve from the mirror when it has the answer and `resource` was synced recently,
+        otherwise call the API. If the API fails, stale mirror data is better than nothing.
+        """
+        if self.mirror is None:
+            return fetch()
+        if self.mirror.is_fresh(resource):
+            result = lookup()
+            if result is not MISSING:
+                return result
+        try:
+            return fetch()
+        except requests.RequestException:
+            result = lookup()
+            if result is MISSING:
+                raise
+            print(f"Congress.gov unavailable, serving {resource} from the local mirror")
+            return result
 
     def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if not request_budget.acquire(self.low_priority):
+            raise BudgetExhausted("Low-priority Congress.gov budget exhausted for this hour")
+
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
         default_params = {"api_key": self.api_key, "format": "json"}
         if params:
             default_params.update(params)
         
-        response = requests.get(url, params=default_params)
-        response.raise_for_status()
-        return response.json()
+        with upstream_call("congress", endpoint):
+            response = _session.get(url, params=default_params, timeout=http_timeout())
+            response.raise_for_status()
+            return response.json()
 
     @api_cache(expire=3600)
     def get_members(self, current_member: bool = True, limit: int = 20, state: Optional[str] = None, district: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -39,18 +119,24 @@ class CongressAPIClient:
         if current_member:
             params["currentMember"] = "true"
         
-        data = self._get(endpoint, params=params)
-        return data.get("members", [])
+        return self._read_through(
+            "members",
+            lambda: self.mirror.members(current_member, limit, state, district),
+            lambda: self._get(endpoint, params=params).get("members", []),
+        )
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="member:{bioguide_id}")
     def get_member_details(self, bioguide_id: str) -> Dict[str, Any]:
         """
         Fetch details for a specific member by their Bioguide ID.
         """
-        data = self._get(f"member/{bioguide_id}")
-        return data.get("member", {})
+        return self._read_through(
+            "members",
+            lambda: self.mirror.member_details(bioguide_id),
+            lambda: self._get(f"member/{bioguide_id}").get("member", {}),
+        )
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="member:{bioguide_id}")
     def get_member_committees(self, bioguide_id: str) -> List[Dict[str, Any]]:
         """
         Fetch committee assignments for a specific member.
@@ -58,7 +144,7 @@ class CongressAPIClient:
         data = self._get(f"member/{bioguide_id}/committees")
         return data.get("committees", [])
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="member:{bioguide_id}")
     def get_sponsored_legislation(self, bioguide_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Fetch legislation sponsored by a specific member.
@@ -67,15 +153,18 @@ class CongressAPIClient:
         data = self._get(f"member/{bioguide_id}/sponsored-legislation", params=params)
         return data.get("sponsoredLegislation", [])
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="bill:{congress}-{bill_type}-{bill_number}")
     def get_bill_details(self, congress: int, bill_type: str, bill_number: str) -> Dict[str, Any]:
         """
         Fetch details for a specific bill.
         """
-        data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}")
-        return data.get("bill", {})
+        return self._read_through(
+            f"bills:{congress}",
+            lambda: self.mirror.bill_details(congress, bill_type, bill_number),
+            lambda: self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}").get("bill", {}),
+        )
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="bill:{congress}-{bill_type}-{bill_number}")
     def get_bill_text(self, congress: int, bill_type: str, bill_number: str) -> List[Dict[str, Any]]:
         """
         Fetch text versions for a specific bill.
@@ -83,7 +172,7 @@ class CongressAPIClient:
         data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}/text")
         return data.get("textVersions", [])
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="bill:{congress}-{bill_type}-{bill_number}")
     def get_bill_text_content(self, congress: int, bill_type: str, bill_number: str) -> Optional[str]:
         """
         Fetches the actual text content of the latest bill version.
@@ -108,8 +197,9 @@ class CongressAPIClient:
             
         try:
             # Note: Congress API URLs often require the API key as a param even for direct text links
-            response = requests.get(target_format["url"], params={"api_key": self.api_key})
-            response.raise_for_status()
+            with upstream_call("congress_text", target_format["url"]):
+                response = _session.get(target_format["url"], params={"api_key": self.api_key}, timeout=http_timeout())
+                response.raise_for_status()
             
             # Simple cleanup of HTML/XML tags
             import re
@@ -125,43 +215,72 @@ class CongressAPIClient:
             print(f"Failed to fetch bill text content: {e}")
             return None
 
-    @api_cache(expire=86400)
-    def get_bill_actions(self, congress: int, bill_type: str, bill_number: str, limit: int = 100) -> List[Dict[str, Any]]:
+    @api_cache(expire=86400, entity="bill:{congress}-{bill_type}-{bill_number}")
+    def get_bill_actions(self, congress: int, bill_type: str, bill_number: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Fetch actions taken on a specific bill.
+        Fetch every action taken on a specific bill, newest first (only the first `limit` if given).
         """
-        params = {"limit": limit}
-        data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}/actions", params=params)
-        return data.get("actions", [])
+        actions = self._read_through(
+            f"bills:{congress}",
+            lambda: self.mirror.bill_actions(congress, bill_type, bill_number),
+            lambda: self.history.actions(congress, bill_type, bill_number),
+        )
+        return actions[:limit] if limit else actions
 
-    @api_cache(expire=86400)
+    @api_cache(expire=86400, entity="bill:{congress}-{bill_type}-{bill_number}")
     def get_bill_cosponsors(self, congress: int, bill_type: str, bill_number: str) -> List[Dict[str, Any]]:
         """
-        Fetch cosponsors for a specific bill.
+        Fetch every cosponsor of a specific bill.
         """
-        data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}/cosponsors")
-        return data.get("cosponsors", [])
+        def fetch():
+            try:
+                summary = self.get_bill_details(congress, bill_type, bill_number)
+            except requests.RequestException:
+                summary = None
+            return self.history.cosponsors(congress, bill_type, bill_number, summary)
+
+        return self._read_through(
+            f"bills:{congress}",
+            lambda: self.mirror.bill_cosponsors(congress, bill_type, bill_number),
+            fetch,
+        )
 
     def get_recent_house_votes(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Fetch the most recent House roll call votes.
         """
         params = {"limit": limit}
-        data = self._get("house-vote", params=params)
-        return data.get("houseRollCallVotes", [])
+        congress = self.mirror.latest_vote_congress() if self.mirror else None
+        return self._read_through(
+            f"house_votes:{congress}",
+            lambda: self.mirror.recent_house_votes(limit),
+            lambda: self._get("house-vote", params=params).get("houseRollCallVotes", []),
+        )
+
+    # A roll call's member votes never change once it is recorded
+    @api_cache(expire=604800, entity="roll_call:{congress}-{session}-{roll_call}")
+    def get_roll_call_votes(self, congress: int, session: int, roll_call: int) -> Dict[str, str]:
+        """
+        How every member voted on a House roll call: {bioguide_id: vote cast}.
+        One fetch serves every member's lookup.
+        """
+        def fetch() -> Dict[str, str]:
+            endpoint = f"house-vote/{congress}/{session}/{roll_call}/members"
+            data = self._get(endpoint)
+            member_votes = data.get("houseRollCallVoteMemberVotes", {}).get("results", [])
+            return {mv["bioguideID"]: mv.get("voteCast") for mv in member_votes if mv.get("bioguideID")}
+
+        return self._read_through(
+            f"house_votes:{congress}",
+            lambda: self.mirror.roll_call_votes(congress, session, roll_call),
+            fetch,
+        )
 
     def get_member_vote_on_roll_call(self, congress: int, session: int, roll_call: int, bioguide_id: str) -> Optional[str]:
         """
         Find how a specific member voted on a specific House roll call.
         """
-        endpoint = f"house-vote/{congress}/{session}/{roll_call}/members"
-        data = self._get(endpoint)
-        
-        member_votes = data.get("houseRollCallVoteMemberVotes", {}).get("results", [])
-        for mv in member_votes:
-            if mv.get("bioguideID") == bioguide_id:
-                return mv.get("voteCast")
-        return None
+        return self.get_roll_call_votes(congress, session, roll_call).get(bioguide_id)
 
     # Common nickname → official name mappings for Congress members
     NICKNAME_MAP = {
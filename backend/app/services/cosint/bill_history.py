@@ -0,0 +1,180 @@
+import json
+import hashlib
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from sqlalchemy.exc import IntegrityError
+from ...database import MirrorSessionLocal, BillActionLog, BillCosponsorLog, BillSponsorLog, BillHistoryState
+from .mirror import PAGE_SIZE, bill_key, fetch_all_pages
+
+def action_key(action: Dict[str, Any]) -> str:
+    """Identity of an action, which Congress.gov doesn't give an ID."""
+    raw = f"{action.get('actionDate')}|{action.get('actionCode') or ''}|{action.get('text') or ''}"
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
+
+def _count(summary: Optional[Dict[str, Any]], name: str, field: str) -> Optional[int]:
+    value = ((summary or {}).get(name) or {}).get(field)
+    return value if isinstance(value, int) else None
+
+class BillHistory:
+    """
+    Local, append-only record of each bill's actions and cosponsors (in the
+    mirror database). The first lookup of a bill downloads both lists in full,
+    with pages fetched concurrently; later lookups only fetch what is newer:
+    - actions are listed newest first, so pages are read down to the newest
+      stored action date;
+    - cosponsors are listed in sponsorship order, so the list is read from the
+      number already stored. The bill's cosponsor counts, when given, skip the
+      request if nothing changed and force a full reread after a withdrawal
+      (which changes a stored record instead of adding one).
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def _state(self, key: str) -> Optional[BillHistoryState]:
+        with MirrorSessionLocal() as db:
+            return db.get(BillHistoryState, key)
+
+    # --- Actions ---
+
+    def _actions_since(self, path: str, through: str) -> List[Dict[str, Any]]:
+        """Actions dated `through` or later, newest first."""
+        new, offset = [], 0
+        while True:
+            data = self.client._get(path, params={"limit": PAGE_SIZE, "offset": offset})
+            page = data.get("actions", [])
+            for action in page:
+                if (action.get("actionDate") or "") < through:
+                    return new
+                new.append(action)
+            if len(page) < PAGE_SIZE or not (data.get("pagination") or {}).get("next"):
+                return new
+            offset += PAGE_SIZE
+
+    def _merge_actions(self, key: str, fetched: List[Dict[str, Any]]) -> int:
+        with MirrorSessionLocal() as db:
+            query = db.query(BillActionLog.action_key).filter(BillActionLog.bill_id == key)
+            dates = [a.get("actionDate") for a in fetched if a.get("actionDate")]
+            if dates:
+                query = query.filter(BillActionLog.action_date >= min(dates))
+            known = {k for (k,) in query}
+            new: Dict[str, Dict[str, Any]] = {}
+            for action in fetched:
+                k = action_key(action)
+                if k not in known:
+                    new.setdefault(k, action)
+
+            # Oldest first, so ids increase with time
+            db.add_all(BillActionLog(bill_id=key, action_key=k, action_date=a.get("actionDate"), payload=json.dumps(a))
+                       for k, a in reversed(list(new.items())))
+            state = db.get(BillHistoryState, key)
+            if state is None:
+                state = BillHistoryState(bill_id=key)
+                db.add(state)
+            state.actions_through = max([d for d in dates if d] + [state.actions_through or ""]) or None
+            state.refreshed_at = datetime.utcnow()
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker stored the same actions first
+                db.rollback()
+                return 0
+        return len(new)
+
+    def actions(self, congress: int, bill_type: str, bill_number: str) -> List[Dict[str, Any]]:
+        """Every action on the bill, newest first, after merging any new ones."""
+        key = bill_key(congress, bill_type, bill_number)
+        path = f"bill/{congress}/{bill_type.lower()}/{bill_number}/actions"
+        state = self._state(key)
+        if state is None or state.actions_through is None:
+            fetched = fetch_all_pages(self.client, path, "actions")
+        else:
+            fetched = self._actions_since(path, state.actions_through)
+        self._merge_actions(key, fetched)
+
+        with MirrorSessionLocal() as db:
+            rows = (db.query(BillActionLog.payload)
+                    .filter(BillActionLog.bill_id == key)
+                    .order_by(BillActionLog.action_date.desc(), BillActionLog.id.desc()).all())
+        return [json.loads(payload) for (payload,) in rows]
+
+    # --- Cosponsors ---
+
+    def _merge_cosponsors(self, key: str, fetched: List[Dict[str, Any]], total: Optional[int], withdrawn: Optional[int], sponsor: Optional[Dict[str, Any]] = None) -> int:
+        with MirrorSessionLocal() as db:
+            # Kept next to the cosponsors for the co-sponsorship graph
+            if sponsor and sponsor.get("bioguideId"):
+                db.merge(BillSponsorLog(bill_id=key, bioguide_id=sponsor["bioguideId"], name=sponsor.get("fullName"), party=sponsor.get("party")))
+            stored = {row.bioguide_id: row for row in db.query(BillCosponsorLog).filter(BillCosponsorLog.bill_id == key)}
+            changed = 0
+            for cosponsor in fetched:
+                bioguide_id = cosponsor.get("bioguideId")
+                if not bioguide_id:
+                    continue
+                payload = json.dumps(cosponsor)
+                row = stored.get(bioguide_id)
+                if row is None:
+                    row = stored[bioguide_id] = BillCosponsorLog(bill_id=key, bioguide_id=bioguide_id)
+                    db.add(row)
+                elif row.payload == payload:
+                    continue
+                row.sponsorship_date = cosponsor.get("sponsorshipDate")
+                row.payload = payload
+                changed += 1
+
+            state = db.get(BillHistoryState, key)
+            if state is None:
+                state = BillHistoryState(bill_id=key)
+                db.add(state)
+            dates = [row.sponsorship_date for row in stored.values() if row.sponsorship_date]
+            state.cosponsors_through = max(dates) if dates else None
+            state.cosponsor_count = total if total is not None else len(stored)
+            state.withdrawn_count = withdrawn if withdrawn is not None else sum(
+                1 for row in stored.values() if json.loads(row.payload or "{}").get("sponsorshipWithdrawnDate"))
+            state.refreshed_at = datetime.utcnow()
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return 0
+        return changed
+
+    def cosponsors(self, congress: int, bill_type: str, bill_number: str, summary: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Every cosponsor of the bill (withdrawn ones included), in sponsorship
+        order. `summary` is the bill detail, whose cosponsor counts say whether
+        the stored list is still complete.
+        """
+        key = bill_key(congress, bill_type, bill_number)
+        path = f"bill/{congress}/{bill_type.lower()}/{bill_number}/cosponsors"
+        total = _count(summary, "cosponsors", "countIncludingWithdrawnCosponsors")
+        current = _count(summary, "cosponsors", "count")
+        withdrawn = total - current if total is not None and current is not None else None
+        state = self._state(key)
+
+        if state is None or state.cosponsor_count is None or (withdrawn is not None and withdrawn != state.withdrawn_count):
+            fetched = fetch_all_pages(self.client, path, "cosponsors")
+        elif total is not None and total == state.cosponsor_count:
+            fetched = []
+        else:
+            # Start one record early to check the stored list is still a prefix
+            offset = max(state.cosponsor_count - 1, 0)
+            fetched = fetch_all_pages(self.client, path, "cosponsors", offset=offset)
+            if offset and not (fetched and self._stored_cosponsor(key, fetched[0].get("bioguideId"))):
+                fetched = fetch_all_pages(self.client, path, "cosponsors")
+            elif total is None:
+                # Without the bill's counts, the response's length stands in for them
+                total = offset + len(fetched)
+        sponsors = (summary or {}).get("sponsors") or []
+        self._merge_cosponsors(key, fetched, total, withdrawn, sponsors[0] if sponsors else None)
+
+        with MirrorSessionLocal() as db:
+            rows = (db.query(BillCosponsorLog.payload)
+                    .filter(BillCosponsorLog.bill_id == key)
+                    .order_by(BillCosponsorLog.sponsorship_date, BillCosponsorLog.bioguide_id).all())
+        return [json.loads(payload) for (payload,) in rows]
+
+    def _stored_cosponsor(self, key: str, bioguide_id: Optional[str]) -> bool:
+        if not bioguide_id:
+            return False
+        with MirrorSessionLocal() as db:
+            return db.get(BillCosponsorLog, (key, bioguide_id)) is not None
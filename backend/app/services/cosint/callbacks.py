@@ -0,0 +1,65 @@
+import time
+from typing import Any, Dict, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from ..telemetry import LLM_SECONDS, LLM_TOKENS, TOOL_SECONDS, record_timing, llm_cost
+
+class TelemetryCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callbacks that time every LLM call and tool invocation of an agent run
+    and count LLM tokens. `usage` keeps this handler's own totals per model,
+    for pricing a single run.
+    """
+    def __init__(self):
+        self._started: Dict[Any, tuple] = {}
+        self.usage: Dict[str, Dict[str, int]] = {}
+
+    def cost(self, model: Optional[str] = None) -> float:
+        """USD spent so far, or what the same tokens would have cost on `model`."""
+        return sum(llm_cost(model or used, tokens["prompt"], tokens["completion"]) for used, tokens in self.usage.items())
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (kwargs.get("metadata") or {}).get("ls_model_name") or "unknown"
+        self._started[run_id] = ("llm", model, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        kind, model, start = self._started.pop(run_id, ("llm", "unknown", None))
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            LLM_SECONDS.labels(model=model).observe(elapsed)
+            record_timing("llm", elapsed)
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if not usage:
+            # Streaming responses report usage on the message instead
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    metadata = getattr(message, "usage_metadata", None) or {}
+                    usage = {"prompt_tokens": metadata.get("input_tokens", 0), "completion_tokens": metadata.get("output_tokens", 0)}
+        totals = self.usage.setdefault(model, {"prompt": 0, "completion": 0})
+        for token_type in ("prompt_tokens", "completion_tokens"):
+            if usage.get(token_type):
+                LLM_TOKENS.labels(model=model, type=token_type.split("_")[0]).inc(usage[token_type])
+                totals[token_type.split("_")[0]] += usage[token_type]
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._started[run_id] = ("tool", (serialized or {}).get("name") or kwargs.get("name") or "unknown", time.perf_counter())
+
+    def _finish_tool(self, run_id, status):
+        entry = self._started.pop(run_id, None)
+        if entry is None:
+            return
+        _, tool, start = entry
+        elapsed = time.perf_counter() - start
+        TOOL_SECONDS.labels(tool=tool, status=status).observe(elapsed)
+        record_timing(f"tool_{tool}", elapsed)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish_tool(run_id, "ok")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish_tool(run_id, "error")
@@ -1,12 +1,61 @@
+import os
 import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Optional, Dict, Any, List, Callable
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
-from .agent import get_cosint_agent
+from rich.markup import escape
+from ..brave_search_client import search_memo, close_clients
+from ..deadlines import deadline_scope, AGENT_RUN_TIMEOUT
+
+# Questions answered at once in batch mode
+CLI_BATCH_CONCURRENCY = int(os.getenv("CLI_BATCH_CONCURRENCY", "8"))
+DEFAULT_CONTEXT = "General inquiry mode."
 
 console = Console()
+# Progress and errors go to stderr, so batch results can be piped from stdout
+status_console = Console(stderr=True)
+
+async def stream_answer(
+    agent_executor,
+    query: str,
+    chat_history: List[tuple],
+    context: str = DEFAULT_CONTEXT,
+    on_token: Optional[Callable[[str], None]] = None,
+    on_tool: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Run one agent turn and return the answer, passing each streamed token and
+    each tool the agent calls to the callbacks as they happen.
+    """
+    answer = ""
+    with deadline_scope(AGENT_RUN_TIMEOUT), search_memo():
+        async for event in agent_executor.astream_events(
+            {"input": query, "chat_history": chat_history, "context": context},
+            version="v2",
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    answer += content
+                    if on_token:
+                        on_token(content)
+            elif kind == "on_tool_start" and on_tool:
+                on_tool(event["name"])
+    return answer
 
-def run_cli():
+def load_agent(streaming: bool = True):
+    # The banner is up before LangChain and the OpenAI client are imported
+    with status_console.status("[bold green]Loading agent...[/bold green]"):
+        from .agent import get_cosint_agent
+        return get_cosint_agent(streaming=streaming)
+
+async def interactive(context: str):
     console.print(Panel.fit(
         "[bold blue]COSINT[/bold blue]\n"
         "[italic]Congress Open Source Intelligence Tool[/italic]\n\n"
@@ -16,7 +65,7 @@ def run_cli():
     ))
 
     try:
-        agent_executor = get_cosint_agent()
+        agent_executor = load_agent()
     except Exception as e:
         console.print(f"[bold red]Error initializing agent:[/bold red] {e}")
         sys.exit(1)
@@ -25,37 +74,159 @@ def run_cli():
 
     while True:
         try:
+            # Nothing else runs between turns, so the prompt may block the loop
             query = Prompt.ask("\n[bold cyan]Query[/bold cyan]")
-            
+
             if query.lower() in ["exit", "quit", "q"]:
                 console.print("[yellow]Goodbye![/yellow]")
                 break
-            
+
             if not query.strip():
                 continue
 
-            with console.status("[bold green]Searching Congress data...[/bold green]"):
-                response = agent_executor.invoke({
-                    "input": query,
-                    "chat_history": chat_history
-                })
-            
             console.print("\n[bold green]COSINT Response:[/bold green]")
-            console.print(response["output"])
+            answer = await stream_answer(
+                agent_executor, query, chat_history, context,
+                on_token=lambda text: console.print(text, end="", markup=False, highlight=False),
+                on_tool=lambda name: console.print(f"[dim]→ {name}[/dim]"),
+            )
+            console.print()
 
             # Update chat history
             chat_history.append(("human", query))
-            chat_history.append(("assistant", response["output"]))
-            
+            chat_history.append(("assistant", answer))
+
             # Keep history manageable (last 10 interactions)
             if len(chat_history) > 20:
                 chat_history = chat_history[-20:]
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             console.print("\n[yellow]Goodbye![/yellow]")
             break
         except Exception as e:
             console.print(f"[bold red]An error occurred:[/bold red] {e}")
 
+def read_questions(lines, context: str) -> List[Dict[str, Any]]:
+    """
+    One question per line. A line may also be a JSON object with "question"
+    and optionally "id" and "context" (e.g. a member page context for briefings).
+    Blank lines and lines starting with "#" are skipped. A malformed JSON line
+    becomes a question with an "error", reported in the results like a failed
+    answer instead of stopping the batch.
+    """
+    questions = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                questions.append({"id": len(questions), "question": line, "context": context, "error": f"line {number}: invalid JSON ({e})"})
+                continue
+            if not isinstance(item, dict) or not isinstance(item.get("question"), str):
+                questions.append({"id": len(questions), "question": line, "context": context, "error": f"line {number}: JSON lines need a \"question\" string"})
+                continue
+            questions.append({
+                "id": item.get("id", len(questions)),
+                "question": item["question"],
+                "context": item.get("context") or context,
+            })
+        else:
+            questions.append({"id": len(questions), "question": line, "context": context})
+    return questions
+
+async def answer_one(agent_executor, item: Dict[str, Any]) -> Dict[str, Any]:
+    if "error" in item:
+        return {"id": item["id"], "question": item["question"], "error": item["error"], "tools": [], "time_to_first_token_ms": None, "elapsed_ms": 0.0}
+    start = time.perf_counter()
+    first_token: List[float] = []
+    tools: List[str] = []
+
+    def on_token(_):
+        if not first_token:
+            first_token.append(time.perf_counter() - start)
+
+    result = {"id": item["id"], "question": item["question"]}
+    try:
+        result["answer"] = await stream_answer(agent_executor, item["question"], [], item["context"], on_token=on_token, on_tool=tools.append)
+    except Exception as e:
+        result["error"] = str(e) or type(e).__name__
+    result["tools"] = tools
+    result["time_to_first_token_ms"] = round(first_token[0] * 1000, 1) if first_token else None
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+async def run_batch(questions: List[Dict[str, Any]], output, concurrency: int = CLI_BATCH_CONCURRENCY) -> int:
+    """
+    Answer every question through one agent (one LLM client, cache and set of
+    connection pools), at most `concurrency` at a time, writing each result
+    as a JSON line as soon as it finishes. Returns the number of failures.
+    """
+    agent_executor = load_agent()
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+    start = time.perf_counter()
+
+    async def run(item):
+        async with semaphore:
+            return await answer_one(agent_executor, item)
+
+    for done, task in enumerate(asyncio.as_completed([run(q) for q in questions]), 1):
+        result = await task
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        if "error" in result:
+            failures += 1
+        status_console.print(f"[{done}/{len(questions)}] {result['elapsed_ms'] / 1000:.1f}s {'[red]failed[/red]' if 'error' in result else 'ok'}: {escape(result['question'][:60])}")
+
+    status_console.print(f"Answered {len(questions) - failures}/{len(questions)} questions in {time.perf_counter() - start:.1f}s")
+    return failures
+
+async def main_async(args) -> int:
+    try:
+        if not args.batch:
+            await interactive(args.context)
+            return 0
+
+        source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+        with source:
+            questions = read_questions(source, args.context)
+        if not questions:
+            status_console.print("[yellow]No questions found[/yellow]")
+            return 0
+
+        if args.output and args.output != "-":
+            with open(args.output, "w", encoding="utf-8") as output:
+                failures = await run_batch(questions, output, args.concurrency)
+        else:
+            failures = await run_batch(questions, sys.stdout, args.concurrency)
+        return 1 if failures else 0
+    finally:
+        await close_clients()
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+def run_cli(argv=None):
+    parser = argparse.ArgumentParser(description="COSINT command-line assistant")
+    parser.add_argument("--batch", metavar="FILE", help="Answer the questions in FILE (one per line, or JSON lines; '-' for stdin) and exit")
+    parser.add_argument("--output", metavar="FILE", help="Batch results as JSON lines (default: stdout)")
+    parser.add_argument("--concurrency", type=positive_int, default=CLI_BATCH_CONCURRENCY, help="Questions answered at once in batch mode")
+    parser.add_argument("--context", default=DEFAULT_CONTEXT, help="Contextual hint passed to the agent")
+    args = parser.parse_args(argv)
+    try:
+        sys.exit(asyncio.run(main_async(args)))
+    except KeyboardInterrupt:
+        status_console.print("\n[yellow]Goodbye![/yellow]")
+        sys.exit(130)
+
 if __name__ == "__main__":
     run_cli()
@@ -0,0 +1,381 @@
+import os
+import json
+import argparse
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Callable, Iterator
+from ...database import (
+    MirrorSessionLocal, MirrorMember, MirrorBill, MirrorBillAction, MirrorBillCosponsor,
+    MirrorRollCall, MirrorRollCallVote, MirrorSyncState, init_mirror_db,
+)
+from ..cache_service import evict
+
+# Answer from the mirror first when CongressAPIClient runs in read-through mode
+CONGRESS_MIRROR_ENABLED = os.getenv("CONGRESS_MIRROR_ENABLED", "false").lower() == "true"
+# Mirror data older than this (seconds since the last successful sync) is only used when the API is down
+CONGRESS_MIRROR_MAX_STALENESS = int(os.getenv("CONGRESS_MIRROR_MAX_STALENESS", "86400"))
+# Page size for list endpoints (Congress.gov caps it at 250)
+PAGE_SIZE = 250
+# Pages of one list fetched at once once its length is known
+CONGRESS_PAGE_CONCURRENCY = int(os.getenv("CONGRESS_PAGE_CONCURRENCY", "4"))
+
+# Returned by lookups when the mirror can't answer, since None and [] are valid answers
+MISSING = object()
+
+US_STATE_CODES = {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
+    "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA",
+    "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL", "Indiana": "IN", "Iowa": "IA",
+    "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
+    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS", "Missouri": "MO",
+    "Montana": "MT", "Nebraska": "NE", "Nevada": "NV", "New Hampshire": "NH", "New Jersey": "NJ",
+    "New Mexico": "NM", "New York": "NY", "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH",
+    "Oklahoma": "OK", "Oregon": "OR", "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC",
+    "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX", "Utah": "UT", "Vermont": "VT",
+    "Virginia": "VA", "Washington": "WA", "West Virginia": "WV", "Wisconsin": "WI", "Wyoming": "WY",
+    "District of Columbia": "DC", "Puerto Rico": "PR", "Guam": "GU", "American Samoa": "AS",
+    "Virgin Islands": "VI", "Northern Mariana Islands": "MP",
+}
+
+def bill_key(congress: int, bill_type: str, bill_number: str) -> str:
+    return f"{congress}-{bill_type.lower()}-{bill_number}"
+
+def roll_call_key(congress: int, session: int, roll_call: int) -> str:
+    return f"{congress}-{session}-{roll_call}"
+
+def _loads(payload: Optional[str]):
+    return json.loads(payload) if payload else None
+
+class CongressMirror:
+    """
+    Read side of the local Congress.gov mirror. Every lookup returns MISSING when
+    the mirror has no answer, so the caller can fall back to the live API.
+    """
+    def __init__(self, max_staleness: int = CONGRESS_MIRROR_MAX_STALENESS):
+        self.max_staleness = max_staleness
+
+    def is_fresh(self, resource: str) -> bool:
+        with MirrorSessionLocal() as db:
+            state = db.get(MirrorSyncState, resource)
+        return bool(state and state.last_synced and datetime.utcnow() - state.last_synced <= timedelta(seconds=self.max_staleness))
+
+    def latest_vote_congress(self) -> Optional[int]:
+        with MirrorSessionLocal() as db:
+            row = db.query(MirrorRollCall.congress).order_by(MirrorRollCall.congress.desc()).first()
+        return row[0] if row else None
+
+    def members(self, current_member: bool, limit: int, state: Optional[str], district: Optional[int]):
+        # Only current members are mirrored in full
+        if not current_member:
+            return MISSING
+        with MirrorSessionLocal() as db:
+            query = db.query(MirrorMember.payload).filter(MirrorMember.current_member.is_(True))
+            if state:
+                query = query.filter(MirrorMember.state_code == state.upper())
+            if district is not None:
+                query = query.filter(MirrorMember.district == int(district))
+            rows = query.order_by(MirrorMember.update_date.desc()).limit(limit).all()
+        return [json.loads(payload) for (payload,) in rows] if rows else MISSING
+
+    def member_details(self, bioguide_id: str):
+        with MirrorSessionLocal() as db:
+            member = db.get(MirrorMember, bioguide_id.upper())
+            detail = member.detail if member else None
+        return _loads(detail) if detail else MISSING
+
+    def bill_details(self, congress: int, bill_type: str, bill_number: str):
+        with MirrorSessionLocal() as db:
+            bill = db.get(MirrorBill, bill_key(congress, bill_type, bill_number))
+            detail = bill.detail if bill else None
+        return _loads(detail) if detail else MISSING
+
+    def _synced_bill(self, db, congress: int, bill_type: str, bill_number: str) -> bool:
+        bill = db.get(MirrorBill, bill_key(congress, bill_type, bill_number))
+        return bool(bill and bill.detail)
+
+    def bill_actions(self, congress: int, bill_type: str, bill_number: str, limit: Optional[int] = None):
+        with MirrorSessionLocal() as db:
+            if not self._synced_bill(db, congress, bill_type, bill_number):
+                return MISSING
+            rows = (db.query(MirrorBillAction.payload)
+                    .filter(MirrorBillAction.bill_id == bill_key(congress, bill_type, bill_number))
+                    .order_by(MirrorBillAction.id).limit(limit).all())
+        return [json.loads(payload) for (payload,) in rows]
+
+    def bill_cosponsors(self, congress: int, bill_type: str, bill_number: str):
+        with MirrorSessionLocal() as db:
+            if not self._synced_bill(db, congress, bill_type, bill_number):
+                return MISSING
+            rows = (db.query(MirrorBillCosponsor.payload)
+                    .filter(MirrorBillCosponsor.bill_id == bill_key(congress, bill_type, bill_number))
+                    .order_by(MirrorBillCosponsor.sponsorship_date, MirrorBillCosponsor.bioguide_id).all())
+        return [json.loads(payload) for (payload,) in rows]
+
+    def recent_house_votes(self, limit: int):
+        with MirrorSessionLocal() as db:
+            rows = db.query(MirrorRollCall.payload).order_by(MirrorRollCall.start_date.desc()).limit(limit).all()
+        return [json.loads(payload) for (payload,) in rows] if rows else MISSING
+
+    def roll_call_votes(self, congress: int, session: int, roll_call: int):
+        key = roll_call_key(congress, session, roll_call)
+        with MirrorSessionLocal() as db:
+            if db.get(MirrorRollCall, key) is None:
+                return MISSING
+            rows = (db.query(MirrorRollCallVote.bioguide_id, MirrorRollCallVote.vote_cast)
+                    .filter(MirrorRollCallVote.roll_call_id == key).all())
+        return {bioguide_id: vote_cast for bioguide_id, vote_cast in rows}
+
+_mirror: Optional[CongressMirror] = None
+
+def get_mirror() -> CongressMirror:
+    """Process-wide mirror reader, created on first use."""
+    global _mirror
+    if _mirror is None:
+        _mirror = CongressMirror()
+    return _mirror
+
+# --- Sync ---
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _paginate(client, endpoint: str, list_key: str, params: Optional[Dict[str, Any]] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+    while True:
+        page_params = dict(params or {}, limit=PAGE_SIZE, offset=offset)
+        data = client._get(endpoint, params=page_params)
+        items = data.get(list_key, [])
+        yield from items
+        if len(items) < PAGE_SIZE or not (data.get("pagination") or {}).get("next"):
+            return
+        offset += PAGE_SIZE
+
+def fetch_all_pages(client, endpoint: str, list_key: str, params: Optional[Dict[str, Any]] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Every item of a list endpoint from `offset` on, in order. The first page's
+    pagination.count says how many pages `pagination.next` would lead through,
+    so the rest are requested up to CONGRESS_PAGE_CONCURRENCY at a time instead
+    of one after another.
+    """
+    data = client._get(endpoint, params=dict(params or {}, limit=PAGE_SIZE, offset=offset))
+    items = list(data.get(list_key, []))
+    pagination = data.get("pagination") or {}
+    if len(items) < PAGE_SIZE or not pagination.get("next"):
+        return items
+    count = pagination.get("count")
+    if not isinstance(count, int):
+        return items + list(_paginate(client, endpoint, list_key, dict(params or {}), offset + PAGE_SIZE))
+
+    def page(page_offset: int) -> List[Dict[str, Any]]:
+        return client._get(endpoint, params=dict(params or {}, limit=PAGE_SIZE, offset=page_offset)).get(list_key, [])
+
+    offsets = range(offset + PAGE_SIZE, count, PAGE_SIZE)
+    # Each page runs in a copy of the caller's context, so its deadline still applies
+    with ThreadPoolExecutor(max_workers=min(CONGRESS_PAGE_CONCURRENCY, len(offsets)) or 1) as pool:
+        pages = list(pool.map(lambda o: contextvars.copy_context().run(page, o), offsets))
+    for rest in pages:
+        items.extend(rest)
+    return items
+
+def _watermark(resource: str) -> Optional[datetime]:
+    with MirrorSessionLocal() as db:
+        state = db.get(MirrorSyncState, resource)
+        return state.last_synced if state else None
+
+def _mark_synced(resource: str, started: datetime):
+    with MirrorSessionLocal() as db:
+        state = db.get(MirrorSyncState, resource) or MirrorSyncState(resource=resource)
+        state.last_synced = started
+        db.merge(state)
+        db.commit()
+
+def _run_resource(resource: str, full: bool, sync: Callable[[Optional[str]], Dict[str, int]]) -> Dict[str, int]:
+    """
+    Run one resource sync from its watermark. The watermark only moves forward
+    once the whole pass succeeds, so an interrupted sync is retried next time
+    (already-synced rows are skipped by their update date).
+    """
+    started = datetime.utcnow()
+    since = None if full else _watermark(resource)
+    stats = sync(_format_datetime(since) if since else None)
+    _mark_synced(resource, started)
+    return stats
+
+def sync_members(client, full: bool = False) -> Dict[str, int]:
+    def sync(since: Optional[str]) -> Dict[str, int]:
+        stats = {"listed": 0, "updated": 0}
+        params = {"currentMember": "true"}
+        if since:
+            params["fromDateTime"] = since
+        seen = set()
+        for item in _paginate(client, "member", "members", params):
+            stats["listed"] += 1
+            bioguide_id = item.get("bioguideId")
+            if not bioguide_id:
+                continue
+            seen.add(bioguide_id)
+            with MirrorSessionLocal() as db:
+                member = db.get(MirrorMember, bioguide_id)
+                if member and member.detail and member.update_date == item.get("updateDate"):
+                    if not member.current_member:
+                        member.current_member = True
+                        db.commit()
+                    continue
+            detail = client._get(f"member/{bioguide_id}").get("member", {})
+            with MirrorSessionLocal() as db:
+                db.merge(MirrorMember(
+                    bioguide_id=bioguide_id,
+                    name=item.get("name"),
+                    state_code=US_STATE_CODES.get(item.get("state"), item.get("state")),
+                    district=item.get("district"),
+                    current_member=True,
+                    update_date=item.get("updateDate"),
+                    payload=json.dumps(item),
+                    detail=json.dumps(detail),
+                ))
+                db.commit()
+            evict(entity=f"member:{bioguide_id}")
+            stats["updated"] += 1
+        if not since:
+            # A full listing is authoritative for who is currently serving
+            with MirrorSessionLocal() as db:
+                db.query(MirrorMember).filter(MirrorMember.bioguide_id.notin_(seen)).update(
+                    {MirrorMember.current_member: False}, synchronize_session=False)
+                db.commit()
+        return stats
+
+    return _run_resource("members", full, sync)
+
+def sync_bill(client, congress: int, bill_type: str, bill_number: str, item: Optional[Dict[str, Any]] = None):
+    """
+    Load one bill with its actions and cosponsors, replacing whatever the mirror held.
+    """
+    path = f"bill/{congress}/{bill_type.lower()}/{bill_number}"
+    detail = client._get(path).get("bill", {})
+    actions = fetch_all_pages(client, f"{path}/actions", "actions")
+    cosponsors = fetch_all_pages(client, f"{path}/cosponsors", "cosponsors")
+    key = bill_key(congress, bill_type, bill_number)
+
+    with MirrorSessionLocal() as db:
+        db.merge(MirrorBill(
+            bill_id=key,
+            congress=congress,
+            bill_type=bill_type.lower(),
+            bill_number=str(bill_number),
+            update_date=(item or detail).get("updateDate"),
+            payload=json.dumps(item or detail),
+            detail=json.dumps(detail),
+        ))
+        db.query(MirrorBillAction).filter(MirrorBillAction.bill_id == key).delete(synchronize_session=False)
+        db.query(MirrorBillCosponsor).filter(MirrorBillCosponsor.bill_id == key).delete(synchronize_session=False)
+        db.add_all(MirrorBillAction(bill_id=key, action_date=a.get("actionDate"), payload=json.dumps(a)) for a in actions)
+        db.add_all(MirrorBillCosponsor(bill_id=key, bioguide_id=c.get("bioguideId"), sponsorship_date=c.get("sponsorshipDate"), payload=json.dumps(c))
+                   for c in {c.get("bioguideId"): c for c in cosponsors if c.get("bioguideId")}.values())
+        db.commit()
+    evict(entity=f"bill:{key}")
+
+def sync_bills(client, congress: int, full: bool = False) -> Dict[str, int]:
+    def sync(since: Optional[str]) -> Dict[str, int]:
+        stats = {"listed": 0, "updated": 0}
+        params = {"sort": "updateDate desc"}
+        if since:
+            params["fromDateTime"] = since
+        for item in _paginate(client, f"bill/{congress}", "bills", params):
+            stats["listed"] += 1
+            bill_type, bill_number = (item.get("type") or "").lower(), item.get("number")
+            if not bill_type or not bill_number:
+                continue
+            with MirrorSessionLocal() as db:
+                bill = db.get(MirrorBill, bill_key(congress, bill_type, bill_number))
+                if bill and bill.detail and bill.update_date == item.get("updateDate"):
+                    continue
+            sync_bill(client, congress, bill_type, bill_number, item)
+            stats["updated"] += 1
+        return stats
+
+    return _run_resource(f"bills:{congress}", full, sync)
+
+def sync_house_votes(client, congress: int, full: bool = False) -> Dict[str, int]:
+    # The house-vote list has no update-date filter, so every pass lists all roll calls
+    # and only fetches member votes for new or changed ones.
+    def sync(since: Optional[str]) -> Dict[str, int]:
+        stats = {"listed": 0, "updated": 0}
+        for item in _paginate(client, f"house-vote/{congress}", "houseRollCallVotes"):
+            stats["listed"] += 1
+            session, roll_call = item.get("sessionNumber"), item.get("rollCallNumber")
+            if session is None or roll_call is None:
+                continue
+            key = roll_call_key(congress, session, roll_call)
+            with MirrorSessionLocal() as db:
+                existing = db.get(MirrorRollCall, key)
+                if existing and existing.update_date == item.get("updateDate"):
+                    continue
+            data = client._get(f"house-vote/{congress}/{session}/{roll_call}/members")
+            votes = data.get("houseRollCallVoteMemberVotes", {}).get("results", [])
+            with MirrorSessionLocal() as db:
+                db.merge(MirrorRollCall(
+                    roll_call_id=key,
+                    congress=congress,
+                    session=session,
+                    roll_call=roll_call,
+                    start_date=item.get("startDate"),
+                    update_date=item.get("updateDate"),
+                    payload=json.dumps(item),
+                ))
+                db.query(MirrorRollCallVote).filter(MirrorRollCallVote.roll_call_id == key).delete(synchronize_session=False)
+                db.add_all(MirrorRollCallVote(roll_call_id=key, bioguide_id=v.get("bioguideID"), vote_cast=v.get("voteCast"))
+                           for v in {v.get("bioguideID"): v for v in votes if v.get("bioguideID")}.values())
+                db.commit()
+            if existing:
+                evict(entity=f"roll_call:{congress}-{session}-{roll_call}")
+            stats["updated"] += 1
+        return stats
+
+    return _run_resource(f"house_votes:{congress}", full, sync)
+
+def run_sync(congresses: List[int], resources: List[str], full: bool = False, low_priority: bool = True) -> Dict[str, Any]:
+    """
+    Bring the mirror up to date. Stops at the first resource that fails (e.g. the
+    low-priority budget runs out); rerunning continues from the saved watermarks.
+    """
+    from .api_client import CongressAPIClient, BudgetExhausted
+
+    init_mirror_db()
+    client = CongressAPIClient(low_priority=low_priority)
+    results: Dict[str, Any] = {}
+    jobs = []
+    if "members" in resources:
+        jobs.append(("members", lambda: sync_members(client, full)))
+    for congress in congresses:
+        if "bills" in resources:
+            jobs.append((f"bills:{congress}", lambda c=congress: sync_bills(client, c, full)))
+        if "votes" in resources:
+            jobs.append((f"house_votes:{congress}", lambda c=congress: sync_house_votes(client, c, full)))
+
+    for name, job in jobs:
+        try:
+            results[name] = job()
+        except BudgetExhausted:
+            results[name] = "paused: low-priority Congress.gov budget exhausted"
+            break
+        except Exception as e:
+            results[name] = f"failed: {e}"
+            break
+    return results
+
+if __name__ == "__main__":
+    # python -m app.services.cosint.mirror --congress 119 [--full] [--resources members,bills,votes]
+    parser = argparse.ArgumentParser(description="Sync the local Congress.gov mirror")
+    parser.add_argument("--congress", default="119", help="Comma-separated congresses to sync bills and votes for")
+    parser.add_argument("--resources", default="members,bills,votes")
+    parser.add_argument("--full", action="store_true", help="Ignore watermarks and re-list everything")
+    parser.add_argument("--high-priority", action="store_true", help="Don't limit the sync to the low-priority request budget")
+    args = parser.parse_args()
+    results = run_sync(
+        [int(c) for c in args.congress.split(",") if c],
+        [r for r in args.resources.split(",") if r],
+        full=args.full,
+        low_priority=not args.high_priority,
+    )
+    for name, result in results.items():
+        print(f"{name}: {result}")
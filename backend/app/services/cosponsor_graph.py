@@ -0,0 +1,325 @@
+import os
+import json
+import socket
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from ..database import (
+    MirrorSessionLocal, BillCosponsorLog, BillSponsorLog, BillHistoryState,
+    MirrorBill, MirrorBillCosponsor,
+)
+from .cache_service import cache_dir
+from .scheduler import LeaderScheduler
+from .cosint.mirror import CONGRESS_MIRROR_ENABLED
+
+COSPONSOR_GRAPH_REFRESH_ENABLED = os.getenv("COSPONSOR_GRAPH_REFRESH_ENABLED", "true").lower() == "true"
+# Seconds between passes folding newly stored cosponsor lists into the graph
+COSPONSOR_GRAPH_REFRESH_INTERVAL = int(os.getenv("COSPONSOR_GRAPH_REFRESH_INTERVAL", "600"))
+COSPONSOR_GRAPH_PATH = os.getenv("COSPONSOR_GRAPH_PATH") or os.path.join(cache_dir, "cosponsor_graph.npz")
+# Members sharing fewer bills than this in total aren't ranked as bridges
+COSPONSOR_BRIDGE_MIN_WEIGHT = int(os.getenv("COSPONSOR_BRIDGE_MIN_WEIGHT", "10"))
+
+# Every host keeps its own copy of the graph file, so the lock is per host
+COSPONSOR_GRAPH_LOCK_KEY = f"lock:cosponsor_graph:{socket.gethostname()}"
+PARTIES = ["D", "R", "I"]
+UNKNOWN_PARTY = -1
+QUERY_CHUNK = 500
+
+def _party_code(party: Optional[str]) -> int:
+    party = (party or "").strip().upper()[:1]
+    return PARTIES.index(party) if party in PARTIES else UNKNOWN_PARTY
+
+def _strings(values: List[str]) -> np.ndarray:
+    return np.array(values, dtype=str) if values else np.array([], dtype="<U1")
+
+def _clique(members: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Both directions of every pair among the members."""
+    i, j = np.triu_indices(len(members), 1)
+    return np.concatenate([members[i], members[j]]), np.concatenate([members[j], members[i]])
+
+def _merge_edges(n: int, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 rows: np.ndarray, cols: np.ndarray, deltas: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSR arrays (n rows) of the existing edges plus the weight deltas; edges reaching zero are dropped."""
+    old_rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    keys = np.concatenate([old_rows * n + indices, rows.astype(np.int64) * n + cols])
+    keys, inverse = np.unique(keys, return_inverse=True)
+    summed = np.bincount(inverse, weights=np.concatenate([weights, deltas])).astype(np.int32)
+    keep = summed > 0
+    keys, summed = keys[keep], summed[keep]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // n, minlength=n), out=indptr[1:])
+    return indptr, (keys % n).astype(np.int32), summed
+
+class CosponsorGraph:
+    """
+    Co-sponsorship network over every cosponsor list stored locally (bill
+    history, and the mirror when enabled). Members are interned to row numbers
+    and kept as numpy arrays:
+    - the bill incidence (bill_ptr / bill_members), each bill's sponsor and
+      active cosponsors;
+    - the member adjacency in CSR form (indptr / indices / weights), each
+      weight being the number of bills two members share.
+    refresh() only reads the bills whose lists changed since the last pass and
+    applies the difference between their old and new member sets to the
+    adjacency, so a pass costs the new bills, not the whole network. The arrays
+    are saved as one .npz file that every worker on the host reads.
+    """
+    def __init__(self, arrays: Optional[Dict[str, np.ndarray]] = None):
+        arrays = arrays or {}
+        self.ids = arrays.get("ids", _strings([]))
+        self.names = arrays.get("names", _strings([]))
+        self.party = arrays.get("party", np.array([], dtype=np.int8))
+        self.bills = arrays.get("bills", _strings([]))
+        self.bill_ptr = arrays.get("bill_ptr", np.zeros(1, dtype=np.int64))
+        self.bill_members = arrays.get("bill_members", np.array([], dtype=np.int32))
+        self.indptr = arrays.get("indptr", np.zeros(len(self.ids) + 1, dtype=np.int64))
+        self.indices = arrays.get("indices", np.array([], dtype=np.int32))
+        self.weights = arrays.get("weights", np.array([], dtype=np.int32))
+        # Mirror bills' update dates and the bill history's refresh time as of the last pass
+        self.mirror_bills = arrays.get("mirror_bills", _strings([]))
+        self.mirror_updates = arrays.get("mirror_updates", _strings([]))
+        self.history_through = str(arrays.get("history_through", ""))
+        self.index = {bioguide_id: i for i, bioguide_id in enumerate(self.ids.tolist())}
+        self._scores = None
+
+    @classmethod
+    def load(cls, path: str = COSPONSOR_GRAPH_PATH) -> "CosponsorGraph":
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def save(self, path: str = COSPONSOR_GRAPH_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f, ids=self.ids, names=self.names, party=self.party,
+                bills=self.bills, bill_ptr=self.bill_ptr, bill_members=self.bill_members,
+                indptr=self.indptr, indices=self.indices, weights=self.weights,
+                mirror_bills=self.mirror_bills, mirror_updates=self.mirror_updates,
+                history_through=np.array(self.history_through),
+            )
+        # Readers see either the old file or the new one
+        os.replace(tmp, path)
+
+    # --- Incremental refresh ---
+
+    def _changed_bills(self, db) -> Tuple[set, Dict[str, str], str]:
+        """Bills whose stored cosponsor lists may have changed, with the new mirror stamps and history watermark."""
+        changed = set()
+        through = self.history_through
+        query = db.query(BillHistoryState.bill_id, BillHistoryState.refreshed_at).filter(BillHistoryState.cosponsor_count.isnot(None))
+        if self.history_through:
+            # Inclusive, so a list committed in the same instant as the last pass isn't missed
+            query = query.filter(BillHistoryState.refreshed_at >= datetime.fromisoformat(self.history_through))
+        for bill_id, refreshed_at in query:
+            changed.add(bill_id)
+            if refreshed_at:
+                through = max(through, refreshed_at.isoformat())
+
+        stamps = dict(zip(self.mirror_bills.tolist(), self.mirror_updates.tolist()))
+        if CONGRESS_MIRROR_ENABLED:
+            for bill_id, update_date in db.query(MirrorBill.bill_id, MirrorBill.update_date).filter(MirrorBill.detail.isnot(None)):
+                if stamps.get(bill_id) != (update_date or ""):
+                    changed.add(bill_id)
+                    stamps[bill_id] = update_date or ""
+        return changed, stamps, through
+
+    def _members(self, db, bill_ids: List[str]) -> Dict[str, Dict[str, Tuple[Optional[str], Optional[str]]]]:
+        """{bill id: {bioguide id: (name, party)}} of each bill's sponsor and active cosponsors."""
+        members: Dict[str, Dict[str, Tuple[Optional[str], Optional[str]]]] = {bill_id: {} for bill_id in bill_ids}
+        withdrawn = set()
+        tables = [BillCosponsorLog] + ([MirrorBillCosponsor] if CONGRESS_MIRROR_ENABLED else [])
+        for start in range(0, len(bill_ids), QUERY_CHUNK):
+            chunk = bill_ids[start:start + QUERY_CHUNK]
+            for table in tables:
+                for bill_id, bioguide_id, payload in db.query(table.bill_id, table.bioguide_id, table.payload).filter(table.bill_id.in_(chunk)):
+                    cosponsor = json.loads(payload or "{}")
+                    if cosponsor.get("sponsorshipWithdrawnDate"):
+                        withdrawn.add((bill_id, bioguide_id))
+                    else:
+                        members[bill_id][bioguide_id] = (cosponsor.get("fullName"), cosponsor.get("party"))
+            for bill_id, bioguide_id, name, party in (db.query(BillSponsorLog.bill_id, BillSponsorLog.bioguide_id, BillSponsorLog.name, BillSponsorLog.party)
+                                                      .filter(BillSponsorLog.bill_id.in_(chunk))):
+                members[bill_id][bioguide_id] = (name, party)
+            if CONGRESS_MIRROR_ENABLED:
+                for bill_id, detail in db.query(MirrorBill.bill_id, MirrorBill.detail).filter(MirrorBill.bill_id.in_(chunk), MirrorBill.detail.isnot(None)):
+                    sponsors = json.loads(detail).get("sponsors") or []
+                    if sponsors and sponsors[0].get("bioguideId"):
+                        members[bill_id][sponsors[0]["bioguideId"]] = (sponsors[0].get("fullName"), sponsors[0].get("party"))
+        # A withdrawal recorded by either source wins
+        for bill_id, bioguide_id in withdrawn:
+            members[bill_id].pop(bioguide_id, None)
+        return members
+
+    def refresh(self) -> Dict[str, int]:
+        stats = {"bills_checked": 0, "bills_changed": 0, "members": len(self.ids), "edges": len(self.indices) // 2}
+        with MirrorSessionLocal() as db:
+            changed, stamps, through = self._changed_bills(db)
+            members = self._members(db, sorted(changed)) if changed else {}
+        stats["bills_checked"] = len(changed)
+
+        ids, names, party = self.ids.tolist(), self.names.tolist(), self.party.tolist()
+        index = dict(self.index)
+
+        def intern(bioguide_id: str, name: Optional[str], member_party: Optional[str]) -> int:
+            i = index.get(bioguide_id)
+            if i is None:
+                i = index[bioguide_id] = len(ids)
+                ids.append(bioguide_id)
+                names.append(name or "")
+                party.append(UNKNOWN_PARTY)
+            if name:
+                names[i] = name
+            if _party_code(member_party) != UNKNOWN_PARTY:
+                party[i] = _party_code(member_party)
+            return i
+
+        incidence = {bill_id: self.bill_members[self.bill_ptr[b]:self.bill_ptr[b + 1]] for b, bill_id in enumerate(self.bills.tolist())}
+        rows, cols, deltas = [], [], []
+        for bill_id, found in members.items():
+            new = np.array(sorted(intern(bioguide_id, *info) for bioguide_id, info in found.items()), dtype=np.int32)
+            old = incidence.get(bill_id)
+            if old is not None and np.array_equal(old, new):
+                continue
+            for group, sign in ((old, -1), (new, 1)):
+                if group is not None and len(group) > 1:
+                    r, c = _clique(group)
+                    rows.append(r)
+                    cols.append(c)
+                    deltas.append(np.full(len(r), sign, dtype=np.int32))
+            if len(new):
+                incidence[bill_id] = new
+            else:
+                incidence.pop(bill_id, None)
+            stats["bills_changed"] += 1
+
+        if stats["bills_changed"]:
+            n = len(ids)
+            self.ids, self.names, self.party = _strings(ids), _strings(names), np.array(party, dtype=np.int8)
+            if rows:
+                self.indptr, self.indices, self.weights = _merge_edges(
+                    n, self.indptr, self.indices, self.weights,
+                    np.concatenate(rows), np.concatenate(cols), np.concatenate(deltas))
+            else:
+                self.indptr = np.concatenate([self.indptr, np.full(n + 1 - len(self.indptr), self.indptr[-1], dtype=np.int64)])
+            bill_ids = sorted(incidence)
+            self.bills = _strings(bill_ids)
+            self.bill_ptr = np.zeros(len(bill_ids) + 1, dtype=np.int64)
+            np.cumsum([len(incidence[b]) for b in bill_ids], out=self.bill_ptr[1:])
+            self.bill_members = np.concatenate([incidence[b] for b in bill_ids]).astype(np.int32) if bill_ids else np.array([], dtype=np.int32)
+            self.index, self._scores = index, None
+        self.mirror_bills, self.mirror_updates = _strings(list(stamps)), _strings(list(stamps.values()))
+        self.history_through = through
+        stats.update(members=len(self.ids), edges=len(self.indices) // 2)
+        return stats
+
+    # --- Queries ---
+
+    def _member(self, i: int) -> Dict[str, Any]:
+        code = int(self.party[i])
+        return {"bioguide_id": str(self.ids[i]), "name": str(self.names[i]) or None, "party": PARTIES[code] if code != UNKNOWN_PARTY else None}
+
+    def _bridge_scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per member: shared-bill weight between Democrats and Republicans, and the
+        share of it across party lines. Independents and unknown parties get none.
+        """
+        if self._scores is None:
+            n = len(self.ids)
+            rows = np.repeat(np.arange(n), np.diff(self.indptr))
+            major = np.isin(self.party, [PARTIES.index("D"), PARTIES.index("R")])
+            known = major[rows] & major[self.indices]
+            cross = known & (self.party[rows] != self.party[self.indices])
+            total = np.bincount(rows[known], weights=self.weights[known], minlength=n)
+            across = np.bincount(rows[cross], weights=self.weights[cross], minlength=n)
+            self._scores = (total, np.divide(across, total, out=np.zeros(n), where=total > 0))
+        return self._scores
+
+    def collaborators(self, bioguide_id: str, k: int = 10) -> Optional[Dict[str, Any]]:
+        """The member's k most frequent co-sponsorship partners, by shared bills."""
+        i = self.index.get(bioguide_id.upper())
+        if i is None:
+            return None
+        start, end = self.indptr[i], self.indptr[i + 1]
+        neighbors, weights = self.indices[start:end], self.weights[start:end]
+        top = np.argpartition(-weights, k)[:k] if len(weights) > k else np.arange(len(weights))
+        top = top[np.argsort(-weights[top], kind="stable")]
+        total, score = self._bridge_scores()
+        return {
+            "member": self._member(i),
+            "bills": int(np.count_nonzero(self.bill_members == i)),
+            "collaborator_count": int(end - start),
+            "bridge_score": round(float(score[i]), 4),
+            "collaborators": [dict(self._member(int(neighbors[j])), shared_bills=int(weights[j])) for j in top],
+        }
+
+    def bridges(self, k: int = 10, party: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Members whose co-sponsorships most often cross party lines."""
+        total, score = self._bridge_scores()
+        eligible = total >= COSPONSOR_BRIDGE_MIN_WEIGHT
+        if party:
+            eligible &= self.party == _party_code(party)
+        candidates = np.flatnonzero(eligible)
+        order = candidates[np.lexsort((-total[candidates], -score[candidates]))][:k]
+        return [dict(self._member(int(i)), bridge_score=round(float(score[i]), 4), shared_bills=int(total[i])) for i in order]
+
+    def _weight(self, a: int, b: int) -> int:
+        row = self.indices[self.indptr[a]:self.indptr[a + 1]]
+        j = int(np.searchsorted(row, b))
+        return int(self.weights[self.indptr[a] + j]) if j < len(row) and row[j] == b else 0
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fewest co-sponsorship hops between two members (breadth-first, one
+        frontier at a time); None if either is unknown or they aren't connected.
+        """
+        s, t = self.index.get(source.upper()), self.index.get(target.upper())
+        if s is None or t is None:
+            return None
+        parent = np.full(len(self.ids), -1, dtype=np.int64)
+        parent[s] = s
+        frontier = np.array([s], dtype=np.int64)
+        while len(frontier) and parent[t] < 0:
+            starts, counts = self.indptr[frontier], np.diff(self.indptr)[frontier]
+            # Positions of every frontier member's neighbors in `indices`
+            offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts) + np.arange(counts.sum())
+            neighbors, sources = self.indices[offsets], np.repeat(frontier, counts)
+            unseen = parent[neighbors] < 0
+            frontier, first = np.unique(neighbors[unseen], return_index=True)
+            parent[frontier] = sources[unseen][first]
+        if parent[t] < 0:
+            return None
+        path = [t]
+        while path[-1] != s:
+            path.append(int(parent[path[-1]]))
+        path.reverse()
+        return [dict(self._member(i), shared_bills_with_previous=self._weight(path[n - 1], i) if n else None) for n, i in enumerate(path)]
+
+_current: Optional[Tuple[Optional[float], CosponsorGraph]] = None
+_load_lock = threading.Lock()
+
+def current_graph() -> CosponsorGraph:
+    """The saved graph, reloaded whenever the refresher replaces the file."""
+    global _current
+    try:
+        mtime = os.stat(COSPONSOR_GRAPH_PATH).st_mtime
+    except FileNotFoundError:
+        mtime = None
+    if _current is None or _current[0] != mtime:
+        with _load_lock:
+            if _current is None or _current[0] != mtime:
+                _current = (mtime, CosponsorGraph.load())
+    return _current[1]
+
+def refresh_graph() -> Dict[str, int]:
+    graph = CosponsorGraph.load()
+    stats = graph.refresh()
+    if stats["bills_checked"]:
+        graph.save()
+    print(f"Co-sponsorship graph refresh complete: {stats}")
+    return stats
+
+cosponsor_graph_scheduler = LeaderScheduler(COSPONSOR_GRAPH_LOCK_KEY, COSPONSOR_GRAPH_REFRESH_INTERVAL, refresh_graph, "Co-sponsorship graph refresh")
@@ -0,0 +1,116 @@
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# Wall-clock budget for one chat turn (agent run + intel extraction)
+AGENT_RUN_TIMEOUT = float(os.getenv("AGENT_RUN_TIMEOUT", "90"))
+# Budget for a single agent tool call
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "20"))
+# Upper bound for any single upstream HTTP request
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+# Agent runs allowed at once across the process; the rest wait up to AGENT_QUEUE_TIMEOUT
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "16"))
+AGENT_QUEUE_TIMEOUT = float(os.getenv("AGENT_QUEUE_TIMEOUT", "30"))
+# Per-request timeout for OpenAI calls
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+# Threads for blocking tool calls, kept apart from the default executor
+TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "32"))
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current request's deadline passed or its work was cancelled."""
+
+class AgentBusy(Exception):
+    """Raised when no agent slot frees up within AGENT_QUEUE_TIMEOUT."""
+
+# Absolute time.monotonic() deadline of the current request, if any
+_deadline: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+# Set when the caller of a worker-thread call gave up on it
+_cancelled: contextvars.ContextVar = contextvars.ContextVar("cancelled", default=None)
+
+_tool_executor = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS, thread_name_prefix="cosint-tool")
+_agent_slots = asyncio.Semaphore(AGENT_MAX_CONCURRENCY)
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """
+    Give the enclosed work at most `seconds`; an enclosing, earlier deadline still wins.
+    Propagates into asyncio tasks and asyncio.to_thread calls started inside the block.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(min(deadline, current) if current is not None else deadline)
+    try:
+        yield
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # Streaming generators can be closed from a different context
+            _deadline.set(current)
+
+def remaining() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def check_deadline():
+    """
+    Raise DeadlineExceeded if the current work was cancelled or ran out of time.
+    Blocking clients call this before each upstream request.
+    """
+    cancelled = _cancelled.get()
+    if cancelled is not None and cancelled.is_set():
+        raise DeadlineExceeded("Request was cancelled")
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+def http_timeout(default: float = HTTP_TIMEOUT) -> float:
+    """
+    Timeout for the next upstream request: the default, capped by the time left.
+    """
+    check_deadline()
+    left = remaining()
+    return default if left is None else max(min(default, left), 0.001)
+
+async def run_blocking(fn, *args, timeout: Optional[float] = None, **kwargs):
+    """
+    Run a blocking call on the tool executor. If the caller is cancelled or
+    `timeout` passes, the call is flagged so its next check_deadline() stops it,
+    and the caller gets control back right away.
+    """
+    cancelled = threading.Event()
+    loop = asyncio.get_running_loop()
+
+    def call():
+        _cancelled.set(cancelled)
+        if timeout is not None:
+            with deadline_scope(timeout):
+                return fn(*args, **kwargs)
+        return fn(*args, **kwargs)
+
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(_tool_executor, context.run, call)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        cancelled.set()
+        raise
+
+@asynccontextmanager
+async def agent_slot():
+    """
+    Hold one of the AGENT_MAX_CONCURRENCY agent run slots.
+    """
+    try:
+        await asyncio.wait_for(_agent_slots.acquire(), AGENT_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise AgentBusy("The assistant is busy right now, please try again in a moment.")
+    try:
+        yield
+    finally:
+        _agent_slots.release()
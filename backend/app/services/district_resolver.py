@@ -0,0 +1,151 @@
+import os
+import re
+import asyncio
+from typing import Optional, Dict, Any, List, Tuple
+from .cache_service import cache, api_cache
+from .google_civic_client import GoogleCivicClient
+from .cosint.api_client import CongressAPIClient
+from .cosint.mirror import US_STATE_CODES
+
+# Resolved addresses rarely move between districts; redistricting is handled by clearing the cache
+DISTRICT_CACHE_TTL = int(os.getenv("DISTRICT_CACHE_TTL", str(30 * 86400)))
+# The district -> delegation table is rebuilt at most this often
+DELEGATION_TABLE_TTL = int(os.getenv("DELEGATION_TABLE_TTL", "86400"))
+# Concurrent Google Civic lookups per batch
+BATCH_RESOLVE_CONCURRENCY = int(os.getenv("BATCH_RESOLVE_CONCURRENCY", "16"))
+BATCH_RESOLVE_MAX_ADDRESSES = int(os.getenv("BATCH_RESOLVE_MAX_ADDRESSES", "10000"))
+
+DELEGATION_TABLE_KEY = "civic:delegations"
+
+_ZIP_RE = re.compile(r"^(\d{5})(?:-\d{4})?$")
+_PUNCTUATION_RE = re.compile(r"[^\w\s#-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_address(address: str) -> str:
+    """
+    Canonical form used as the cache key, so "123 Main St., Newark NJ" and
+    "123 main st newark, nj" resolve once. ZIP+4 collapses to the 5-digit ZIP.
+    """
+    text = _WHITESPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", address.lower())).strip()
+    zip_match = _ZIP_RE.match(text.replace(" ", ""))
+    return zip_match.group(1) if zip_match else text
+
+def _member_entry(member: Dict[str, Any]) -> Dict[str, Any]:
+    return {"name": member.get("name"), "bioguideId": member.get("bioguideId"), "party": member.get("partyName")}
+
+def _member_chamber(member: Dict[str, Any]) -> Optional[str]:
+    terms = (member.get("terms") or {}).get("item") or []
+    return terms[-1].get("chamber") if terms else None
+
+def _unresolved(error: Optional[str] = None) -> Dict[str, Any]:
+    result = {"state": None, "district": None, "representatives": [], "senators": []}
+    if error:
+        result["error"] = error
+    return result
+
+class DistrictResolver:
+    """
+    Address -> (state, district) -> delegation, with both steps cached:
+    normalized addresses in the disk cache and a precomputed table of every
+    state's House members and senators.
+    """
+    def __init__(self, civic_client: Optional[GoogleCivicClient] = None, congress_client: Optional[CongressAPIClient] = None):
+        self.civic_client = civic_client or GoogleCivicClient()
+        self._congress_client = congress_client
+
+    @property
+    def congress_client(self) -> CongressAPIClient:
+        # Created lazily so importing the resolver doesn't require CONGRESS_API_KEY
+        if self._congress_client is None:
+            self._congress_client = CongressAPIClient()
+        return self._congress_client
+
+    @api_cache(expire=DISTRICT_CACHE_TTL, namespace="civic")
+    def resolve_divisions(self, normalized: str) -> Dict[str, Any]:
+        """
+        Google Civic lookup for one normalized address -> its parsed divisions
+        (see ocd_id.Division). Unresolvable addresses are cached too.
+        """
+        data = self.civic_client.get_divisions_by_address(normalized)
+        return self.civic_client.extract_divisions(data).to_dict()
+
+    def resolve_address(self, address: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        (state code, district number) for an address; district 0 is at-large.
+        """
+        divisions = self.resolve_divisions(normalize_address(address))
+        return divisions["state"], divisions["cd"]
+
+    def build_delegation_table(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Precompute every state's delegation from the current member list:
+        {"NJ": {"senators": [...], "districts": {"8": [...]}}}.
+        """
+        table: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        while True:
+            data = self.congress_client._get("member", params={"currentMember": "true", "limit": 250, "offset": offset})
+            members = data.get("members", [])
+            for m in members:
+                state = US_STATE_CODES.get(m.get("state"), m.get("state"))
+                if not state:
+                    continue
+                entry = table.setdefault(state, {"senators": [], "districts": {}})
+                if m.get("district") is None and _member_chamber(m) != "House of Representatives":
+                    entry["senators"].append(_member_entry(m))
+                else:
+                    entry["districts"].setdefault(str(m.get("district") or 0), []).append(_member_entry(m))
+            if len(members) < 250 or not (data.get("pagination") or {}).get("next"):
+                break
+            offset += 250
+        return table
+
+    def get_delegation_table(self) -> Dict[str, Dict[str, Any]]:
+        table = cache.get(DELEGATION_TABLE_KEY)
+        if table is None:
+            table = self.build_delegation_table()
+            cache.set(DELEGATION_TABLE_KEY, table, expire=DELEGATION_TABLE_TTL)
+        return table
+
+    def get_delegation(self, state: str, district: Optional[int]) -> Dict[str, Any]:
+        """
+        House member(s) and senators for a district.
+        """
+        entry = self.get_delegation_table().get(state.upper(), {})
+        representatives = entry.get("districts", {}).get(str(district), []) if district is not None else []
+        return {"state": state.upper(), "district": district, "representatives": representatives, "senators": entry.get("senators", [])}
+
+    def resolve_delegation(self, address: str) -> Dict[str, Any]:
+        """
+        Delegation for an address, plus its state legislative, county and place divisions.
+        """
+        divisions = self.resolve_divisions(normalize_address(address))
+        if not divisions["state"]:
+            return _unresolved()
+        return dict(self.get_delegation(divisions["state"], divisions["cd"]), divisions=divisions)
+
+    async def resolve_addresses(self, addresses: List[str], concurrency: int = BATCH_RESOLVE_CONCURRENCY) -> List[Dict[str, Any]]:
+        """
+        Resolve many addresses concurrently. Addresses are deduplicated on their
+        normalized form, so each distinct address costs at most one Civic lookup.
+        Results come back in input order, with an "error" for failed lookups.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        normalized = [normalize_address(a) if a and a.strip() else None for a in addresses]
+        unique = sorted({n for n in normalized if n})
+
+        async def resolve(address: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(self.resolve_delegation, address)
+                except Exception as e:
+                    return _unresolved(str(e))
+
+        # Build the delegation table once up front rather than racing to build it in every worker
+        await asyncio.to_thread(self.get_delegation_table)
+        resolved = dict(zip(unique, await asyncio.gather(*(resolve(n) for n in unique))))
+
+        return [dict(resolved[n] if n else _unresolved("Empty address"), address=address)
+                for address, n in zip(addresses, normalized)]
+
+district_resolver = DistrictResolver()
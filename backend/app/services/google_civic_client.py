@@ -1,13 +1,19 @@
 import os
 import requests
-import re
 from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
+from .telemetry import upstream_call
+from .ocd_id import Division, parse_divisions
+from .deadlines import http_timeout, TOOL_MAX_WORKERS
 
 load_dotenv()
 
+# Shared connection pool (batch district resolution and the agent run many lookups at once)
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=TOOL_MAX_WORKERS))
+
 class GoogleCivicClient:
-    BASE_URL = "https://www.googleapis.com/civicinfo/v2"
+    BASE_URL = os.getenv("GOOGLE_CIVIC_API_BASE_URL", "https://www.googleapis.com/civicinfo/v2")
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("GOOGLE_CIVIC_API_KEY")
@@ -26,33 +32,25 @@ class GoogleCivicClient:
             "address": address
         }
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        with upstream_call("google_civic", "divisionsByAddress"):
+            response = _session.get(url, params=params, timeout=http_timeout())
+            response.raise_for_status()
+            return response.json()
+
+    def extract_divisions(self, data: Dict[str, Any]) -> Division:
+        """
+        Parse the OCD IDs of a divisionsByAddress response into one Division
+        (state, congressional, state legislative, county and place divisions).
+        """
+        return parse_divisions(data.get("divisions", {}).keys())
 
     def extract_district_info(self, data: Dict[str, Any]) -> Tuple[Optional[str], Optional[int]]:
         """
         Extract state and district number from OCD IDs.
         Example OCD ID: ocd-division/country:us/state:nj/cd:8
         """
-        divisions = data.get("divisions", {})
-        state = None
-        district = None
-
-        for ocd_id in divisions.keys():
-            # Check for state
-            state_match = re.search(r"state:([a-z]{2})", ocd_id)
-            if state_match:
-                state = state_match.group(1).upper()
-            
-            # Check for district
-            district_match = re.search(r"cd:(\d+)", ocd_id)
-            if district_match:
-                district = int(district_match.group(1))
-            elif "cd:at-large" in ocd_id:
-                district = 0 # Convention for at-large
-        
-        return state, district
+        division = self.extract_divisions(data)
+        return division.state, division.cd
 
     def format_division_info(self, data: Dict[str, Any]) -> str:
         """
@@ -62,8 +60,6 @@ class GoogleCivicClient:
         address_str = f"{normalized.get('line1', '')} {normalized.get('city', '')}, {normalized.get('state', '')} {normalized.get('zip', '')}".strip()
         
         divisions = data.get("divisions", {})
-        result = f"Political divisions for: {address_str}\n"
-        for ocd_id, info in divisions.items():
-            result += f"- {info.get('name')} (ID: {ocd_id})\n"
-        
-        return result
+        lines = [f"Political divisions for: {address_str}"]
+        lines.extend(f"- {info.get('name')} (ID: {ocd_id})" for ocd_id, info in divisions.items())
+        return "\n".join(lines) + "\n"
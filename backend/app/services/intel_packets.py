@@ -0,0 +1,106 @@
+import os
+import re
+import hashlib
+from typing import Optional, Dict, Any, List
+from sqlalchemy.exc import IntegrityError
+from ..database import IntelPacketRecord
+from .answer_cache import normalize_question
+
+# Answers within this many differing SimHash bits of one already extracted count as the same answer
+INTEL_DEDUP_DISTANCE = int(os.getenv("INTEL_DEDUP_DISTANCE", "3"))
+# Recent packets of the user (on the member's page) an answer is compared with
+INTEL_DEDUP_WINDOW = int(os.getenv("INTEL_DEDUP_WINDOW", "200"))
+
+# Action tags the agent appends ([CREATE_PAGE_ACTION: ...] etc.) aren't part of the answer
+_ACTION_TAG = re.compile(r"\[[A-Z_]+:[^\]]*\]")
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def _answer_text(response: str) -> str:
+    return normalize_question(_ACTION_TAG.sub(" ", response))
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash over word pairs, as a signed integer (for a BIGINT column).
+    Near-identical texts differ in only a few bits.
+    """
+    words = text.split()
+    features = [" ".join(words[i:i + 2]) for i in range(max(len(words) - 1, 1))]
+    counts = [0] * 64
+    for feature in features:
+        h = int.from_bytes(hashlib.md5(feature.encode()).digest()[:8], "big")
+        for bit in range(64):
+            counts[bit] += 1 if h >> bit & 1 else -1
+    value = sum(1 << bit for bit in range(64) if counts[bit] > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def _distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << 64) - 1)).count("1")
+
+def already_extracted(db, user_id: str, bioguide_id: Optional[str], response: str) -> bool:
+    """
+    True if this answer (or a near-duplicate) already produced a packet for the
+    user, so the extraction call can be skipped. One query over the user's
+    recent packets.
+    """
+    text = _answer_text(response)
+    if not text:
+        return False
+    source_hash, fingerprint = _hash(text), simhash(text)
+    query = db.query(IntelPacketRecord.source_hash, IntelPacketRecord.source_simhash).filter(IntelPacketRecord.user_id == user_id)
+    if bioguide_id:
+        query = query.filter(IntelPacketRecord.bioguide_id == bioguide_id.upper())
+    for known_hash, known_simhash in query.order_by(IntelPacketRecord.created_at.desc()).limit(INTEL_DEDUP_WINDOW):
+        if known_hash == source_hash or (known_simhash is not None and _distance(known_simhash, fingerprint) <= INTEL_DEDUP_DISTANCE):
+            return True
+    return False
+
+def record_packet(db, user_id: str, bioguide_id: Optional[str], conversation_id, title: str, content: str,
+                  subject_name: Optional[str], response: str) -> Optional[IntelPacketRecord]:
+    """Store a packet; None if the user already has the same fact about the same subject."""
+    subject_key = normalize_question(subject_name or "")
+    fact_hash = _hash(normalize_question(content))
+    exists = db.query(IntelPacketRecord.id).filter(
+        IntelPacketRecord.user_id == user_id,
+        IntelPacketRecord.subject_key == subject_key,
+        IntelPacketRecord.fact_hash == fact_hash,
+    ).first()
+    if exists:
+        return None
+    text = _answer_text(response)
+    packet = IntelPacketRecord(
+        user_id=user_id,
+        bioguide_id=bioguide_id.upper() if bioguide_id else None,
+        subject_name=subject_name,
+        subject_key=subject_key,
+        title=title.strip(),
+        content=content.strip(),
+        fact_hash=fact_hash,
+        source_hash=_hash(text) if text else None,
+        source_simhash=simhash(text) if text else None,
+        conversation_id=conversation_id,
+    )
+    db.add(packet)
+    try:
+        db.commit()
+    except IntegrityError:
+        # The same fact stored by a concurrent turn
+        db.rollback()
+        return None
+    return packet
+
+def member_packets(db, user_id: str, bioguide_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+    """The user's packets captured on a member's page, newest first."""
+    packets = (db.query(IntelPacketRecord)
+               .filter(IntelPacketRecord.user_id == user_id, IntelPacketRecord.bioguide_id == bioguide_id.upper())
+               .order_by(IntelPacketRecord.created_at.desc())
+               .limit(limit).all())
+    return [{
+        "id": str(p.id),
+        "title": p.title,
+        "content": p.content,
+        "subject_name": p.subject_name,
+        "conversation_id": str(p.conversation_id) if p.conversation_id else None,
+        "created_at": p.created_at,
+    } for p in packets]
@@ -0,0 +1,279 @@
+import os
+import re
+import time
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from ..database import MirrorSessionLocal, BillCosponsorLog, MirrorBillCosponsor
+from .cache_service import cache
+from .cosint.api_client import CongressAPIClient
+from .cosint.mirror import PAGE_SIZE, bill_key, fetch_all_pages
+from .district_resolver import DistrictResolver, district_resolver
+
+# The congress in session keeps changing, so its part of a member's history is refetched after this long
+LEGISLATION_CURRENT_TTL = int(os.getenv("LEGISLATION_CURRENT_TTL", "86400"))
+# Members whose histories are loaded at once for chamber-wide statistics
+LEGISLATION_FETCH_CONCURRENCY = int(os.getenv("LEGISLATION_FETCH_CONCURRENCY", "8"))
+
+# Member endpoint suffix -> list key in its response
+KINDS = {"sponsored": "sponsoredLegislation", "cosponsored": "cosponsoredLegislation"}
+
+# Furthest stage a bill reached, in order
+STATUSES = ["introduced", "reported", "passed_chamber", "vetoed", "became_law"]
+INTRODUCED, REPORTED, PASSED_CHAMBER, VETOED, BECAME_LAW = range(len(STATUSES))
+_STATUS_PATTERNS = [
+    (BECAME_LAW, re.compile(r"became (public|private) law|signed by president", re.I)),
+    (VETOED, re.compile(r"vetoed", re.I)),
+    (PASSED_CHAMBER, re.compile(r"passed|agreed to|resolving differences|presented to president", re.I)),
+    (REPORTED, re.compile(r"reported|placed on .*calendar", re.I)),
+]
+
+# One history row: [congress, type, number, policy area, status, introduced date]
+Row = list
+
+def current_congress(today: Optional[date] = None) -> int:
+    return ((today or date.today()).year - 1789) // 2 + 1
+
+def legislation_status(latest_action_text: Optional[str]) -> int:
+    """Status code (index into STATUSES) read off the latest action."""
+    for status, pattern in _STATUS_PATTERNS:
+        if latest_action_text and pattern.search(latest_action_text):
+            return status
+    return INTRODUCED
+
+def _row(item: Dict[str, Any]) -> Row:
+    return [
+        item.get("congress") or 0,
+        # Amendments have no bill type or number
+        (item.get("type") or "AMDT").upper(),
+        str(item.get("number") or item.get("amendmentNumber") or ""),
+        (item.get("policyArea") or {}).get("name"),
+        legislation_status((item.get("latestAction") or {}).get("text")),
+        item.get("introducedDate"),
+    ]
+
+def _counts(labels: np.ndarray) -> Dict[str, int]:
+    if not len(labels):
+        return {}
+    values, counts = np.unique(labels, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    return {str(values[i]): int(counts[i]) for i in order}
+
+def aggregate(rows: List[Row]) -> Dict[str, Any]:
+    """Counts by policy area, congress and status, and pass rates, over history rows."""
+    congress = np.fromiter((r[0] for r in rows), dtype=np.int32, count=len(rows))
+    status = np.fromiter((r[4] for r in rows), dtype=np.int8, count=len(rows))
+    is_bill = np.fromiter((r[1] != "AMDT" for r in rows), dtype=bool, count=len(rows))
+    areas = np.array([r[3] for r in rows if r[3]], dtype=str)
+    bills = int(is_bill.sum())
+    by_status = np.bincount(status[is_bill], minlength=len(STATUSES))
+    by_congress = np.bincount(congress) if len(congress) else np.zeros(0, dtype=np.int64)
+    return {
+        "total": len(rows),
+        "bills": bills,
+        "amendments": len(rows) - bills,
+        "by_policy_area": _counts(areas),
+        "by_congress": {str(c): int(by_congress[c]) for c in np.nonzero(by_congress)[0][::-1]},
+        "by_status": {name: int(by_status[i]) for i, name in enumerate(STATUSES)},
+        # Shares of bills (amendments excluded) that became law / passed at least one chamber
+        "pass_rate": round(float(by_status[BECAME_LAW]) / bills, 4) if bills else None,
+        "passed_chamber_rate": round(float(by_status[PASSED_CHAMBER:].sum()) / bills, 4) if bills else None,
+    }
+
+class LegislationAnalytics:
+    """
+    Sponsored and cosponsored legislation statistics over members' full histories.
+    A history is cached per congress: finished congresses never change and are
+    kept for good, the congress in session for LEGISLATION_CURRENT_TTL. Refreshing
+    a history only reads the newest pages, down to the newest finished congress
+    already stored. Aggregates are computed over columnar NumPy arrays, so a
+    whole chamber is one pass over its concatenated histories.
+    """
+    def __init__(self, client: Optional[CongressAPIClient] = None, resolver: Optional[DistrictResolver] = None):
+        self.client = client or CongressAPIClient()
+        self.resolver = resolver or district_resolver
+
+    # --- Histories ---
+
+    @staticmethod
+    def _index_key(kind: str, bioguide_id: str) -> str:
+        return f"legislation:{kind}:{bioguide_id}:index"
+
+    @staticmethod
+    def _segment_key(kind: str, bioguide_id: str, congress: int) -> str:
+        return f"legislation:{kind}:{bioguide_id}:{congress}"
+
+    def _stored(self, kind: str, bioguide_id: str) -> Optional[Tuple[Dict[int, List[Row]], int]]:
+        """
+        ({congress: rows} for the finished congresses, the last congress known
+        finished), or None if nothing is stored or a segment is gone.
+        """
+        index = cache.get(self._index_key(kind, bioguide_id))
+        if index is None:
+            return None
+        segments = {}
+        for congress in index["finished"]:
+            segment = cache.get(self._segment_key(kind, bioguide_id, congress))
+            if segment is None:
+                return None
+            segments[congress] = segment
+        return segments, index["through"]
+
+    def _newer_than(self, kind: str, bioguide_id: str, congress: int) -> List[Dict[str, Any]]:
+        """Items from congresses after `congress`, reading the newest-first list only that far."""
+        endpoint, items, offset = f"member/{bioguide_id}/{kind}-legislation", [], 0
+        while True:
+            data = self.client._get(endpoint, params={"limit": PAGE_SIZE, "offset": offset})
+            page = data.get(KINDS[kind], [])
+            for item in page:
+                if (item.get("congress") or 0) <= congress:
+                    return items
+                items.append(item)
+            if len(page) < PAGE_SIZE or not (data.get("pagination") or {}).get("next"):
+                return items
+            offset += PAGE_SIZE
+
+    def history(self, bioguide_id: str, kind: str = "sponsored") -> List[Row]:
+        """Every bill and amendment the member sponsored (or cosponsored), newest congress first."""
+        bioguide_id = bioguide_id.upper()
+        now = current_congress()
+        stored = self._stored(kind, bioguide_id)
+        if stored is None:
+            finished, through = {}, 0
+            items = fetch_all_pages(self.client, f"member/{bioguide_id}/{kind}-legislation", KINDS[kind])
+        else:
+            finished, through = stored
+            recent = {c: cache.get(self._segment_key(kind, bioguide_id, c)) for c in range(through + 1, now + 1)}
+            if all(segment is not None for segment in recent.values()):
+                merged = {**finished, **recent}
+                return [row for c in sorted(merged, reverse=True) for row in merged[c]]
+            items = self._newer_than(kind, bioguide_id, through)
+
+        fetched: Dict[int, List[Row]] = {now: []}
+        for item in items:
+            row = _row(item)
+            fetched.setdefault(row[0], []).append(row)
+        for congress, rows in fetched.items():
+            if congress >= now:
+                cache.set(self._segment_key(kind, bioguide_id, congress), rows, expire=LEGISLATION_CURRENT_TTL)
+            elif rows:
+                cache.set(self._segment_key(kind, bioguide_id, congress), rows, expire=None)
+                finished[congress] = rows
+        # Written last, so it only ever lists stored segments
+        cache.set(self._index_key(kind, bioguide_id), {"finished": sorted(finished), "through": now - 1})
+        merged = {**finished, **fetched}
+        return [row for c in sorted(merged, reverse=True) for row in merged[c]]
+
+    # --- Co-sponsorship degree ---
+
+    def _cosponsor_pairs(self, bill_ids: List[str]) -> List[Tuple[str, str]]:
+        """(bill id, cosponsor) pairs stored locally for these bills."""
+        pairs = set()
+        tables = [BillCosponsorLog] + ([MirrorBillCosponsor] if self.client.mirror is not None else [])
+        with MirrorSessionLocal() as db:
+            for table in tables:
+                for start in range(0, len(bill_ids), 500):
+                    chunk = bill_ids[start:start + 500]
+                    pairs.update(db.query(table.bill_id, table.bioguide_id).filter(table.bill_id.in_(chunk)).all())
+        return list(pairs)
+
+    def cosponsor_degree(self, rows: List[Row]) -> Dict[str, Any]:
+        """
+        Distinct members who cosponsored any of these (sponsored) bills, from the
+        cosponsor lists stored locally (bill pages viewed, mirror sync).
+        """
+        bill_ids = list({bill_key(r[0], r[1], r[2]) for r in rows if r[1] != "AMDT"})
+        pairs = self._cosponsor_pairs(bill_ids)
+        return {
+            "distinct_cosponsors": len({bioguide_id for _, bioguide_id in pairs}),
+            "bills_with_cosponsor_data": len({bill_id for bill_id, _ in pairs}),
+            "bills": len(bill_ids),
+        }
+
+    # --- Reports ---
+
+    def member_report(self, bioguide_id: str, congress: Optional[int] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        sponsored = self.history(bioguide_id, "sponsored")
+        cosponsored = self.history(bioguide_id, "cosponsored")
+        if congress:
+            sponsored = [r for r in sponsored if r[0] == congress]
+            cosponsored = [r for r in cosponsored if r[0] == congress]
+        return {
+            "bioguide_id": bioguide_id.upper(),
+            "congress": congress,
+            "sponsored": aggregate(sponsored),
+            "cosponsored": aggregate(cosponsored),
+            "cosponsor_degree": self.cosponsor_degree(sponsored),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def _chamber_members(self, chamber: Optional[str]) -> List[Dict[str, Any]]:
+        members = []
+        for state, entry in sorted(self.resolver.get_delegation_table().items()):
+            if chamber in (None, "senate"):
+                members += [dict(m, state=state, chamber="Senate") for m in entry.get("senators", [])]
+            if chamber in (None, "house"):
+                for district in sorted(entry.get("districts", {}), key=int):
+                    members += [dict(m, state=state, chamber="House", district=int(district)) for m in entry["districts"][district]]
+        return [m for m in members if m.get("bioguideId")]
+
+    def chamber_report(self, chamber: Optional[str] = None, congress: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Sponsorship statistics for every current member of a chamber (or both),
+        computed over one concatenated columnar table of their histories.
+        """
+        start = time.perf_counter()
+        members = self._chamber_members(chamber)
+
+        def load(member):
+            try:
+                return self.history(member["bioguideId"], "sponsored")
+            except Exception as e:
+                print(f"Legislation history failed for {member['bioguideId']}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=LEGISLATION_FETCH_CONCURRENCY) as pool:
+            histories = list(pool.map(load, members))
+        missing = [m["bioguideId"] for m, h in zip(members, histories) if h is None]
+        histories = [[r for r in h if not congress or r[0] == congress] if h else [] for h in histories]
+
+        rows = [r for h in histories for r in h]
+        n = len(members)
+        member_idx = np.repeat(np.arange(n), [len(h) for h in histories])
+        is_bill = np.fromiter((r[1] != "AMDT" for r in rows), dtype=bool, count=len(rows))
+        status = np.fromiter((r[4] for r in rows), dtype=np.int8, count=len(rows))
+        areas, area_idx = np.unique(np.array([r[3] or "" for r in rows], dtype=str), return_inverse=True)
+
+        bills = np.bincount(member_idx[is_bill], minlength=n)
+        laws = np.bincount(member_idx[is_bill & (status == BECAME_LAW)], minlength=n)
+        passed = np.bincount(member_idx[is_bill & (status >= PASSED_CHAMBER)], minlength=n)
+        area_matrix = np.zeros((n, len(areas)), dtype=np.int64)
+        named = areas[area_idx] != "" if len(areas) else np.zeros(0, dtype=bool)
+        np.add.at(area_matrix, (member_idx[named], area_idx[named]), 1)
+        top_area = area_matrix.argmax(axis=1) if len(areas) else np.zeros(n, dtype=np.int64)
+
+        report_members = []
+        for i, m in enumerate(members):
+            report_members.append({
+                "bioguide_id": m["bioguideId"],
+                "name": m.get("name"),
+                "party": m.get("party"),
+                "state": m["state"],
+                "chamber": m["chamber"],
+                "sponsored_bills": int(bills[i]),
+                "became_law": int(laws[i]),
+                "passed_chamber": int(passed[i]),
+                "pass_rate": round(int(laws[i]) / int(bills[i]), 4) if bills[i] else None,
+                "top_policy_area": str(areas[top_area[i]]) if area_matrix[i].any() else None,
+            })
+        report_members.sort(key=lambda m: m["sponsored_bills"], reverse=True)
+        return {
+            "chamber": chamber or "both",
+            "congress": congress,
+            "members": report_members,
+            "totals": aggregate(rows),
+            "missing": missing,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+from typing import Optional, Dict, Any, List
+from .cache_service import cache, single_flight, record_dependencies, dependencies_changed
+from .scheduler import LeaderScheduler
+from .cosint.api_client import CongressAPIClient, BudgetExhausted
+from .cosint.mirror import roll_call_key
+
+MEMBER_PROFILE_REFRESH_ENABLED = os.getenv("MEMBER_PROFILE_REFRESH_ENABLED", "true").lower() == "true"
+# Seconds between checks for new roll calls and changed member data
+MEMBER_PROFILE_REFRESH_INTERVAL = int(os.getenv("MEMBER_PROFILE_REFRESH_INTERVAL", "300"))
+# Profiles the refresher hasn't touched (e.g. with it turned off) are rebuilt after this long
+MEMBER_PROFILE_TTL = int(os.getenv("MEMBER_PROFILE_TTL", "86400"))
+# Recent House roll calls read for the profile; amendment votes are dropped from these
+PROFILE_RECENT_VOTES = 15
+PROFILE_SPONSORED_BILLS = 10
+
+PROFILE_PREFIX = "profile:"
+VOTE_FEED_KEY = "profile-feed:house_votes"
+PROFILE_REFRESH_LOCK_KEY = "lock:profile_refresh"
+
+def profile_key(bioguide_id: str) -> str:
+    return f"{PROFILE_PREFIX}{bioguide_id.upper()}"
+
+def cached_profile(bioguide_id: str) -> Optional[str]:
+    """The member page as a JSON body, if materialized: a single cache read."""
+    doc = cache.get(profile_key(bioguide_id))
+    return doc["body"] if doc else None
+
+def _vote_row(item: Dict[str, Any], vote_cast: Optional[str]) -> Dict[str, Any]:
+    return {
+        "legislation": item["number"] or "N/A",
+        "legislationUrl": item["url"],
+        "legislationTitle": item["title"],
+        "congress": item["congress"],
+        "type": item["type"],
+        "number": item["number"],
+        "question": item["question"],
+        "vote": vote_cast or "Not Voting",
+        "result": item["result"],
+        "date": item["date"],
+    }
+
+class MemberProfiles:
+    """
+    Materialized member pages. Each profile (details, sponsored bills and votes
+    on the recent House roll calls) is built once and kept in the shared cache
+    as its serialized JSON response, so serving /member/{id} is one keyed read
+    with nothing to encode. Documents are tagged with the member's entity, so
+    evicting the member drops them, and kept current in place by the refresher:
+    - the recent roll calls (with their bill titles) are one feed shared by
+      every profile; when it changes, each profile only looks up its votes on
+      the new roll calls;
+    - details and sponsored bills are refetched only when the api_cache
+      entries they were built from were refreshed.
+    """
+    def __init__(self, client: Optional[CongressAPIClient] = None):
+        self.client = client or CongressAPIClient()
+
+    # --- Shared roll call feed ---
+
+    def _build_feed(self) -> List[Dict[str, Any]]:
+        feed = []
+        for v in self.client.get_recent_house_votes(limit=PROFILE_RECENT_VOTES):
+            # Skip amendments (H.Amdt / S.Amdt)
+            if "AMDT" in (v.get("legislationType") or "").upper():
+                continue
+            title = None
+            if v.get("legislationNumber") and v.get("legislationType"):
+                try:
+                    title = self.client.get_bill_details(v.get("congress"), v.get("legislationType"), v.get("legislationNumber")).get("title")
+                except Exception:
+                    pass
+            feed.append({
+                "key": roll_call_key(v.get("congress"), v.get("sessionNumber"), v.get("rollCallNumber")),
+                "congress": v.get("congress"),
+                "session": v.get("sessionNumber"),
+                "roll_call": v.get("rollCallNumber"),
+                "number": v.get("legislationNumber"),
+                "url": v.get("legislationUrl"),
+                "title": title or "No title available",
+                "type": v.get("legislationType"),
+                "question": v.get("voteQuestion"),
+                "result": v.get("result"),
+                "date": v.get("startDate"),
+            })
+        return feed
+
+    def refresh_feed(self) -> List[Dict[str, Any]]:
+        feed = self._build_feed()
+        cache.set(VOTE_FEED_KEY, feed, expire=MEMBER_PROFILE_TTL)
+        return feed
+
+    def vote_feed(self) -> List[Dict[str, Any]]:
+        feed = cache.get(VOTE_FEED_KEY)
+        if feed is None:
+            feed = single_flight(VOTE_FEED_KEY, self.refresh_feed)
+        return feed
+
+    def _votes(self, bioguide_id: str, feed: List[Dict[str, Any]], known: Dict[str, Optional[str]]) -> List[Dict[str, Any]]:
+        """Vote rows for the feed, looking up only roll calls not in `known` ({key: vote cast})."""
+        rows = []
+        for item in feed:
+            if item["key"] in known:
+                vote_cast = known[item["key"]]
+            else:
+                vote_cast = self.client.get_roll_call_votes(item["congress"], item["session"], item["roll_call"]).get(bioguide_id)
+            rows.append(_vote_row(item, vote_cast))
+        return rows
+
+    # --- Profile documents ---
+
+    def _member_section(self, bioguide_id: str) -> Dict[str, Any]:
+        with record_dependencies() as deps:
+            details = self.client.get_member_details(bioguide_id)
+            bills = self.client.get_sponsored_legislation(bioguide_id, limit=PROFILE_SPONSORED_BILLS)
+        return {"details": details, "bills": bills, "deps": dict(deps)}
+
+    def _store(self, bioguide_id: str, profile: Dict[str, Any], doc: Dict[str, Any]):
+        doc["body"] = json.dumps(profile, separators=(",", ":"))
+        doc["built_at"] = time.time()
+        cache.set(profile_key(bioguide_id), doc, expire=MEMBER_PROFILE_TTL, tag=f"member:{bioguide_id}".lower())
+
+    def build(self, bioguide_id: str) -> Dict[str, Any]:
+        member = self._member_section(bioguide_id)
+        feed = self.vote_feed()
+        profile = {
+            "details": member["details"],
+            "bills": member["bills"],
+            "votes": self._votes(bioguide_id, feed, {}),
+        }
+        doc = {"feed": [item["key"] for item in feed], "deps": member["deps"]}
+        self._store(bioguide_id, profile, doc)
+        return doc
+
+    def get(self, bioguide_id: str) -> str:
+        """The member page as a JSON body, built (once across workers) if missing."""
+        key = profile_key(bioguide_id)
+        doc = cache.get(key)
+        if doc is None:
+            doc = single_flight(key, lambda: self.build(bioguide_id))
+        return doc["body"]
+
+    def update(self, bioguide_id: str, doc: Dict[str, Any], feed: List[Dict[str, Any]]) -> bool:
+        """Bring one stored document up to date in place; True if anything changed."""
+        changed = False
+        profile = json.loads(doc["body"])
+        if dependencies_changed(doc["deps"]):
+            member = self._member_section(bioguide_id)
+            profile["details"], profile["bills"], doc["deps"] = member["details"], member["bills"], member["deps"]
+            changed = True
+        keys = [item["key"] for item in feed]
+        if keys != doc["feed"]:
+            known = {key: row["vote"] for key, row in zip(doc["feed"], profile["votes"])}
+            profile["votes"] = self._votes(bioguide_id, feed, known)
+            doc["feed"] = keys
+            changed = True
+        if changed:
+            self._store(bioguide_id, profile, doc)
+        return changed
+
+    def run_pass(self) -> Dict[str, int]:
+        stats = {"profiles": 0, "updated": 0, "errors": 0}
+        try:
+            feed = self.refresh_feed()
+            for key in [k for k in cache.iterkeys() if k.startswith(PROFILE_PREFIX)]:
+                doc = cache.get(key)
+                if doc is None:
+                    continue
+                stats["profiles"] += 1
+                bioguide_id = key[len(PROFILE_PREFIX):]
+                try:
+                    if self.update(bioguide_id, doc, feed):
+                        stats["updated"] += 1
+                except BudgetExhausted:
+                    raise
+                except Exception as e:
+                    stats["errors"] += 1
+                    print(f"Member profile refresh failed for {bioguide_id}: {e}")
+        except BudgetExhausted:
+            print("Member profile refresh paused: low-priority Congress.gov budget exhausted")
+        print(f"Member profile refresh complete: {stats}")
+        return stats
+
+member_profile_scheduler = LeaderScheduler(
+    PROFILE_REFRESH_LOCK_KEY, MEMBER_PROFILE_REFRESH_INTERVAL,
+    lambda: MemberProfiles(CongressAPIClient(low_priority=True)).run_pass(),
+    "Member profile refresh", run_first=False,
+)
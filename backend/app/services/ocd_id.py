@@ -0,0 +1,62 @@
+import re
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+# One "type:id" pair per path segment, e.g. "ocd-division/country:us/state:nj/cd:8"
+_SEGMENT_RE = re.compile(r"([a-z_]+):([^/]+)")
+
+# Division types the parser keeps; anything else (e.g. "school_district") is ignored
+DIVISION_TYPES = frozenset({"country", "state", "cd", "sldl", "sldu", "county", "place", "district", "territory"})
+# DC ("district:dc") and the territories ("territory:pr") take the place of a
+# state, and their one delegate seat is at-large
+DELEGATE_TYPES = frozenset({"district", "territory"})
+
+@dataclass(frozen=True)
+class Division:
+    """
+    Every division an address falls in, merged from its OCD IDs.
+    `cd` is the congressional district number, 0 for at-large seats.
+    """
+    country: Optional[str] = None
+    state: Optional[str] = None
+    cd: Optional[int] = None
+    sldl: Optional[str] = None # state house district
+    sldu: Optional[str] = None # state senate district
+    county: Optional[str] = None
+    place: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@lru_cache(maxsize=4096)
+def parse_ocd_id(ocd_id: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    The (type, id) segments of one OCD ID that the parser cares about.
+    """
+    return tuple((kind, value) for kind, value in _SEGMENT_RE.findall(ocd_id.lower()) if kind in DIVISION_TYPES)
+
+@lru_cache(maxsize=4096)
+def _parse_divisions(ocd_ids: Tuple[str, ...]) -> Division:
+    fields: Dict[str, Any] = {}
+    for ocd_id in ocd_ids:
+        for kind, value in parse_ocd_id(ocd_id):
+            if kind in DELEGATE_TYPES:
+                fields["state"] = value
+                fields.setdefault("cd", "at-large")
+            else:
+                fields[kind] = value
+
+    if "state" in fields:
+        fields["state"] = fields["state"].upper()
+    if "cd" in fields:
+        cd = fields["cd"]
+        fields["cd"] = 0 if cd == "at-large" else int(cd) if cd.isdigit() else None
+    return Division(**fields)
+
+def parse_divisions(ocd_ids: Iterable[str]) -> Division:
+    """
+    Merge a set of OCD IDs (e.g. the keys of a divisionsByAddress response)
+    into one Division in a single pass. Results are memoized.
+    """
+    return _parse_divisions(tuple(sorted(ocd_ids)))
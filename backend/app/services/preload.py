@@ -0,0 +1,18 @@
+import os
+import time
+
+# Import the agent stack in the background once the server is up, instead of on the first chat
+PRELOAD_AGENT = os.getenv("PRELOAD_AGENT", "true").lower() == "true"
+
+def preload_agent_modules() -> float:
+    """
+    Import LangChain, the OpenAI client and the agent tools (about 2-3s of imports
+    the API doesn't need to answer health checks). Returns the seconds it took;
+    near zero if they were already loaded, e.g. by the gunicorn master.
+    """
+    start = time.perf_counter()
+    from .cosint import agent, callbacks  # noqa: F401
+    elapsed = time.perf_counter() - start
+    if elapsed > 0.01:
+        print(f"Agent modules loaded in {elapsed:.2f}s")
+    return elapsed
@@ -0,0 +1,183 @@
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional, Iterator
+from .cache_codec import get_codec
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:
+    # Only needed with CACHE_BACKEND=redis; from_url reports the missing package
+    class WatchError(Exception):
+        pass
+
+class RedisCache:
+    """
+    Shared cache over the Redis protocol, exposing the part of the diskcache.Cache
+    API the app uses (get/set/add/delete with expiry, tag eviction, key iteration,
+    transact), so api_cache and the other caches work unchanged across workers and
+    hosts. Values go through the same codec as the disk cache.
+    """
+    def __init__(self, client, prefix: str = "cosint:"):
+        self.client = client
+        self.prefix = prefix
+        self.tag_prefix = f"{prefix.rstrip(':')}-tag:"
+        self.codec = get_codec()
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "cosint:") -> "RedisCache":
+        """
+        redis:// or rediss:// URLs use redis-py; fakeredis:// gives an in-process
+        stand-in (requires the fakeredis package) for local runs without a server.
+        """
+        if url.startswith("fakeredis://"):
+            import fakeredis
+            return cls(fakeredis.FakeRedis(), prefix=prefix)
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package (pip install redis)")
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.tag_prefix}{tag}"
+
+    def _decode(self, data: Optional[bytes]):
+        if data is None:
+            return None
+        try:
+            return self.codec.decode(data)
+        except Exception as e:
+            print(f"Cache value could not be decoded, treating as a miss: {e}")
+            return None
+
+    def get(self, key: str, default=None, expire_time: bool = False):
+        if expire_time:
+            pipe = self.client.pipeline()
+            pipe.get(self._key(key))
+            pipe.pttl(self._key(key))
+            data, ttl_ms = pipe.execute()
+            value = self._decode(data)
+            if value is None:
+                return default, None
+            return value, (time.time() + ttl_ms / 1000 if ttl_ms and ttl_ms > 0 else None)
+        value = self._decode(self.client.get(self._key(key)))
+        return default if value is None else value
+
+    @staticmethod
+    def _px(expire: Optional[float]) -> Optional[int]:
+        # At least 1 ms: a sub-second expiry must not round down to "expire now"
+        return max(1, int(expire * 1000)) if expire else None
+
+    def _tagged(self, tag: str, key: str, px: Optional[int], write=None):
+        """
+        Add `key` to its tag's set, after queuing `write` in the same transaction.
+        The set lives as long as its longest-lived entry (and without expiry
+        while any entry has none), so evicting the tag reaches every entry.
+        WATCH retries if another writer changes the set's TTL in between.
+        """
+        tag_key = self._tag_key(tag)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(tag_key)
+                    ttl = pipe.pttl(tag_key) # -2: no set yet, -1: no expiry
+                    pipe.multi()
+                    if write is not None:
+                        write(pipe)
+                    pipe.sadd(tag_key, key)
+                    if px is None:
+                        pipe.persist(tag_key)
+                    elif ttl == -2 or 0 <= ttl < px:
+                        pipe.pexpire(tag_key, px)
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    def set(self, key: str, value, expire: Optional[float] = None, tag: Optional[str] = None) -> bool:
+        data, px = self.codec.encode(value), self._px(expire)
+        if tag:
+            self._tagged(tag, key, px, lambda pipe: pipe.set(self._key(key), data, px=px))
+        else:
+            self.client.set(self._key(key), data, px=px)
+        return True
+
+    def add(self, key: str, value, expire: Optional[float] = None, tag: Optional[str] = None) -> bool:
+        """Set only if the key is absent; True if this call stored it."""
+        px = self._px(expire)
+        stored = bool(self.client.set(self._key(key), self.codec.encode(value), px=px, nx=True))
+        if stored and tag:
+            self._tagged(tag, key, px)
+        return stored
+
+    def delete(self, key: str) -> bool:
+        return bool(self.client.delete(self._key(key)))
+
+    def evict(self, tag: str) -> int:
+        keys = [k.decode() if isinstance(k, bytes) else k for k in self.client.smembers(self._tag_key(tag))]
+        removed = self.client.delete(*[self._key(k) for k in keys]) if keys else 0
+        self.client.delete(self._tag_key(tag))
+        return removed
+
+    def iterkeys(self) -> Iterator[str]:
+        for raw in self.client.scan_iter(match=f"{self.prefix}*", count=500):
+            key = raw.decode() if isinstance(raw, bytes) else raw
+            yield key[len(self.prefix):]
+
+    def clear(self) -> int:
+        removed = 0
+        for pattern in (f"{self.prefix}*", f"{self.tag_prefix}*"):
+            batch = list(self.client.scan_iter(match=pattern, count=500))
+            if batch:
+                removed += self.client.delete(*batch)
+        return removed
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iterkeys())
+
+    def _info(self, section: str) -> dict:
+        # Some managed Redis services (and fakeredis) don't allow INFO
+        try:
+            return self.client.info(section)
+        except Exception:
+            return {}
+
+    def stats(self):
+        info = self._info("stats")
+        return info.get("keyspace_hits", 0), info.get("keyspace_misses", 0)
+
+    def volume(self) -> int:
+        return self._info("memory").get("used_memory", 0)
+
+    @contextmanager
+    def transact(self, timeout: float = 10.0):
+        """
+        Serialize read-modify-write blocks across every worker sharing the cache.
+        A plain SET NX lock (no Lua scripts), released only by the holder.
+        """
+        name = f"{self.prefix}__transact__"
+        token = uuid.uuid4().hex
+        give_up_at = time.monotonic() + timeout
+        while not self.client.set(name, token, px=int(timeout * 1000), nx=True):
+            if time.monotonic() > give_up_at:
+                raise TimeoutError("Timed out waiting for the cache transaction lock")
+            time.sleep(0.01)
+        try:
+            yield
+        finally:
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(name)
+                    if pipe.get(name) == token.encode():
+                        pipe.multi()
+                        pipe.delete(name)
+                        pipe.execute()
+                except WatchError:
+                    pass
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,40 @@
+import os
+import asyncio
+from typing import Callable, Any
+from .cache_service import cache
+
+class LeaderScheduler:
+    """
+    Runs `fn` in a worker thread every `interval` seconds. The worker that takes
+    `lock_key` in the shared cache holds it for the interval and runs the pass;
+    the others skip it, so multi-worker deployments run each pass once per
+    interval. `trigger()` starts a pass right away (e.g. after the cache is cleared).
+    """
+    def __init__(self, lock_key: str, interval: int, fn: Callable[[], Any], name: str, run_first: bool = True):
+        self.lock_key = lock_key
+        self.interval = interval
+        self.fn = fn
+        self.name = name
+        self.run_first = run_first
+        self._wakeup = asyncio.Event()
+
+    def trigger(self):
+        self._wakeup.set()
+
+    async def _wait(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self):
+        if not self.run_first:
+            await self._wait()
+        while True:
+            self._wakeup.clear()
+            if cache.add(self.lock_key, os.getpid(), expire=self.interval):
+                try:
+                    await asyncio.to_thread(self.fn)
+                except Exception as e:
+                    print(f"{self.name} failed: {e}")
+            await self._wait()
@@ -0,0 +1,107 @@
+import os
+import json
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, AsyncIterator, List, Optional
+
+# Streamed tokens are collected for this long and sent as one frame
+SSE_COALESCE_MS = int(os.getenv("SSE_COALESCE_MS", "50"))
+# An idle stream sends a comment frame this often so proxies keep it open
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+# How often an idle stream checks whether the client went away
+SSE_DISCONNECT_POLL_SECONDS = 1.0
+
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+
+Emit = Callable[[str, Dict[str, Any]], None]
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_events(
+    producer: Callable[[Emit], Awaitable[None]],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    coalesce_ms: int = SSE_COALESCE_MS,
+    heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Run `producer(emit)` as a task and stream what it emits as SSE frames.
+    "token" events ({"text": ...}) are coalesced for `coalesce_ms` into one frame;
+    every other event type is sent as-is, after flushing pending tokens. An
+    exception in the producer becomes an "error" event. If the client
+    disconnects (or the response is cancelled), the producer is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: str, data: Dict[str, Any]):
+        queue.put_nowait((event, data))
+
+    async def run():
+        try:
+            await producer(emit)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            emit("error", {"message": str(e)})
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    getter: Optional[asyncio.Future] = None
+    tokens: List[str] = []
+    flush_at = 0.0
+    last_sent = last_poll = loop.time()
+
+    def flush() -> str:
+        frame = sse_event("token", {"text": "".join(tokens)})
+        tokens.clear()
+        return frame
+
+    try:
+        while True:
+            now = loop.time()
+            deadlines = [last_sent + heartbeat_seconds, last_poll + SSE_DISCONNECT_POLL_SECONDS]
+            if tokens:
+                deadlines.append(flush_at)
+
+            # Keep one pending get() across timeouts so no event is lost
+            if getter is None:
+                getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter}, timeout=max(min(deadlines) - now, 0))
+
+            if not done:
+                now = loop.time()
+                if tokens and now >= flush_at:
+                    yield flush()
+                    last_sent = now
+                if now - last_poll >= SSE_DISCONNECT_POLL_SECONDS:
+                    last_poll = now
+                    if await is_disconnected():
+                        break
+                if now - last_sent >= heartbeat_seconds:
+                    yield HEARTBEAT_FRAME
+                    last_sent = now
+                continue
+
+            item, getter = getter.result(), None
+            if item is None:
+                if tokens:
+                    yield flush()
+                break
+
+            event, data = item
+            if event == "token":
+                if not tokens:
+                    flush_at = loop.time() + coalesce_ms / 1000
+                tokens.append(data["text"])
+                continue
+
+            if tokens:
+                yield flush()
+            yield sse_event(event, data)
+            last_sent = loop.time()
+    finally:
+        if getter is not None:
+            getter.cancel()
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,160 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List
+from prometheus_client import Counter, Histogram
+
+# Set OTEL_EXPORTER_OTLP_ENDPOINT (and install opentelemetry-sdk + the OTLP exporter) to export spans
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+
+REQUEST_SECONDS = Histogram("cosint_http_request_seconds", "HTTP request handling time", ["method", "route", "status"])
+UPSTREAM_SECONDS = Histogram("cosint_upstream_request_seconds", "Upstream API call time", ["upstream", "status"])
+CACHE_REQUESTS = Counter("cosint_cache_requests_total", "api_cache lookups", ["namespace", "function", "result"])
+TOOL_SECONDS = Histogram("cosint_tool_seconds", "Agent tool invocation time", ["tool", "status"])
+LLM_SECONDS = Histogram("cosint_llm_seconds", "LLM call time", ["model"])
+LLM_TOKENS = Counter("cosint_llm_tokens_total", "LLM tokens used", ["model", "type"])
+DB_QUERY_SECONDS = Histogram("cosint_db_query_seconds", "Database query time", ["statement"])
+STREAM_TTFT_SECONDS = Histogram("cosint_stream_time_to_first_token_seconds", "Time from request start to the first streamed chunk")
+ROUTE_REQUESTS = Counter("cosint_route_requests_total", "Chat turns and bill analyses by model route", ["route"])
+ROUTE_SAVED_USD = Counter("cosint_route_saved_usd_total", "Estimated LLM spend avoided by model routing", ["route"])
+ROUTE_SAVED_SECONDS = Counter("cosint_route_saved_seconds_total", "Estimated latency avoided by model routing", ["route"])
+
+# USD per million (prompt, completion) tokens, for cost estimates
+LLM_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# Timings collected for the Server-Timing header of the current request:
+# {metric name: [total ms, count]}
+_request_timings: ContextVar = ContextVar("request_timings", default=None)
+_request_started: ContextVar = ContextVar("request_started", default=None)
+
+_tracer = None
+
+def setup_tracing(service_name: str = "cosint-api"):
+    """
+    Configure the optional OpenTelemetry exporter. No-op unless an OTLP endpoint
+    is configured and the OpenTelemetry SDK is installed.
+    """
+    global _tracer
+    if not OTEL_EXPORTER_OTLP_ENDPOINT:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        print(f"OpenTelemetry export disabled, SDK not installed: {e}")
+        return
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=OTEL_EXPORTER_OTLP_ENDPOINT)))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(service_name)
+
+@contextmanager
+def request_scope():
+    """
+    Start collecting Server-Timing entries for one HTTP request.
+    """
+    timings: Dict[str, List[float]] = {}
+    timings_token = _request_timings.set(timings)
+    started_token = _request_started.set(time.perf_counter())
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(timings_token)
+        _request_started.reset(started_token)
+
+def record_timing(name: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    entry = timings.setdefault(name, [0.0, 0])
+    entry[0] += seconds * 1000
+    entry[1] += 1
+
+def request_elapsed() -> Optional[float]:
+    started = _request_started.get()
+    return time.perf_counter() - started if started is not None else None
+
+def server_timing_header(timings: Dict[str, List[float]]) -> str:
+    parts = []
+    for name, (total_ms, count) in timings.items():
+        token = re.sub(r"[^A-Za-z0-9_-]", "_", name)
+        parts.append(f'{token};dur={total_ms:.1f};desc="{count}x"')
+    return ", ".join(parts)
+
+@contextmanager
+def span(name: str, timing_name: Optional[str] = None, **attributes):
+    """
+    Time a block: adds it to the request's Server-Timing entry `timing_name`
+    (defaults to `name`) and, when enabled, to an OpenTelemetry span.
+    """
+    otel_span = _tracer.start_as_current_span(name, attributes=attributes) if _tracer else None
+    if otel_span is not None:
+        otel_span.__enter__()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(timing_name or name, time.perf_counter() - start)
+        if otel_span is not None:
+            otel_span.__exit__(None, None, None)
+
+@contextmanager
+def upstream_call(upstream: str, endpoint: str = ""):
+    """
+    Instrument one outbound HTTP call to an upstream API.
+    """
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        with span(f"{upstream} {endpoint}".strip(), timing_name=upstream, upstream=upstream):
+            yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        UPSTREAM_SECONDS.labels(upstream=upstream, status=status).observe(time.perf_counter() - start)
+
+def record_cache_lookup(namespace: str, function: str, hit: bool):
+    CACHE_REQUESTS.labels(namespace=namespace, function=function, result="hit" if hit else "miss").inc()
+    record_timing(f"cache_{'hit' if hit else 'miss'}", 0)
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    # Dated snapshots ("gpt-4o-mini-2024-07-18") are priced as their base model
+    prices = next((LLM_PRICES[name] for name in sorted(LLM_PRICES, key=len, reverse=True) if model.startswith(name)), (0.0, 0.0))
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+def record_route(route: str, saved_usd: float = 0.0, saved_seconds: float = 0.0):
+    ROUTE_REQUESTS.labels(route=route).inc()
+    if saved_usd > 0:
+        ROUTE_SAVED_USD.labels(route=route).inc(saved_usd)
+    if saved_seconds > 0:
+        ROUTE_SAVED_SECONDS.labels(route=route).inc(saved_seconds)
+
+def record_time_to_first_token():
+    elapsed = request_elapsed()
+    if elapsed is not None:
+        STREAM_TTFT_SECONDS.observe(elapsed)
+
+def instrument_engine(engine):
+    """
+    Time every SQL statement executed through the SQLAlchemy engine.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.labels(statement=statement.split(None, 1)[0].upper()).observe(elapsed)
+        record_timing("db", elapsed)
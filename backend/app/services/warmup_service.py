@@ -0,0 +1,144 @@
+import os
+import re
+import time
+from typing import Dict, List, Tuple
+from .cache_service import cache
+from .scheduler import LeaderScheduler
+from .cosint.api_client import CongressAPIClient, BudgetExhausted
+from .member_profiles import MemberProfiles, cached_profile
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+# Seconds between warm-up passes
+WARMUP_INTERVAL = int(os.getenv("WARMUP_INTERVAL", "900"))
+# Entries expiring within this many seconds are refreshed ahead of time
+WARMUP_REFRESH_WINDOW = int(os.getenv("WARMUP_REFRESH_WINDOW", "3600"))
+# Pages viewed within this window count as hot
+ACCESS_LOG_WINDOW = int(os.getenv("ACCESS_LOG_WINDOW", "604800"))
+# Most recently viewed members (and bills) the warm-up keeps hot
+ACCESS_LOG_MAX_ENTRIES = int(os.getenv("ACCESS_LOG_MAX_ENTRIES", "500"))
+# Views of the same page within this many seconds are recorded once per worker
+ACCESS_LOG_RESOLUTION = 60
+
+# One key per viewed page, holding the time of the last view
+ACCESS_KEY_PREFIX = "access:"
+WARMUP_LOCK_KEY = "lock:warmup"
+
+# Cached calls made by the member and bill pages and the agent tools. Arguments must
+# mirror the real call sites exactly so the warm-up fills the same cache keys.
+MEMBER_CALLS = [
+    ("get_member_details", (), {}),
+    ("get_member_committees", (), {}),
+    ("get_sponsored_legislation", (), {"limit": 10}),
+    ("get_sponsored_legislation", (), {"limit": 5}),
+]
+BILL_CALLS = [
+    ("get_bill_details", (), {}),
+    ("get_bill_actions", (), {}),
+    ("get_bill_cosponsors", (), {}),
+    ("get_bill_text", (), {}),
+]
+
+_recorded: Dict[str, float] = {}
+
+def record_access(kind: str, entity: str):
+    """
+    Note that a member or bill page was viewed, so the warm-up keeps it hot.
+    A single write to the page's own key, with no lock; blocking, so call it
+    off the event loop.
+    """
+    key = f"{ACCESS_KEY_PREFIX}{kind}:{entity}"
+    now = time.time()
+    if now - _recorded.get(key, 0) < ACCESS_LOG_RESOLUTION:
+        return
+    if len(_recorded) > ACCESS_LOG_MAX_ENTRIES * 4:
+        _recorded.clear()
+    _recorded[key] = now
+    cache.set(key, now, expire=ACCESS_LOG_WINDOW)
+
+def recent_accesses(kind: str) -> List[str]:
+    """The ACCESS_LOG_MAX_ENTRIES most recently viewed pages of a kind, newest first."""
+    prefix = f"{ACCESS_KEY_PREFIX}{kind}:"
+    cutoff = time.time() - ACCESS_LOG_WINDOW
+    viewed = []
+    for key in list(cache.iterkeys()):
+        if key.startswith(prefix):
+            viewed_at = cache.get(key)
+            if viewed_at is not None and viewed_at >= cutoff:
+                viewed.append((viewed_at, key[len(prefix):]))
+    viewed.sort(reverse=True)
+    return [entity for _, entity in viewed[:ACCESS_LOG_MAX_ENTRIES]]
+
+def collect_targets() -> Tuple[List[str], List[Tuple[int, str, str]]]:
+    """
+    Members and bills worth keeping warm: tracked bills, member conversations
+    and anything viewed recently.
+    """
+    from ..database import SessionLocal, Conversation, TrackedBill
+
+    members = set(recent_accesses("member"))
+    bills = set()
+    with SessionLocal() as db:
+        for (bioguide_id,) in db.query(Conversation.bioguide_id).filter(Conversation.bioguide_id.isnot(None)).distinct():
+            members.add(bioguide_id)
+        for congress, bill_type, bill_number in db.query(TrackedBill.congress, TrackedBill.bill_type, TrackedBill.bill_number).distinct():
+            if congress and bill_type and bill_number:
+                bills.add((int(congress), re.sub(r'[^a-zA-Z]', '', bill_type).lower(), str(bill_number)))
+
+    for entry in recent_accesses("bill"):
+        congress, bill_type, bill_number = entry.split("/")
+        bills.add((int(congress), bill_type, bill_number))
+
+    return sorted(members), sorted(bills)
+
+def _warm(client: CongressAPIClient, name: str, args: tuple, kwargs: dict) -> bool:
+    """
+    Refresh one cached call if it is missing or about to expire.
+    Returns True if an upstream request was made.
+    """
+    method = getattr(CongressAPIClient, name)
+    expires_at = method.expires_at(client, *args, **kwargs)
+    if expires_at is not None and expires_at - time.time() > WARMUP_REFRESH_WINDOW:
+        return False
+    method.refresh(client, *args, **kwargs)
+    return True
+
+def run_warmup_cycle() -> Dict[str, int]:
+    """
+    One pass over all hot members and bills using the low-priority request budget.
+    Stops early once the budget is exhausted; the next pass picks up where it left off.
+    """
+    stats = {"members": 0, "bills": 0, "refreshed": 0, "profiles": 0, "errors": 0}
+    try:
+        client = CongressAPIClient(low_priority=True)
+        members, bills = collect_targets()
+    except Exception as e:
+        print(f"Warm-up skipped: {e}")
+        return stats
+
+    jobs = [(name, (bioguide_id,) + args, kwargs) for bioguide_id in members for name, args, kwargs in MEMBER_CALLS]
+    jobs += [(name, bill + args, kwargs) for bill in bills for name, args, kwargs in BILL_CALLS]
+    stats["members"], stats["bills"] = len(members), len(bills)
+
+    # Hot members also get their materialized page (member_profiles.py) built
+    profiles = MemberProfiles(client)
+    jobs += [("profile", (bioguide_id,), {}) for bioguide_id in members]
+
+    for name, args, kwargs in jobs:
+        try:
+            if name == "profile":
+                if cached_profile(*args) is None:
+                    profiles.get(*args)
+                    stats["profiles"] += 1
+            elif _warm(client, name, args, kwargs):
+                stats["refreshed"] += 1
+        except BudgetExhausted:
+            print("Warm-up paused: low-priority Congress.gov budget exhausted")
+            break
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"Warm-up failed for {name}{args}: {e}")
+
+    print(f"Warm-up pass complete: {stats}")
+    return stats
+
+warmup_scheduler = LeaderScheduler(WARMUP_LOCK_KEY, WARMUP_INTERVAL, run_warmup_cycle, "Warm-up")
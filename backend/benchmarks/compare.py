@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files written by benchmarks.run.
+
+    python -m benchmarks.compare base.json new.json [--fail-over 10]
+
+Prints p50/p95/p99 latency and throughput deltas for every scenario present in
+both files. With --fail-over, exits non-zero if any p95 regressed by more than
+that many percent.
+"""
+import sys
+import json
+import argparse
+
+def _key(result):
+    return (result["scenario"], result["cache"], result["concurrency"])
+
+def _delta(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+def _fmt(old, new, delta):
+    if old is None or new is None:
+        return f"{'-':>24}"
+    sign = "+" if delta is not None and delta >= 0 else ""
+    pct = f"{sign}{delta:.1f}%" if delta is not None else "n/a"
+    return f"{old:>8.1f} -> {new:>8.1f} {pct:>7}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two COSINT benchmark runs")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--fail-over", type=float, default=None, help="Fail if any p95 regresses by more than this percent")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"base: {base['meta'].get('commit')}  new: {new['meta'].get('commit')}")
+    base_results = {_key(r): r for r in base["results"]}
+    regressions = []
+    for result in new["results"]:
+        old = base_results.get(_key(result))
+        if old is None:
+            continue
+        scenario, cache, concurrency = _key(result)
+        print(f"\n{scenario} cache={cache} concurrency={concurrency}")
+        for pct in ("p50", "p95", "p99"):
+            before, after = old["latency_ms"][pct], result["latency_ms"][pct]
+            delta = _delta(before, after)
+            print(f"  {pct:<10} {_fmt(before, after, delta)} ms")
+            if pct == "p95" and args.fail_over is not None and delta is not None and delta > args.fail_over:
+                regressions.append(f"{scenario}/{cache}/c={concurrency} p95 +{delta:.1f}%")
+        before, after = old["throughput_rps"], result["throughput_rps"]
+        print(f"  {'throughput':<10} {_fmt(before, after, _delta(before, after))} req/s")
+
+    if regressions:
+        print("\nRegressions over threshold:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
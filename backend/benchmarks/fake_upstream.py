@@ -0,0 +1,223 @@
+"""
+Local stand-in for every upstream the backend talks to, serving recorded fixtures:
+Congress.gov (/v3), Google Civic (/civicinfo/v2), Brave (/res/v1/web/search),
+bill text downloads (/text), the Supabase JWKS and a deterministic OpenAI-compatible
+chat completions / embeddings API (/v1). Nothing here touches the network.
+"""
+import os
+import re
+import json
+import base64
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, Optional
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Shared secret for the HS256 key published in the fake JWKS
+JWT_SECRET = "benchmark-secret-benchmark-secret"
+JWT_KID = "benchmark"
+
+FINAL_ANSWER = (
+    "Senator Cory Booker represents New Jersey in the United States Senate. He serves on the "
+    "Committee on Foreign Relations, the Committee on the Judiciary and the Committee on Agriculture, "
+    "Nutrition, and Forestry. Recent sponsored legislation focuses on health, criminal justice and the "
+    "environment. For more information, you can [visit his official profile](https://www.congress.gov/member/B001288) "
+    "or create a new COSINT page. [CREATE_PAGE_ACTION: Cory Booker | B001288]"
+)
+
+class Latency:
+    """Simulated upstream and LLM timings, in seconds."""
+    upstream = 0.05
+    llm_first_token = 0.2
+    llm_per_token = 0.005
+
+def configure_latency(upstream_ms: float, llm_first_token_ms: float, llm_per_token_ms: float):
+    Latency.upstream = upstream_ms / 1000
+    Latency.llm_first_token = llm_first_token_ms / 1000
+    Latency.llm_per_token = llm_per_token_ms / 1000
+
+def _resolve_fixture(root: str, segments) -> Optional[str]:
+    """
+    Find the fixture for a path, preferring literal segments and falling back to
+    "_" wildcards (e.g. member/B001288/committees -> member/_/committees.json).
+    """
+    if not segments:
+        return None
+    head, rest = segments[0], segments[1:]
+    for name in (head, "_"):
+        if not rest:
+            candidate = os.path.join(root, f"{name}.json")
+            if os.path.exists(candidate):
+                return candidate
+        else:
+            found = _resolve_fixture(os.path.join(root, name), rest)
+            if found:
+                return found
+    return None
+
+def _load_fixture(request: Request, path: str) -> Optional[Any]:
+    with open(path) as f:
+        text = f.read()
+    base = str(request.base_url).rstrip("/")
+    # Links inside payloads point back at the fake server
+    text = text.replace("https://api.congress.gov/v3", f"{base}/v3")
+    text = text.replace("https://www.congress.gov/", f"{base}/text/")
+    return json.loads(text)
+
+async def congress(request: Request):
+    await asyncio.sleep(Latency.upstream)
+    segments = [s for s in request.path_params["path"].split("/") if s]
+    path = _resolve_fixture(os.path.join(FIXTURES_DIR, "congress"), segments)
+    if not path:
+        return JSONResponse({"error": "No fixture recorded"}, status_code=404)
+    return JSONResponse(_load_fixture(request, path))
+
+async def bill_text(request: Request):
+    await asyncio.sleep(Latency.upstream)
+    with open(os.path.join(FIXTURES_DIR, "text", "bill.htm")) as f:
+        return PlainTextResponse(f.read(), media_type="text/html")
+
+async def civic(request: Request):
+    await asyncio.sleep(Latency.upstream)
+    return JSONResponse(_load_fixture(request, os.path.join(FIXTURES_DIR, "civic", "divisionsByAddress.json")))
+
+async def brave(request: Request):
+    await asyncio.sleep(Latency.upstream)
+    return JSONResponse(_load_fixture(request, os.path.join(FIXTURES_DIR, "brave", "search.json")))
+
+def _jwk() -> Dict[str, str]:
+    k = base64.urlsafe_b64encode(JWT_SECRET.encode()).decode().rstrip("=")
+    return {"kty": "oct", "kid": JWT_KID, "alg": "HS256", "k": k}
+
+async def jwks(request: Request):
+    return JSONResponse({"keys": [_jwk()]})
+
+def make_token(user_id: str = "benchmark-user", ttl: int = 3600) -> str:
+    """A Supabase-style access token the backend accepts via the fake JWKS."""
+    from jose import jwt
+    claims = {"sub": user_id, "aud": "authenticated", "exp": int(time.time()) + ttl}
+    return jwt.encode(claims, _jwk(), algorithm="HS256", headers={"kid": JWT_KID})
+
+# --- Fake OpenAI ---
+
+def _example_from_schema(schema: Dict[str, Any]) -> Any:
+    kind = schema.get("type")
+    if kind == "object" or "properties" in schema:
+        return {name: _example_from_schema(prop) for name, prop in schema.get("properties", {}).items()}
+    if kind == "boolean":
+        return True
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "array":
+        return []
+    return "Cory Booker" if "name" in json.dumps(schema).lower() else "Benchmark fact"
+
+def _completion_plan(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decide deterministically what the fake model answers:
+    - structured output (response_format / forced tool) -> an object matching the schema
+    - agent turn with tools and no tool results yet -> one tool call
+    - otherwise -> the canned final answer
+    """
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return {"content": json.dumps(_example_from_schema(schema))}
+
+    tools = body.get("tools") or []
+    tool_choice = body.get("tool_choice")
+    if isinstance(tool_choice, dict):
+        name = tool_choice["function"]["name"]
+        tool = next(t for t in tools if t["function"]["name"] == name)
+        return {"tool_call": (name, _example_from_schema(tool["function"].get("parameters", {})))}
+
+    messages = body.get("messages", [])
+    has_tool_results = any(m.get("role") == "tool" for m in messages)
+    if tools and not has_tool_results:
+        names = [t["function"]["name"] for t in tools]
+        if "get_congress_member_details" in names:
+            # Look up whichever Bioguide ID the question mentions, so cold runs miss the cache
+            question = next((str(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), "")
+            match = re.search(r"\b[A-Z]\d{6}\b", question)
+            return {"tool_call": ("get_congress_member_details", {"bioguide_id": match.group(0) if match else "B001288"})}
+        return {"tool_call": (names[0], _example_from_schema(tools[0]["function"].get("parameters", {})))}
+    return {"content": FINAL_ANSWER}
+
+def _usage(body, completion_tokens: int) -> Dict[str, int]:
+    prompt_tokens = sum(len(str(m.get("content") or "").split()) for m in body.get("messages", []))
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+async def chat_completions(request: Request):
+    body = await request.json()
+    plan = _completion_plan(body)
+    model = body.get("model", "gpt-4o-mini")
+    created = int(time.time())
+    completion_id = "chatcmpl-benchmark"
+
+    if plan.get("tool_call"):
+        name, args = plan["tool_call"]
+        tool_call = {"id": "call_benchmark", "type": "function", "function": {"name": name, "arguments": json.dumps(args)}}
+        tokens = [json.dumps(args)]
+        message = {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+        finish_reason = "tool_calls"
+    else:
+        tokens = [word + " " for word in plan["content"].split(" ")]
+        message = {"role": "assistant", "content": plan["content"]}
+        finish_reason = "stop"
+
+    if not body.get("stream"):
+        await asyncio.sleep(Latency.llm_first_token + Latency.llm_per_token * len(tokens))
+        return JSONResponse({
+            "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": _usage(body, len(tokens)),
+        })
+
+    def chunk(delta, finish=None, usage=None):
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                   "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish}]}
+        if usage:
+            payload["usage"] = usage
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def stream():
+        await asyncio.sleep(Latency.llm_first_token)
+        if plan.get("tool_call"):
+            yield chunk({"role": "assistant", "content": None, "tool_calls": [dict(tool_call, index=0)]})
+        else:
+            yield chunk({"role": "assistant", "content": ""})
+            for token in tokens:
+                await asyncio.sleep(Latency.llm_per_token)
+                yield chunk({"content": token})
+        yield chunk({}, finish=finish_reason)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield chunk({}, usage=_usage(body, len(tokens)))
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+async def embeddings(request: Request):
+    body = await request.json()
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    data = []
+    for i, text in enumerate(inputs):
+        digest = hashlib.sha256(str(text).encode()).digest()
+        vector = [(b - 128) / 128 for b in digest * 2]
+        data.append({"object": "embedding", "index": i, "embedding": vector})
+    return JSONResponse({"object": "list", "data": data, "model": body.get("model"), "usage": {"prompt_tokens": 1, "total_tokens": 1}})
+
+app = Starlette(routes=[
+    Route("/v3/{path:path}", congress),
+    Route("/text/{path:path}", bill_text),
+    Route("/civicinfo/v2/divisionsByAddress", civic),
+    Route("/res/v1/web/search", brave),
+    Route("/auth/v1/.well-known/jwks.json", jwks),
+    Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+    Route("/v1/embeddings", embeddings, methods=["POST"]),
+])
@@ -0,0 +1,266 @@
+"""
+Offline benchmark harness for the COSINT API.
+
+    cd backend
+    python -m benchmarks.run --concurrency 1,8 --requests 40 --output bench.json
+
+Starts the fake upstream server (recorded Congress.gov / Google Civic / Brave
+fixtures, a deterministic streaming LLM and a JWKS) and the real API, each in a
+uvicorn thread on localhost, then measures throughput and p50/p95/p99 latency per
+endpoint for a cold and a warm cache. The database and cache live in a temporary
+directory, so the run never touches the network or local state. Compare two runs
+with `python -m benchmarks.compare base.json new.json`.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import asyncio
+import platform
+import tempfile
+import threading
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class ServerThread:
+    """Run an ASGI app with uvicorn in a daemon thread."""
+    def __init__(self, app, port: int):
+        import uvicorn
+        self.port = port
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        self.thread.start()
+        deadline = time.time() + 30
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError(f"Server on port {self.port} did not start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+def configure_environment(workdir: str, upstream: str):
+    """Point every client at the fake upstream and isolate DB and cache in workdir."""
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "CONGRESS_API_KEY": "benchmark",
+        "CONGRESS_API_BASE_URL": f"{upstream}/v3",
+        "GOOGLE_CIVIC_API_KEY": "benchmark",
+        "GOOGLE_CIVIC_API_BASE_URL": f"{upstream}/civicinfo/v2",
+        "BRAVE_SEARCH_API_KEY": "benchmark",
+        "BRAVE_SEARCH_API_URL": f"{upstream}/res/v1/web/search",
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": f"{upstream}/v1",
+        "OPENAI_API_BASE": f"{upstream}/v1",
+        "SUPABASE_URL": upstream,
+        "WARMUP_ENABLED": "false",
+        "LANGCHAIN_TRACING_V2": "false",
+        "LANGSMITH_TRACING": "false",
+    })
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return round(sorted_values[min(rank, len(sorted_values) - 1)], 2)
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": round(sum(values) / len(values), 2) if values else None,
+        "max": round(values[-1], 2) if values else None,
+    }
+
+# --- Scenarios ---
+# Each scenario maps (request index, cache mode) to a request. Cold requests use a
+# fresh entity every time so every upstream call misses; warm requests repeat one entity.
+
+def _member_id(i: int, mode: str) -> str:
+    return "B001288" if mode == "warm" else f"C{i:06d}"
+
+def member_request(i, mode):
+    return {"method": "GET", "url": f"/member/{_member_id(i, mode)}"}
+
+def bill_request(i, mode):
+    number = 1 if mode == "warm" else 10000 + i
+    return {"method": "GET", "url": f"/bill/118/hr/{number}"}
+
+def chat_request(i, mode):
+    subject = _member_id(i, mode)
+    return {"method": "POST", "url": "/chat/stream", "stream": True,
+            "json": {"message": f"What committees is {subject} on?"}}
+
+def notebook_request(i, mode):
+    paths = ["/conversations", "/tracked-bills", "/member/B001288/notes"]
+    return {"method": "GET", "url": paths[i % len(paths)]}
+
+SCENARIOS: Dict[str, Callable[[int, str], Dict[str, Any]]] = {
+    "member": member_request,
+    "bill": bill_request,
+    "chat_stream": chat_request,
+    "notebook": notebook_request,
+}
+# Notebook endpoints only hit the database, so they have no cold/warm distinction
+CACHELESS = {"notebook"}
+
+async def _send(client, spec) -> Dict[str, float]:
+    start = time.perf_counter()
+    if spec.get("stream"):
+        ttfb = None
+        async with client.stream(spec["method"], spec["url"], json=spec.get("json")) as response:
+            async for chunk in response.aiter_bytes():
+                if ttfb is None and chunk:
+                    ttfb = (time.perf_counter() - start) * 1000
+            status = response.status_code
+        return {"status": status, "latency": (time.perf_counter() - start) * 1000, "ttfb": ttfb}
+    response = await client.request(spec["method"], spec["url"], json=spec.get("json"))
+    return {"status": response.status_code, "latency": (time.perf_counter() - start) * 1000, "ttfb": None}
+
+async def run_scenario(base_url: str, token: str, name: str, mode: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    import httpx
+    build = SCENARIOS[name]
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=120, limits=limits) as client:
+        if mode == "warm":
+            await _send(client, build(0, mode))
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+        samples: List[Dict[str, float]] = []
+
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                try:
+                    samples.append(await _send(client, build(i, mode)))
+                except Exception as e:
+                    samples.append({"status": 0, "latency": 0.0, "ttfb": None, "error": str(e)})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ok = [s for s in samples if 200 <= s["status"] < 300]
+    ttfbs = [s["ttfb"] for s in ok if s["ttfb"] is not None]
+    return {
+        "scenario": name,
+        "cache": "n/a" if name in CACHELESS else mode,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": len(samples) - len(ok),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+        "latency_ms": summarize([s["latency"] for s in ok]),
+        "ttfb_ms": summarize(ttfbs) if ttfbs else None,
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def seed(base_url: str, token: str):
+    """Give the notebook endpoints something to read."""
+    import httpx
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base_url, headers=headers, timeout=30) as client:
+        client.post("/conversations/member/B001288", params={"name": "Cory Booker"})
+        client.post("/tracked-bills", json={"bill_id": "118-hr-1", "bill_type": "hr", "bill_number": "1", "congress": 118, "title": "Lower Energy Costs Act"})
+        for i in range(10):
+            client.post("/member/B001288/notes", json={"title": f"Note {i}", "content": "Benchmark note"})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline COSINT API benchmarks")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios")
+    parser.add_argument("--modes", default="cold,warm", help="Cache modes to run: cold, warm")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per scenario run")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50)
+    parser.add_argument("--llm-first-token-ms", type=float, default=200)
+    parser.add_argument("--llm-token-ms", type=float, default=5)
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    modes = [m for m in args.modes.split(",") if m]
+    concurrency_levels = [int(c) for c in args.concurrency.split(",") if c]
+
+    sys.path.insert(0, BACKEND_DIR)
+    from benchmarks import fake_upstream
+    fake_upstream.configure_latency(args.upstream_latency_ms, args.llm_first_token_ms, args.llm_token_ms)
+
+    workdir = tempfile.mkdtemp(prefix="cosint-bench-")
+    upstream = ServerThread(fake_upstream.app, _free_port())
+    upstream.start()
+    configure_environment(workdir, upstream.url)
+
+    # Imported only now so the app reads the benchmark environment
+    from app.main import app
+    from app.services.cache_service import cache
+    api = ServerThread(app, _free_port())
+    api.start()
+
+    token = fake_upstream.make_token()
+    seed(api.url, token)
+
+    results = []
+    try:
+        for name in scenarios:
+            for concurrency in concurrency_levels:
+                for mode in (["warm"] if name in CACHELESS else modes):
+                    if mode == "cold":
+                        cache.clear()
+                    result = asyncio.run(run_scenario(api.url, token, name, mode, args.requests, concurrency))
+                    results.append(result)
+                    latency = result["latency_ms"]
+                    print(f"{name:12} {result['cache']:5} c={concurrency:<3} {result['throughput_rps']} req/s  "
+                          f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms errors={result['errors']}")
+    finally:
+        api.stop()
+        upstream.stop()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "upstream_latency_ms": args.upstream_latency_ms,
+            "llm_first_token_ms": args.llm_first_token_ms,
+            "llm_token_ms": args.llm_token_ms,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Cold-start benchmark for the COSINT API.
+
+    cd backend
+    python -m benchmarks.startup --runs 5
+
+Measures, each in a fresh interpreter: how long `import app.main` takes, and how
+long a uvicorn process takes from spawn to answering /health. Also lists the
+modules with the largest cumulative import time (python -X importtime). Exits
+non-zero if a median exceeds its budget (IMPORT_BUDGET_MS and HEALTH_BUDGET_MS
+unless given), so CI can hold the startup time; tests/test_startup.py holds
+the import budget in the test suite.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+from typing import Dict, List, Optional
+
+from benchmarks.run import BACKEND_DIR, _free_port, _git_commit, configure_environment
+
+# Medians on a developer laptop are about 1.2s and 1.7s; the budgets leave headroom for CI
+IMPORT_BUDGET_MS = 2000
+HEALTH_BUDGET_MS = 3000
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+def _environment(workdir: str) -> Dict[str, str]:
+    # Nothing is called upstream during startup; point clients at a closed port
+    saved = dict(os.environ)
+    configure_environment(workdir, "http://127.0.0.1:9")
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    os.environ.clear()
+    os.environ.update(saved)
+    return env
+
+def measure_import(env: Dict[str, str]) -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, text=True)
+    return float(output.strip().splitlines()[-1]) * 1000
+
+def measure_health(env: Dict[str, str], timeout: float = 60) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"/health did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def slowest_imports(env: Dict[str, str], top: int) -> List[Dict[str, float]]:
+    """Top-level-ish modules by cumulative import time, from python -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and name.startswith(" ") and len(name) - len(name.lstrip()) <= 3:
+            modules.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+    return sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:top]
+
+def _over(name: str, value: float, budget: Optional[float]) -> bool:
+    if budget is not None and value > budget:
+        print(f"FAIL: median {name} {value:.0f}ms is over the {budget:.0f}ms budget")
+        return True
+    return False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="COSINT API cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Fail if the median import of app.main is slower")
+    parser.add_argument("--health-budget-ms", type=float, default=HEALTH_BUDGET_MS, help="Fail if the median spawn-to-/health time is slower")
+    parser.add_argument("--output", default=None, help="Write the results as JSON")
+    args = parser.parse_args(argv)
+
+    env = _environment(tempfile.mkdtemp(prefix="cosint-startup-"))
+    # Warm the filesystem cache and .pyc files so every run measures the same thing
+    measure_import(env)
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    health = [measure_health(env) for _ in range(args.runs)]
+    slowest = slowest_imports(env, args.top)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "import_ms": {"median": round(statistics.median(imports), 1), "min": round(min(imports), 1), "max": round(max(imports), 1)},
+        "health_ms": {"median": round(statistics.median(health), 1), "min": round(min(health), 1), "max": round(max(health), 1)},
+        "slowest_imports": slowest,
+    }
+
+    print(f"import app.main   median={report['import_ms']['median']}ms  min={report['import_ms']['min']}ms  max={report['import_ms']['max']}ms")
+    print(f"spawn to /health  median={report['health_ms']['median']}ms  min={report['health_ms']['min']}ms  max={report['health_ms']['max']}ms")
+    print("Slowest imports (cumulative):")
+    for module in slowest:
+        print(f"  {module['cumulative_ms']:>8.1f}ms  {module['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    failed = _over("import", report["import_ms"]["median"], args.import_budget_ms)
+    failed = _over("spawn to /health", report["health_ms"]["median"], args.health_budget_ms) or failed
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import glob
+
+# Multi-worker deployment: gunicorn supervises uvicorn workers. The app is imported
+# once in the master (preload_app) and forked, so workers share its memory pages;
+# post_fork drops the connections each worker must not share with the master.
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Chat turns stream for up to AGENT_RUN_TIMEOUT seconds
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Workers see the same count, so each keeps to its share of the Congress.gov hourly limit
+os.environ.setdefault("WEB_CONCURRENCY", str(workers))
+# Tables are created once here rather than by every worker racing at startup
+os.environ["DB_INIT_ON_STARTUP"] = "false"
+
+# Metrics from every worker are aggregated on /metrics. The directory must exist and be
+# emptied before the app (and prometheus_client) is preloaded, i.e. when this file loads.
+prometheus_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if prometheus_dir:
+    os.makedirs(prometheus_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(prometheus_dir, "*.db")):
+        os.remove(path)
+
+def when_ready(server):
+    from app.database import init_db, init_mirror_db, dispose_engines
+    from app.services.preload import preload_agent_modules, PRELOAD_AGENT
+    init_db()
+    init_mirror_db()
+    dispose_engines()
+    # Import the agent stack once here so forked workers share it instead of each loading it
+    if PRELOAD_AGENT:
+        preload_agent_modules()
+
+def post_fork(server, worker):
+    from app.database import dispose_engines
+    from app.services.brave_search_client import reset_clients
+    dispose_engines()
+    reset_clients()
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,55 @@
+"""Tracked-bill polling: bill_watches and bill_updates
+
+Revision ID: 3c5f2a7d9b14
+Revises: e9211253b1c1
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5f2a7d9b14'
+down_revision: Union[str, Sequence[str], None] = 'e9211253b1c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bill_watches',
+    sa.Column('bill_key', sa.String(), nullable=False),
+    sa.Column('congress', sa.Integer(), nullable=False),
+    sa.Column('bill_type', sa.String(), nullable=False),
+    sa.Column('bill_number', sa.String(), nullable=False),
+    sa.Column('update_date', sa.String(), nullable=True),
+    sa.Column('latest_action_date', sa.String(), nullable=True),
+    sa.Column('latest_action_text', sa.Text(), nullable=True),
+    sa.Column('action_watermark', sa.String(), nullable=True),
+    sa.Column('watermark_keys', sa.Text(), nullable=True),
+    sa.Column('last_checked', sa.DateTime(), nullable=True),
+    sa.Column('last_changed', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_key')
+    )
+    op.create_table('bill_updates',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bill_key', sa.String(), nullable=False),
+    sa.Column('action_date', sa.String(), nullable=True),
+    sa.Column('action_code', sa.String(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('detected_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bill_updates_bill_key'), 'bill_updates', ['bill_key'], unique=False)
+    op.create_index(op.f('ix_bill_updates_detected_at'), 'bill_updates', ['detected_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bill_updates_detected_at'), table_name='bill_updates')
+    op.drop_index(op.f('ix_bill_updates_bill_key'), table_name='bill_updates')
+    op.drop_table('bill_updates')
+    op.drop_table('bill_watches')
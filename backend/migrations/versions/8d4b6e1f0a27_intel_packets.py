@@ -0,0 +1,46 @@
+"""Intel packets: intel_packets
+
+Revision ID: 8d4b6e1f0a27
+Revises: 3c5f2a7d9b14
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4b6e1f0a27'
+down_revision: Union[str, Sequence[str], None] = '3c5f2a7d9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('intel_packets',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=True),
+    sa.Column('subject_name', sa.String(), nullable=True),
+    sa.Column('subject_key', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('fact_hash', sa.String(), nullable=False),
+    sa.Column('source_hash', sa.String(), nullable=True),
+    sa.Column('source_simhash', sa.BigInteger(), nullable=True),
+    sa.Column('conversation_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'subject_key', 'fact_hash')
+    )
+    op.create_index('ix_intel_packets_user_member', 'intel_packets', ['user_id', 'bioguide_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_intel_packets_user_member', table_name='intel_packets')
+    op.drop_table('intel_packets')
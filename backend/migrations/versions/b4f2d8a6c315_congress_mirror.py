@@ -0,0 +1,114 @@
+"""Congress.gov mirror: mirror_* tables
+
+Revision ID: b4f2d8a6c315
+Revises: 8d4b6e1f0a27
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f2d8a6c315'
+down_revision: Union[str, Sequence[str], None] = '8d4b6e1f0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def mirror_in_main_database() -> bool:
+    # A mirror in its own database (CONGRESS_MIRROR_DATABASE_URL) is created by init_mirror_db instead
+    mirror_url = os.getenv("CONGRESS_MIRROR_DATABASE_URL")
+    return not mirror_url or mirror_url == os.getenv("DATABASE_URL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not mirror_in_main_database():
+        return
+    op.create_table('mirror_members',
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('state_code', sa.String(), nullable=True),
+    sa.Column('district', sa.Integer(), nullable=True),
+    sa.Column('current_member', sa.Boolean(), nullable=True),
+    sa.Column('update_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.Column('detail', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('bioguide_id')
+    )
+    op.create_index(op.f('ix_mirror_members_current_member'), 'mirror_members', ['current_member'], unique=False)
+    op.create_index(op.f('ix_mirror_members_state_code'), 'mirror_members', ['state_code'], unique=False)
+    op.create_table('mirror_bills',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('congress', sa.Integer(), nullable=True),
+    sa.Column('bill_type', sa.String(), nullable=True),
+    sa.Column('bill_number', sa.String(), nullable=True),
+    sa.Column('update_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.Column('detail', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_id')
+    )
+    op.create_index(op.f('ix_mirror_bills_congress'), 'mirror_bills', ['congress'], unique=False)
+    op.create_table('mirror_bill_actions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('action_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_mirror_bill_actions_action_date'), 'mirror_bill_actions', ['action_date'], unique=False)
+    op.create_index(op.f('ix_mirror_bill_actions_bill_id'), 'mirror_bill_actions', ['bill_id'], unique=False)
+    op.create_table('mirror_bill_cosponsors',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('sponsorship_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_id', 'bioguide_id')
+    )
+    op.create_index(op.f('ix_mirror_bill_cosponsors_bioguide_id'), 'mirror_bill_cosponsors', ['bioguide_id'], unique=False)
+    op.create_table('mirror_roll_calls',
+    sa.Column('roll_call_id', sa.String(), nullable=False),
+    sa.Column('congress', sa.Integer(), nullable=True),
+    sa.Column('session', sa.Integer(), nullable=True),
+    sa.Column('roll_call', sa.Integer(), nullable=True),
+    sa.Column('start_date', sa.String(), nullable=True),
+    sa.Column('update_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('roll_call_id')
+    )
+    op.create_index(op.f('ix_mirror_roll_calls_start_date'), 'mirror_roll_calls', ['start_date'], unique=False)
+    op.create_table('mirror_roll_call_votes',
+    sa.Column('roll_call_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('vote_cast', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('roll_call_id', 'bioguide_id')
+    )
+    op.create_table('mirror_sync_state',
+    sa.Column('resource', sa.String(), nullable=False),
+    sa.Column('last_synced', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('resource')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not mirror_in_main_database():
+        return
+    op.drop_table('mirror_sync_state')
+    op.drop_table('mirror_roll_call_votes')
+    op.drop_index(op.f('ix_mirror_roll_calls_start_date'), table_name='mirror_roll_calls')
+    op.drop_table('mirror_roll_calls')
+    op.drop_index(op.f('ix_mirror_bill_cosponsors_bioguide_id'), table_name='mirror_bill_cosponsors')
+    op.drop_table('mirror_bill_cosponsors')
+    op.drop_index(op.f('ix_mirror_bill_actions_bill_id'), table_name='mirror_bill_actions')
+    op.drop_index(op.f('ix_mirror_bill_actions_action_date'), table_name='mirror_bill_actions')
+    op.drop_table('mirror_bill_actions')
+    op.drop_index(op.f('ix_mirror_bills_congress'), table_name='mirror_bills')
+    op.drop_table('mirror_bills')
+    op.drop_index(op.f('ix_mirror_members_state_code'), table_name='mirror_members')
+    op.drop_index(op.f('ix_mirror_members_current_member'), table_name='mirror_members')
+    op.drop_table('mirror_members')
@@ -0,0 +1,77 @@
+"""Bill history: action, cosponsor and sponsor logs
+
+Revision ID: c7e3a9f2d416
+Revises: b4f2d8a6c315
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e3a9f2d416'
+down_revision: Union[str, Sequence[str], None] = 'b4f2d8a6c315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def mirror_in_main_database() -> bool:
+    # Bill history lives in the mirror database; a separate one is created by init_mirror_db
+    mirror_url = os.getenv("CONGRESS_MIRROR_DATABASE_URL")
+    return not mirror_url or mirror_url == os.getenv("DATABASE_URL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not mirror_in_main_database():
+        return
+    op.create_table('bill_action_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('action_key', sa.String(), nullable=False),
+    sa.Column('action_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bill_id', 'action_key')
+    )
+    op.create_index(op.f('ix_bill_action_log_bill_id'), 'bill_action_log', ['bill_id'], unique=False)
+    op.create_table('bill_cosponsor_log',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('sponsorship_date', sa.String(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_id', 'bioguide_id')
+    )
+    op.create_table('bill_sponsor_log',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('party', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_id')
+    )
+    op.create_index(op.f('ix_bill_sponsor_log_bioguide_id'), 'bill_sponsor_log', ['bioguide_id'], unique=False)
+    op.create_table('bill_history_state',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('actions_through', sa.String(), nullable=True),
+    sa.Column('cosponsors_through', sa.String(), nullable=True),
+    sa.Column('cosponsor_count', sa.Integer(), nullable=True),
+    sa.Column('withdrawn_count', sa.Integer(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not mirror_in_main_database():
+        return
+    op.drop_table('bill_history_state')
+    op.drop_index(op.f('ix_bill_sponsor_log_bioguide_id'), table_name='bill_sponsor_log')
+    op.drop_table('bill_sponsor_log')
+    op.drop_table('bill_cosponsor_log')
+    op.drop_index(op.f('ix_bill_action_log_bill_id'), table_name='bill_action_log')
+    op.drop_table('bill_action_log')
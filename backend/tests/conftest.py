@@ -0,0 +1,26 @@
+"""
+Test environment: a throwaway cache directory and SQLite database, set before
+any app module reads its settings (and before load_dotenv, which doesn't
+override variables already set).
+"""
+import os
+import tempfile
+
+import pytest
+
+_workdir = tempfile.mkdtemp(prefix="cosint-test-")
+os.environ.setdefault("CACHE_DIR", os.path.join(_workdir, "cache"))
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'cosint.db')}"
+os.environ["CONGRESS_MIRROR_DATABASE_URL"] = os.environ["DATABASE_URL"]
+
+
+@pytest.fixture
+def database():
+    """Empty main and mirror tables for the test."""
+    from app.database import Base, MirrorBase, engine
+
+    Base.metadata.create_all(bind=engine)
+    MirrorBase.metadata.create_all(bind=engine)
+    yield engine
+    MirrorBase.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,110 @@
+"""
+AnswerCache: answers are replayed for the same or a near-identical question
+until one of the api_cache entries they were built from is refetched or evicted.
+"""
+import asyncio
+import math
+
+import pytest
+
+from app.services.answer_cache import AnswerCache, normalize_question
+from app.services.cache_service import cache, api_cache, evict, record_dependencies
+
+MEMBER = "B001288"
+CONTEXT = "member:B001288"
+QUESTION = "Who represents NJ-8?"
+
+
+class StubClient:
+    @api_cache(expire=3600, namespace="test", entity="member:{bioguide_id}")
+    def get_member_details(self, bioguide_id):
+        return {"bioguideId": bioguide_id, "directOrderName": "Cory Booker"}
+
+
+class StubEmbeddings:
+    """Unit vectors at a fixed angle from QUESTION's, keyed by normalized question."""
+    def __init__(self):
+        self.angles = {}
+        self.calls = 0
+
+    def similar(self, question, similarity):
+        self.angles[normalize_question(question)] = math.acos(similarity)
+
+    async def aembed_query(self, text):
+        self.calls += 1
+        angle = self.angles.get(text, 0.0)
+        return [math.cos(angle), math.sin(angle)]
+
+
+@pytest.fixture
+def answers():
+    cache.clear()
+    answers = AnswerCache(threshold=0.95)
+    answers._embeddings = StubEmbeddings()
+    yield answers
+    cache.clear()
+
+
+def store_answer(answers, question=QUESTION, response="Rob Menendez"):
+    """Store an answer built from the member's details, as the chat route does."""
+    async def build():
+        with record_dependencies() as dependencies:
+            await asyncio.to_thread(StubClient().get_member_details, MEMBER)
+        await answers.store(question, CONTEXT, response, dependencies)
+        return dependencies
+    return asyncio.run(build())
+
+
+def lookup(answers, question=QUESTION, context=CONTEXT):
+    response, _ = asyncio.run(answers.lookup(question, context))
+    return response
+
+
+def test_exact_hit_ignores_case_and_punctuation(answers):
+    dependencies = store_answer(answers)
+    assert len(dependencies) == 1
+    assert lookup(answers) == "Rob Menendez"
+    assert lookup(answers, "who represents nj 8") == "Rob Menendez"
+    assert lookup(answers, context="member:S000148") is None
+
+
+def test_refreshed_dependency_drops_the_answer(answers):
+    store_answer(answers)
+    StubClient.get_member_details.refresh(StubClient(), MEMBER)
+
+    assert lookup(answers) is None
+    assert not any(key.startswith("answer:") for key in cache.iterkeys())
+
+
+def test_evicted_dependency_drops_the_answer(answers):
+    store_answer(answers)
+    assert evict(entity=f"member:{MEMBER}") > 0
+
+    assert lookup(answers) is None
+    assert not any(key.startswith("answer:") for key in cache.iterkeys())
+
+
+def test_unrelated_refresh_keeps_the_answer(answers):
+    store_answer(answers)
+    StubClient.get_member_details.refresh(StubClient(), "S000148")
+    assert lookup(answers) == "Rob Menendez"
+
+
+def test_near_miss_threshold(answers):
+    store_answer(answers)
+    answers._embeddings.similar("Which congressman represents NJ-8?", 0.97)
+    answers._embeddings.similar("Who represented NJ-8 in 2010?", 0.93)
+
+    assert lookup(answers, "Which congressman represents NJ-8?") == "Rob Menendez"
+    assert lookup(answers, "Who represented NJ-8 in 2010?") is None
+    # Near neighbours only count within the same context
+    assert lookup(answers, "Which congressman represents NJ-8?", context="member:S000148") is None
+
+
+def test_near_hit_on_a_stale_answer_is_forgotten(answers):
+    store_answer(answers)
+    answers._embeddings.similar("Which congressman represents NJ-8?", 0.97)
+    StubClient.get_member_details.refresh(StubClient(), MEMBER)
+
+    assert lookup(answers, "Which congressman represents NJ-8?") is None
+    assert answers._keys == []
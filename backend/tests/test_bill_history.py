@@ -0,0 +1,142 @@
+"""
+BillHistory: the first lookup of a bill stores its full action and cosponsor
+lists, later lookups fetch only what is newer and merge it into the stored rows.
+"""
+import pytest
+
+from app.services.cosint.bill_history import BillHistory
+
+BILL = (118, "hr", "1")
+ACTIONS_PATH = "bill/118/hr/1/actions"
+COSPONSORS_PATH = "bill/118/hr/1/cosponsors"
+
+
+class StubClient:
+    """Serves Congress.gov list endpoints from in-memory lists and records each request."""
+    def __init__(self):
+        self.lists = {}
+        self.requests = []
+
+    def _get(self, path, params=None):
+        params = params or {}
+        offset, limit = params.get("offset", 0), params.get("limit", 250)
+        self.requests.append((path, offset))
+        items = self.lists[path]
+        list_key = path.rsplit("/", 1)[-1]
+        pagination = {"count": len(items)}
+        if offset + limit < len(items):
+            pagination["next"] = f"{path}?offset={offset + limit}"
+        return {list_key: items[offset:offset + limit], "pagination": pagination}
+
+
+def action(date, text, code=None):
+    return {"actionDate": date, "text": text, "actionCode": code}
+
+
+def cosponsor(bioguide_id, date, withdrawn=None):
+    record = {"bioguideId": bioguide_id, "sponsorshipDate": date}
+    if withdrawn:
+        record["sponsorshipWithdrawnDate"] = withdrawn
+    return record
+
+
+def summary(count, withdrawn=0):
+    return {"cosponsors": {"count": count, "countIncludingWithdrawnCosponsors": count + withdrawn}}
+
+
+@pytest.fixture
+def client(database):
+    client = StubClient()
+    client.lists[ACTIONS_PATH] = [
+        action("2023-02-01", "Referred to committee", "H11100"),
+        action("2023-01-09", "Introduced in House", "Intro-H"),
+    ]
+    client.lists[COSPONSORS_PATH] = [
+        cosponsor("A000001", "2023-01-09"),
+        cosponsor("B000002", "2023-01-10"),
+    ]
+    return client
+
+
+# --- Actions ---
+
+def test_first_lookup_stores_every_action(client):
+    history = BillHistory(client)
+    assert [a["text"] for a in history.actions(*BILL)] == ["Referred to committee", "Introduced in House"]
+    assert client.requests == [(ACTIONS_PATH, 0)]
+
+
+def test_new_actions_are_prepended(client):
+    history = BillHistory(client)
+    history.actions(*BILL)
+
+    # Same-day action next to the watermark, and a later one
+    client.lists[ACTIONS_PATH] = [
+        action("2023-03-15", "Passed House", "8000"),
+        action("2023-02-01", "Reported by committee", "H12200"),
+    ] + client.lists[ACTIONS_PATH]
+    client.requests.clear()
+
+    assert [a["text"] for a in history.actions(*BILL)] == [
+        "Passed House", "Reported by committee", "Referred to committee", "Introduced in House",
+    ]
+    assert client.requests == [(ACTIONS_PATH, 0)]
+
+
+def test_unchanged_actions_add_nothing(client):
+    history = BillHistory(client)
+    first = history.actions(*BILL)
+    client.requests.clear()
+
+    assert history.actions(*BILL) == first
+    # Only the newest page is read, and nothing is stored twice
+    assert client.requests == [(ACTIONS_PATH, 0)]
+    assert history._merge_actions("118-hr-1", client.lists[ACTIONS_PATH]) == 0
+
+
+def test_older_pages_are_not_reread(client):
+    history = BillHistory(client)
+    client.lists[ACTIONS_PATH] = [action(f"2023-01-{d:02d}", f"Action {d}") for d in range(28, 0, -1)] * 20
+    history.actions(*BILL)
+
+    client.lists[ACTIONS_PATH] = [action("2023-02-01", "Newest")] + client.lists[ACTIONS_PATH]
+    client.requests.clear()
+    assert history.actions(*BILL)[0]["text"] == "Newest"
+    assert client.requests == [(ACTIONS_PATH, 0)]
+
+
+# --- Cosponsors ---
+
+def test_unchanged_cosponsor_count_skips_the_request(client):
+    history = BillHistory(client)
+    assert len(history.cosponsors(*BILL, summary(2))) == 2
+    client.requests.clear()
+
+    assert [c["bioguideId"] for c in history.cosponsors(*BILL, summary(2))] == ["A000001", "B000002"]
+    assert client.requests == []
+
+
+def test_new_cosponsors_are_read_from_the_stored_count(client):
+    history = BillHistory(client)
+    history.cosponsors(*BILL, summary(2))
+    client.lists[COSPONSORS_PATH] = client.lists[COSPONSORS_PATH] + [cosponsor("C000003", "2023-02-01")]
+    client.requests.clear()
+
+    assert [c["bioguideId"] for c in history.cosponsors(*BILL, summary(3))] == ["A000001", "B000002", "C000003"]
+    # One record early, to check the stored list is still a prefix
+    assert client.requests == [(COSPONSORS_PATH, 1)]
+
+
+def test_withdrawal_forces_a_full_refresh(client):
+    history = BillHistory(client)
+    history.cosponsors(*BILL, summary(2))
+    client.lists[COSPONSORS_PATH] = [
+        cosponsor("A000001", "2023-01-09", withdrawn="2023-03-01"),
+        cosponsor("B000002", "2023-01-10"),
+    ]
+    client.requests.clear()
+
+    cosponsors = history.cosponsors(*BILL, summary(1, withdrawn=1))
+    assert client.requests == [(COSPONSORS_PATH, 0)]
+    assert cosponsors[0] == cosponsor("A000001", "2023-01-09", withdrawn="2023-03-01")
+    assert len(cosponsors) == 2
@@ -0,0 +1,99 @@
+"""
+BillPoller: a first check only sets the watermark, later checks report actions
+newer than it (including new ones on the watermark date), and bills missing
+from a complete "updated since" listing aren't fetched at all.
+"""
+import json
+
+import pytest
+
+from app.database import SessionLocal, TrackedBill, BillWatch, BillUpdate
+from app.services.bill_poller import BillPoller
+
+
+class StubClient:
+    """Congress.gov bill, actions and updated-bills endpoints for one tracked bill."""
+    def __init__(self):
+        self.update_date = "2023-02-01T10:00:00Z"
+        self.actions = [
+            {"actionDate": "2023-02-01", "text": "Referred to the Committee on Ways and Means.", "actionCode": "H11100"},
+            {"actionDate": "2023-01-09", "text": "Introduced in House", "actionCode": "Intro-H"},
+        ]
+        self.listed = True
+        self.requests = []
+
+    def summary(self):
+        return {"number": "1", "updateDate": self.update_date, "latestAction": {"actionDate": self.actions[0]["actionDate"], "text": self.actions[0]["text"]}}
+
+    def _get(self, path, params=None):
+        self.requests.append(path)
+        if path == "bill/118/hr":
+            return {"bills": [self.summary()] if self.listed else [], "pagination": {"count": int(self.listed)}}
+        if path == "bill/118/hr/1":
+            return {"bill": self.summary()}
+        if path == "bill/118/hr/1/actions":
+            offset, limit = params["offset"], params["limit"]
+            return {"actions": self.actions[offset:offset + limit], "pagination": {"count": len(self.actions)}}
+        raise AssertionError(f"Unexpected request: {path}")
+
+
+@pytest.fixture
+def client(database):
+    with SessionLocal() as db:
+        db.add(TrackedBill(user_id="u1", bill_id="118-hr-1", bill_type="HR", bill_number="1", congress=118))
+        db.add(TrackedBill(user_id="u2", bill_id="118-hr-1", bill_type="HR", bill_number="1", congress=118))
+        db.commit()
+    return StubClient()
+
+
+def updates():
+    with SessionLocal() as db:
+        return [u.text for u in db.query(BillUpdate).order_by(BillUpdate.id)]
+
+
+def watch():
+    with SessionLocal() as db:
+        return db.get(BillWatch, "118-hr-1")
+
+
+def test_first_check_only_sets_the_watermark(client):
+    stats = BillPoller(client).run_pass()
+    assert stats["bills"] == 1 and stats["checked"] == 1 and stats["new_actions"] == 0
+    assert updates() == []
+    assert watch().action_watermark == "2023-02-01"
+    assert len(json.loads(watch().watermark_keys)) == 1
+
+
+def test_new_action_on_the_watermark_date(client):
+    poller = BillPoller(client)
+    poller.run_pass()
+
+    client.actions.insert(0, {"actionDate": "2023-02-01", "text": "Referred to the Committee on the Budget.", "actionCode": "H11100"})
+    client.update_date = "2023-02-01T18:00:00Z"
+    stats = poller.run_pass()
+
+    assert stats["changed"] == 1 and stats["new_actions"] == 1
+    assert updates() == ["Referred to the Committee on the Budget."]
+    assert len(json.loads(watch().watermark_keys)) == 2
+
+    # Seen actions on the watermark date aren't reported again
+    client.actions.insert(0, {"actionDate": "2023-03-15", "text": "Passed House", "actionCode": "8000"})
+    client.update_date = "2023-03-15T12:00:00Z"
+    poller.run_pass()
+    assert updates() == ["Referred to the Committee on the Budget.", "Passed House"]
+    assert watch().action_watermark == "2023-03-15"
+
+
+def test_bill_missing_from_a_complete_listing_is_not_fetched(client):
+    poller = BillPoller(client)
+    poller.run_pass()
+    checked_before = watch().last_checked
+
+    client.listed = False
+    client.requests.clear()
+    stats = poller.run_pass()
+
+    assert client.requests == ["bill/118/hr"]
+    assert stats["listed"] == 1 and stats["checked"] == 0
+    assert updates() == []
+    assert watch().last_checked > checked_before
@@ -0,0 +1,27 @@
+"""
+normalize_query: which web searches share a cache entry.
+"""
+import pytest
+
+from app.services.brave_search_client import normalize_query, search_cache_key
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Who is Cory Booker?", "who is  cory booker"),
+    ("Cory Booker's committees", "cory booker s committees"),
+    ("HR 1, the For the People Act.", "hr 1 the for the people act"),
+    ("site:congress.gov HR 1?", "SITE:congress.gov hr 1"),
+])
+def test_rewordings_share_a_key(a, b):
+    assert normalize_query(a) == normalize_query(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("site:congress.gov HR 1", "site congress gov HR 1"),
+    ("filetype:pdf infrastructure bill", "filetype pdf infrastructure bill"),
+    ("booker senate.gov", "booker senate gov"),
+    ('"for the people act"', "for the people act"),
+])
+def test_operators_and_quotes_keep_their_own_key(a, b):
+    assert normalize_query(a) != normalize_query(b)
+    assert search_cache_key(normalize_query(a), 5) != search_cache_key(normalize_query(b), 5)
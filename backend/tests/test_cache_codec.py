@@ -0,0 +1,68 @@
+"""
+Cache codecs: every value decodes to exactly what was stored, whether it went
+through orjson+zstd or fell back to pickle.
+"""
+import math
+from datetime import datetime
+
+import pytest
+
+from app.services.cache_codec import OrjsonZstdCodec, PickleCodec, JSON_RAW, JSON_ZSTD, PICKLE_RAW
+
+CONGRESS_PAYLOAD = {
+    "bill": {"congress": 118, "type": "HR", "number": "1", "title": "Lower Energy Costs Act" * 20},
+    "actions": [{"actionDate": "2023-03-30", "text": "Passed House", "count": 225}],
+    "ratio": 0.5,
+    "withdrawn": None,
+    "current": True,
+}
+
+
+@pytest.fixture(params=[OrjsonZstdCodec, PickleCodec])
+def codec(request):
+    return request.param()
+
+
+@pytest.mark.parametrize("value", [
+    CONGRESS_PAYLOAD,
+    {"a": float("nan"), "b": float("inf"), "c": float("-inf")},
+    [1.5, float("inf")],
+    (118, "hr", "1"),
+    {"votes": (1, 2), "nested": [("a", "b")]},
+    b"\x00\x01 raw bytes",
+    {"payload": b"bytes inside a dict"},
+    2 ** 64,
+    -(2 ** 70),
+    {"count": 10 ** 30},
+    {1: "int key"},
+    {datetime(2026, 10, 19): "datetime key"},
+    datetime(2026, 10, 19, 12, 30),
+    {"a", "b"},
+    "plain string",
+    0,
+    None,
+])
+def test_round_trip(codec, value):
+    decoded = codec.decode(codec.encode(value))
+    if isinstance(value, dict) and any(isinstance(v, float) and math.isnan(v) for v in value.values()):
+        assert math.isnan(decoded["a"]) and decoded["b"] == math.inf and decoded["c"] == -math.inf
+    else:
+        assert decoded == value
+        assert type(decoded) is type(value)
+
+
+def test_json_native_values_skip_pickle():
+    codec = OrjsonZstdCodec()
+    assert codec.encode({"a": 1})[:1] == JSON_RAW
+    assert codec.encode(CONGRESS_PAYLOAD)[:1] == JSON_ZSTD
+
+
+@pytest.mark.parametrize("value", [
+    {"a": float("nan")},
+    [float("inf")],
+    (1, 2),
+    b"bytes",
+    2 ** 64,
+])
+def test_non_native_values_fall_back_to_pickle(value):
+    assert OrjsonZstdCodec().encode(value)[:1] == PICKLE_RAW
@@ -0,0 +1,98 @@
+"""
+MemberProfiles.update: a stored profile only looks up votes on roll calls new
+to the feed, and only refetches details and bills when the api_cache entries
+they were built from changed.
+"""
+import json
+
+import pytest
+
+from app.services.cache_service import cache, api_cache
+from app.services.member_profiles import MemberProfiles, VOTE_FEED_KEY, profile_key
+
+MEMBER = "B001288"
+
+
+class StubClient:
+    """Member data behind api_cache (so reads are recorded as dependencies); records every upstream call."""
+    def __init__(self):
+        self.calls = []
+        self.name = "Cory Booker"
+
+    @api_cache(expire=3600, namespace="test", entity="member:{bioguide_id}")
+    def get_member_details(self, bioguide_id):
+        self.calls.append(("details", bioguide_id))
+        return {"bioguideId": bioguide_id, "directOrderName": self.name}
+
+    @api_cache(expire=3600, namespace="test", entity="member:{bioguide_id}")
+    def get_sponsored_legislation(self, bioguide_id, limit=10):
+        self.calls.append(("bills", bioguide_id))
+        return [{"number": "1", "type": "S"}]
+
+    def get_roll_call_votes(self, congress, session, roll_call):
+        self.calls.append(("roll_call", roll_call))
+        return {MEMBER: "Yea" if roll_call % 2 else "Nay"}
+
+
+def feed_item(roll_call):
+    return {
+        "key": f"118-1-{roll_call}", "congress": 118, "session": 1, "roll_call": roll_call,
+        "number": str(roll_call), "url": None, "title": f"Bill {roll_call}", "type": "HR",
+        "question": "On Passage", "result": "Passed", "date": "2023-03-30",
+    }
+
+
+@pytest.fixture
+def client():
+    cache.clear()
+    client = StubClient()
+    cache.set(VOTE_FEED_KEY, [feed_item(2), feed_item(1)])
+    MemberProfiles(client).build(MEMBER)
+    client.calls.clear()
+    yield client
+    cache.clear()
+
+
+def stored(bioguide_id=MEMBER):
+    doc = cache.get(profile_key(bioguide_id))
+    return doc, json.loads(doc["body"])
+
+
+def test_unchanged_profile_makes_no_calls(client):
+    doc, _ = stored()
+    assert not MemberProfiles(client).update(MEMBER, doc, [feed_item(2), feed_item(1)])
+    assert client.calls == []
+
+
+def test_only_new_roll_calls_are_looked_up(client):
+    doc, _ = stored()
+    assert MemberProfiles(client).update(MEMBER, doc, [feed_item(3), feed_item(2), feed_item(1)])
+    assert client.calls == [("roll_call", 3)]
+
+    _, profile = stored()
+    assert [(v["number"], v["vote"]) for v in profile["votes"]] == [("3", "Yea"), ("2", "Nay"), ("1", "Yea")]
+
+
+def test_roll_calls_leaving_the_feed_are_dropped_without_lookups(client):
+    doc, _ = stored()
+    assert MemberProfiles(client).update(MEMBER, doc, [feed_item(2)])
+    assert client.calls == []
+    _, profile = stored()
+    assert [v["number"] for v in profile["votes"]] == ["2"]
+
+
+def test_details_are_rebuilt_only_after_their_entries_change(client):
+    client.name = "Booker, Cory A."
+    doc, _ = stored()
+    MemberProfiles(client).update(MEMBER, doc, [feed_item(2), feed_item(1)])
+    _, profile = stored()
+    assert profile["details"]["directOrderName"] == "Cory Booker"
+
+    # The warm-up refetching the entry gives it a new version
+    StubClient.get_member_details.refresh(client, MEMBER)
+    client.calls.clear()
+    doc, _ = stored()
+    assert MemberProfiles(client).update(MEMBER, doc, [feed_item(2), feed_item(1)])
+    assert ("roll_call", 1) not in client.calls and ("roll_call", 2) not in client.calls
+    _, profile = stored()
+    assert profile["details"]["directOrderName"] == "Booker, Cory A."
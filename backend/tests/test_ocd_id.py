@@ -0,0 +1,68 @@
+"""
+parse_divisions: the OCD IDs of a divisionsByAddress response merged into one Division.
+"""
+from app.services.ocd_id import Division, parse_divisions, parse_ocd_id
+
+
+def test_state_only():
+    division = parse_divisions(["ocd-division/country:us", "ocd-division/country:us/state:nj"])
+    assert division == Division(country="us", state="NJ")
+
+
+def test_numbered_congressional_district():
+    division = parse_divisions([
+        "ocd-division/country:us",
+        "ocd-division/country:us/state:nj",
+        "ocd-division/country:us/state:nj/cd:8",
+    ])
+    assert (division.state, division.cd) == ("NJ", 8)
+
+
+def test_at_large_congressional_district():
+    division = parse_divisions(["ocd-division/country:us/state:wy", "ocd-division/country:us/state:wy/cd:at-large"])
+    assert (division.state, division.cd) == ("WY", 0)
+
+
+def test_state_legislative_county_and_place():
+    division = parse_divisions([
+        "ocd-division/country:us/state:nj/cd:8",
+        "ocd-division/country:us/state:nj/sldl:33",
+        "ocd-division/country:us/state:nj/sldu:33",
+        "ocd-division/country:us/state:nj/county:hudson",
+        "ocd-division/country:us/state:nj/place:hoboken",
+        "ocd-division/country:us/state:nj/school_district:hoboken",
+    ])
+    assert division.to_dict() == {
+        "country": "us", "state": "NJ", "cd": 8, "sldl": "33", "sldu": "33", "county": "hudson", "place": "hoboken",
+    }
+
+
+def test_named_state_legislative_districts_are_kept_as_written():
+    division = parse_divisions(["ocd-division/country:us/state:nh/sldl:hillsborough_37"])
+    assert division.sldl == "hillsborough_37"
+
+
+def test_district_of_columbia():
+    division = parse_divisions([
+        "ocd-division/country:us",
+        "ocd-division/country:us/district:dc",
+        "ocd-division/country:us/district:dc/ward:6",
+    ])
+    assert (division.state, division.cd) == ("DC", 0)
+
+
+def test_territories():
+    division = parse_divisions(["ocd-division/country:us", "ocd-division/country:us/territory:pr"])
+    assert (division.state, division.cd) == ("PR", 0)
+    assert parse_divisions(["ocd-division/country:us/territory:gu", "ocd-division/country:us/territory:gu/place:hagatna"]).state == "GU"
+
+
+def test_no_divisions():
+    assert parse_divisions([]) == Division()
+    assert parse_divisions(["ocd-division/country:us/state:nj/cd:unknown"]).cd is None
+
+
+def test_order_and_case_do_not_matter():
+    ids = ["ocd-division/country:us/state:NJ/cd:8", "ocd-division/country:us/state:NJ/sldu:33"]
+    assert parse_divisions(ids) == parse_divisions(reversed(ids))
+    assert parse_ocd_id("ocd-division/country:us/state:NJ/cd:8") == (("country", "us"), ("state", "nj"), ("cd", "8"))
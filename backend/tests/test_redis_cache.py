@@ -0,0 +1,195 @@
+"""
+Multi-worker cache mode (CACHE_BACKEND=redis) against fakeredis. Each RedisCache
+built on the same FakeServer stands in for a separate worker process.
+"""
+import asyncio
+import threading
+import time
+
+import fakeredis
+import pytest
+
+from app.services import cache_service
+from app.services.redis_cache import RedisCache
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def worker(server) -> RedisCache:
+    return RedisCache(fakeredis.FakeRedis(server=server))
+
+
+@pytest.fixture
+def cache(server, monkeypatch):
+    shared = worker(server)
+    monkeypatch.setattr(cache_service, "cache", shared)
+    monkeypatch.setattr(cache_service, "CACHE_SINGLE_FLIGHT_POLL", 0.01)
+    return shared
+
+
+def tag_ttl(cache: RedisCache, tag: str) -> int:
+    return cache.client.pttl(cache._tag_key(tag))
+
+
+# --- get / set / add ---
+
+def test_values_round_trip_between_workers(server):
+    a, b = worker(server), worker(server)
+    a.set("congress:get_member_details:member:b001288:1", {"name": "Cory Booker", "terms": [1, 2]})
+    assert b.get("congress:get_member_details:member:b001288:1") == {"name": "Cory Booker", "terms": [1, 2]}
+    assert b.get("missing", default="fallback") == "fallback"
+
+
+def test_set_expiry(server):
+    a = worker(server)
+    a.set("short", 1, expire=0.05)
+    value, expires_at = a.get("short", expire_time=True)
+    assert value == 1 and expires_at is not None
+    time.sleep(0.1)
+    assert a.get("short") is None
+
+
+def test_add_only_stores_once(server):
+    a, b = worker(server), worker(server)
+    assert a.add("lock:x", "a", expire=5)
+    assert not b.add("lock:x", "b", expire=5)
+    assert b.get("lock:x") == "a"
+
+
+def test_add_expiry(server):
+    a = worker(server)
+    assert a.add("lock:x", 1, expire=0.05)
+    time.sleep(0.1)
+    assert a.add("lock:x", 2, expire=5)
+
+
+# --- Tag eviction ---
+
+def test_evict_removes_every_tagged_entry(server):
+    a, b = worker(server), worker(server)
+    a.set("k1", 1, expire=100, tag="member:b001288")
+    b.set("k2", 2, expire=100, tag="member:b001288")
+    a.set("k3", 3, expire=100, tag="member:m001226")
+    assert b.evict("member:b001288") == 2
+    assert a.get("k1") is None and a.get("k2") is None
+    assert a.get("k3") == 3
+
+
+def test_tag_outlives_its_longest_entry(server):
+    a = worker(server)
+    a.set("long", 1, expire=100, tag="bill:118-hr-1")
+    a.set("short", 2, expire=5, tag="bill:118-hr-1")
+    assert tag_ttl(a, "bill:118-hr-1") > 99_000
+    assert a.evict("bill:118-hr-1") == 2
+
+
+def test_tag_without_expiry_while_an_entry_has_none(server):
+    a = worker(server)
+    a.set("forever", 1, tag="member:b001288")
+    a.set("short", 2, expire=5, tag="member:b001288")
+    assert tag_ttl(a, "member:b001288") == -1
+
+
+def test_sub_second_expiry_keeps_the_tag(server):
+    a = worker(server)
+    a.set("brief", 1, expire=0.5, tag="member:b001288")
+    assert tag_ttl(a, "member:b001288") > 0
+    assert a.evict("member:b001288") == 1
+
+
+def test_add_expires_its_tag(server):
+    a = worker(server)
+    assert a.add("k", 1, expire=30, tag="member:b001288")
+    assert 0 < tag_ttl(a, "member:b001288") <= 30_000
+
+
+# --- transact ---
+
+def test_transact_serializes_read_modify_write(server):
+    workers = [worker(server) for _ in range(4)]
+    workers[0].set("counter", 0)
+
+    def bump(cache: RedisCache):
+        for _ in range(25):
+            with cache.transact():
+                cache.set("counter", cache.get("counter") + 1)
+
+    threads = [threading.Thread(target=bump, args=(w,)) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert workers[0].get("counter") == 100
+
+
+def test_transact_times_out_while_held(server):
+    a, b = worker(server), worker(server)
+    with a.transact():
+        with pytest.raises(TimeoutError):
+            with b.transact(timeout=0.05):
+                pass
+    with b.transact(timeout=0.05):
+        pass
+
+
+# --- single_flight ---
+
+def test_single_flight_waiter_reads_the_holders_result(cache):
+    key = "congress:get_bill_details:bill:118-hr-1:1"
+    calls = []
+    started = threading.Event()
+
+    def holder_compute():
+        calls.append("holder")
+        started.set()
+        time.sleep(0.1)
+        cache.set(key, {"title": "Holder"})
+        return {"title": "Holder"}
+
+    def waiter_compute():
+        calls.append("waiter")
+        return {"title": "Waiter"}
+
+    results = {}
+    holder = threading.Thread(target=lambda: results.setdefault("holder", cache_service.single_flight(key, holder_compute)))
+    holder.start()
+    started.wait(1)
+    results["waiter"] = cache_service.single_flight(key, waiter_compute)
+    holder.join()
+
+    assert calls == ["holder"]
+    assert results == {"holder": {"title": "Holder"}, "waiter": {"title": "Holder"}}
+
+
+def test_single_flight_waiter_computes_when_the_lock_expires(cache):
+    key = "congress:get_bill_details:bill:118-hr-2:1"
+    # A holder that died without storing a value or releasing its lock
+    cache.add(cache_service.lock_key(key), 12345, expire=0.1)
+
+    started = time.monotonic()
+    assert cache_service.single_flight(key, lambda: "computed") == "computed"
+    assert time.monotonic() - started < cache_service.CACHE_SINGLE_FLIGHT_TIMEOUT / 2
+
+
+def test_single_flight_releases_the_lock(cache):
+    key = "congress:get_bill_details:bill:118-hr-3:1"
+    assert cache_service.single_flight(key, lambda: "value") == "value"
+    assert cache.get(cache_service.lock_key(key)) is None
+
+
+def test_single_flight_never_polls_on_the_event_loop(cache):
+    key = "congress:get_bill_details:bill:118-hr-4:1"
+    # Held by another worker for the whole single-flight timeout
+    cache.add(cache_service.lock_key(key), 12345, expire=cache_service.CACHE_SINGLE_FLIGHT_TIMEOUT)
+
+    async def handler():
+        started = time.monotonic()
+        result = cache_service.single_flight(key, lambda: "computed")
+        return result, time.monotonic() - started
+
+    result, waited = asyncio.run(handler())
+    assert result == "computed"
+    assert waited < cache_service.CACHE_SINGLE_FLIGHT_POLL
@@ -0,0 +1,45 @@
+"""
+route_turn: which chat messages skip the agent. Only whole-message delegation
+lookups and small talk are routed; every other question goes to the agent.
+"""
+import pytest
+
+from app.services.cosint.agent import route_turn, TurnRoute
+
+
+@pytest.mark.parametrize("message, route", [
+    ("Who is the rep for NJ-8?", TurnRoute("district_lookup", "NJ", 8)),
+    ("who represents nj 8", TurnRoute("district_lookup", "NJ", 8)),
+    ("NJ-8 representative", TurnRoute("district_lookup", "NJ", 8)),
+    ("Who is the representative for New Jersey's 8th district?", TurnRoute("district_lookup", "NJ", 8)),
+    ("Who's my congresswoman for CA 12", TurnRoute("district_lookup", "CA", 12)),
+    ("Who represents Wyoming at large?", TurnRoute("district_lookup", "WY", 0)),
+    ("Who is the rep for TX-7 and its senators?", TurnRoute("district_lookup", "TX", 7, with_senators=True)),
+    ("Who are the senators from Maine?", TurnRoute("senator_lookup", "ME")),
+    ("senators for New Jersey", TurnRoute("senator_lookup", "NJ")),
+    ("Who are NJ's senators?", TurnRoute("senator_lookup", "NJ")),
+    ("Who represents Utah in the Senate?", TurnRoute("senator_lookup", "UT")),
+])
+def test_lookups_are_routed(message, route):
+    assert route_turn(message) == route
+
+
+@pytest.mark.parametrize("message", [
+    "Did the representative for CA 12 support HR 1?",
+    "Which senators in California support abortion rights?",
+    "Is the senator from Maine up for reelection?",
+    "Who are the senators of Utah and what are their ages",
+    "How did the rep for NJ-8 vote on the budget?",
+    "Who was the representative for NJ-8 in 2010?",
+    "What committees is the senator from Ohio on?",
+    "Who are the senators for me",
+    "Tell me about the infrastructure bill",
+])
+def test_everything_else_goes_to_the_agent(message):
+    assert route_turn(message) is None
+
+
+def test_small_talk():
+    assert route_turn("Hello!").name == "small_talk"
+    assert route_turn("Thanks so much").name == "small_talk"
+    assert route_turn("Hello, who is the rep for NJ-8 and how did they vote?") is None
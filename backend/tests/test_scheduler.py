@@ -0,0 +1,47 @@
+"""
+LeaderScheduler: the shared loop behind the warm-up, bill poll, member profile,
+co-sponsorship graph and bill index jobs.
+"""
+import asyncio
+
+import fakeredis
+
+from app.services import scheduler
+from app.services.redis_cache import RedisCache
+
+
+def run_for(seconds, *schedulers):
+    async def main():
+        tasks = [asyncio.create_task(s.run()) for s in schedulers]
+        await asyncio.sleep(seconds)
+        for task in tasks:
+            task.cancel()
+    asyncio.run(main())
+
+
+def test_only_the_lock_holder_runs_a_pass(monkeypatch):
+    monkeypatch.setattr(scheduler, "cache", RedisCache(fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+    calls = []
+    workers = [scheduler.LeaderScheduler("lock:test", 5, lambda i=i: calls.append(i), "Test") for i in range(3)]
+    run_for(0.1, *workers)
+    assert len(calls) == 1
+
+
+def test_run_first_false_waits_an_interval(monkeypatch):
+    monkeypatch.setattr(scheduler, "cache", RedisCache(fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+    calls = []
+    run_for(0.1, scheduler.LeaderScheduler("lock:test", 5, lambda: calls.append(1), "Test", run_first=False))
+    assert calls == []
+
+
+def test_a_failing_pass_keeps_the_loop_running(monkeypatch, capsys):
+    monkeypatch.setattr(scheduler, "cache", RedisCache(fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise RuntimeError("upstream down")
+
+    run_for(0.35, scheduler.LeaderScheduler("lock:test", 0.1, fn, "Test"))
+    assert len(calls) >= 2
+    assert "Test failed: upstream down" in capsys.readouterr().out
@@ -0,0 +1,116 @@
+"""
+stream_events: tokens emitted within the flush window go out as one frame,
+other events flush pending tokens first, and the producer is cancelled as soon
+as the client disconnects.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.services import sse
+from app.services.sse import stream_events, sse_event, HEARTBEAT_FRAME
+
+
+@pytest.fixture(autouse=True)
+def fast_disconnect_poll(monkeypatch):
+    monkeypatch.setattr(sse, "SSE_DISCONNECT_POLL_SECONDS", 0.01)
+
+
+async def connected():
+    return False
+
+
+def parse(frame):
+    event, data = frame.strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+async def collect(producer, is_disconnected=connected, **kwargs):
+    return [frame async for frame in stream_events(producer, is_disconnected, **kwargs)]
+
+
+def test_tokens_within_the_window_are_coalesced():
+    async def producer(emit):
+        for text in ("Rob ", "Men", "endez"):
+            emit("token", {"text": text})
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.3)
+        emit("token", {"text": " (D)"})
+        emit("sources", {"urls": ["https://www.congress.gov"]})
+        emit("token", {"text": "."})
+
+    frames = [parse(f) for f in asyncio.run(collect(producer, coalesce_ms=100))]
+    assert frames == [
+        ("token", {"text": "Rob Menendez"}),
+        # Pending tokens go out before any other event, and the rest at the end
+        ("token", {"text": " (D)"}),
+        ("sources", {"urls": ["https://www.congress.gov"]}),
+        ("token", {"text": "."}),
+    ]
+
+
+def test_producer_error_becomes_an_error_event():
+    async def producer(emit):
+        emit("token", {"text": "Partial"})
+        raise RuntimeError("upstream timed out")
+
+    assert asyncio.run(collect(producer)) == [
+        sse_event("token", {"text": "Partial"}),
+        sse_event("error", {"message": "upstream timed out"}),
+    ]
+
+
+def test_disconnect_cancels_the_producer():
+    state = {"polls": 0, "cancelled": False}
+
+    async def is_disconnected():
+        state["polls"] += 1
+        return state["polls"] >= 3
+
+    async def producer(emit):
+        emit("status", {"message": "Thinking"})
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    async def main():
+        frames = await collect(producer, is_disconnected)
+        # Let the cancellation reach the producer task
+        await asyncio.sleep(0)
+        return frames
+
+    assert asyncio.run(main()) == [sse_event("status", {"message": "Thinking"})]
+    assert state == {"polls": 3, "cancelled": True}
+
+
+def test_closing_the_stream_cancels_the_producer():
+    async def main():
+        done = asyncio.Event()
+
+        async def producer(emit):
+            emit("status", {"message": "Thinking"})
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                done.set()
+                raise
+
+        stream = stream_events(producer, connected)
+        assert await stream.__anext__() == sse_event("status", {"message": "Thinking"})
+        await stream.aclose()
+        await asyncio.wait_for(done.wait(), timeout=1)
+
+    asyncio.run(main())
+
+
+def test_idle_stream_sends_heartbeats():
+    async def producer(emit):
+        await asyncio.sleep(0.25)
+        emit("done", {})
+
+    frames = asyncio.run(collect(producer, heartbeat_seconds=0.1))
+    assert frames[:2] == [HEARTBEAT_FRAME, HEARTBEAT_FRAME]
+    assert frames[-1] == sse_event("done", {})
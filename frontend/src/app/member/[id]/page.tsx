@@ -10,7 +10,7 @@ import remarkGfm from 'remark-gfm';
 import { createClient } from '@/utils/supabase/client';
 import { useRouter } from 'next/navigation';
 import { User } from '@supabase/supabase-js';
-import { MemberData } from '@/types';
+import { MemberData, IntelPacket } from '@/types';
 import { getApiUrl } from '@/utils/api';
 import { Skeleton, MemberHeaderSkeleton, CardSkeleton, VoteCardSkeleton } from '@/components/Skeleton';
 
@@ -29,6 +29,7 @@ export default function MemberDashboard({ params }: { params: Promise<{ id: stri
   const [isTracked, setIsTracked] = useState(false);
   const [isTracking, setIsTracking] = useState(false);
   const [researchNotes, setResearchNotes] = useState<any[]>([]);
+  const [intelPackets, setIntelPackets] = useState<IntelPacket[]>([]);
   const [editingNoteId, setEditingNoteId] = useState<string | null>(null);
   const [editForm, setEditForm] = useState({ title: '', content: '' });
   const [expandedNoteIds, setExpandedNoteIds] = useState<Record<string, boolean>>({});
@@ -52,6 +53,21 @@ export default function MemberDashboard({ params }: { params: Promise<{ id: stri
     }
   };
 
+  const fetchIntel = async () => {
+    try {
+      const { data: { session } } = await createClient().auth.getSession();
+      const response = await fetch(getApiUrl(`/member/${bioguideId}/intel`), {
+        headers: { 'Authorization': `Bearer ${session?.access_token}` }
+      });
+      if (response.ok) {
+        const packets = await response.json();
+        setIntelPackets(packets);
+      }
+    } catch (err) {
+      console.error('Failed to fetch intel:', err);
+    }
+  };
+
   const fetchMemberConversation = async () => {
     try {
       const { data: { session } } = await createClient().auth.getSession();
@@ -91,24 +107,10 @@ export default function MemberDashboard({ params }: { params: Promise<{ id: stri
     }
   };
 
-  const captureIntel = async (intel: {title: string, content: string}) => {
-    try {
-      const { data: { session } } = await createClient().auth.getSession();
-      const response = await fetch(getApiUrl(`/member/${bioguideId}/notes`), {
-        method: 'POST',
-        headers: { 
-          'Authorization': `Bearer ${session?.access_token}`,
-          'Content-Type': 'application/json'
-        },
-        body: JSON.stringify(intel)
-      });
-      if (response.ok) {
-        const newNote = await response.json();
-        setResearchNotes(prev => [newNote, ...prev]);
-      }
-    } catch (err) {
-      console.error('Failed to save note:', err);
-    }
+  const captureIntel = () => {
+    // The packet is already stored server-side by the time the chat sends it,
+    // so reload the Captured Intel list instead of saving it again as a note
+    fetchIntel();
   };
 
   const handleDeleteNote = async (noteId: string) => {
@@ -261,6 +263,7 @@ export default function MemberDashboard({ params }: { params: Promise<{ id: stri
         // Fetch data and notes after user is verified
         await Promise.all([
           fetchNotes(),
+          fetchIntel(),
           fetchMemberConversation()
         ]);
       } catch (err: any) {
@@ -439,8 +442,8 @@ export default function MemberDashboard({ params }: { params: Promise<{ id: stri
                   </div>
                 ) : (
                   <div className="bg-gray-50 border-2 border-dashed border-gray-300 rounded-3xl p-16 text-center">
-                    <p className="text-base font-bold text-gray-500 uppercase tracking-widest">Awaiting Chat Intelligence to Populate Notebook</p>
-                    <p className="text-sm text-gray-500 mt-2">Ask questions in the terminal to pin modular data here</p>
+                    <p className="text-base font-bold text-gray-500 uppercase tracking-widest">No Research Notes Yet</p>
+                    <p className="text-sm text-gray-500 mt-2">Intelligence from the terminal is pinned under Captured Intel</p>
                   </div>
                 )}
               </section>
@@ -507,7 +510,43 @@ export default function MemberDashboard({ params }: { params: Promise<{ id: stri
               </section>
             </div>
 
-            <div className="lg:col-span-4">
+            <div className="lg:col-span-4 space-y-12">
+              <section aria-labelledby="intel-title">
+                <div className="mb-6">
+                  <div className="flex items-center gap-2 bg-blue-50 border border-blue-100 px-4 py-2 w-full">
+                    <span className="w-2 h-2 bg-blue-700 rounded-full"></span>
+                    <h2 id="intel-title" className="text-xs font-black text-blue-700 uppercase tracking-[0.3em]">
+                      Captured Intel
+                    </h2>
+                  </div>
+                </div>
+                <div className="bg-white rounded-3xl shadow-xl border border-gray-200 overflow-hidden">
+                  <div className="divide-y divide-gray-100">
+                    {intelPackets.length > 0 ? intelPackets.map((packet) => (
+                      <div key={packet.id} className="p-6 hover:bg-gray-50/50 transition-all">
+                        <div className="flex justify-between items-center mb-2 gap-4">
+                          <span className="text-xs font-black text-black uppercase tracking-widest">{packet.title}</span>
+                          <time className="text-[10px] font-bold text-gray-500 uppercase shrink-0">
+                            {new Date(packet.created_at).toLocaleDateString()}
+                          </time>
+                        </div>
+                        <p className="text-sm text-gray-800 leading-relaxed">{packet.content}</p>
+                        {packet.conversation_id && packet.conversation_id !== convId && (
+                          <button
+                            onClick={() => setConvId(packet.conversation_id!)}
+                            className="mt-3 text-[10px] font-black text-blue-700 uppercase tracking-widest hover:underline decoration-2 underline-offset-4"
+                          >
+                            Open source chat
+                          </button>
+                        )}
+                      </div>
+                    )) : (
+                      <p className="p-12 text-gray-500 text-sm font-bold uppercase tracking-widest text-center italic">No intel captured yet.</p>
+                    )}
+                  </div>
+                </div>
+              </section>
+
               <section aria-labelledby="registry-title">
                 <div className="mb-6">
                   <div className="flex items-center gap-2 bg-gray-100 border border-gray-200 px-4 py-2 w-full">
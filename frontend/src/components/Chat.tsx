@@ -250,32 +250,11 @@ export default function Chat({
 
       const decoder = new TextDecoder();
       let assistantContent = '';
+      let buffer = '';
       
       setMessages((prev) => [...prev, { role: 'assistant', content: '' }]);
-      const processedPackets = new Set<string>();
-
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-
-        const chunk = decoder.decode(value, { stream: true });
-        assistantContent += chunk;
-
-        // CHECK FOR INTEL PACKETS: Format: [INTEL_PACKET: Title | Content |END_PACKET]
-        // We use a unique terminator to allow brackets (links) inside the content
-        const allMatches = Array.from(assistantContent.matchAll(/\[INTEL_PACKET:\s*([^|]+)\|\s*([\s\S]*?)\|END_PACKET\]/g));
-        
-        for (const match of allMatches) {
-          const fullTag = match[0];
-          if (!processedPackets.has(fullTag) && onIntelligenceCaptured) {
-            processedPackets.add(fullTag);
-            onIntelligenceCaptured({
-              title: match[1].trim(),
-              content: match[2].trim()
-            });
-          }
-        }
 
+      const render = () => {
         // CHECK FOR ACTION TRIGGERS: Format: [CREATE_PAGE_ACTION: Name | ID]
         const memberMatch = assistantContent.match(/\[CREATE_PAGE_ACTION:\s*([^|]+)\|\s*([^\]]+)\]/);
         if (memberMatch) {
@@ -306,9 +285,8 @@ export default function Chat({
           });
         }
 
-        // Hide any intel tags and action tags from the UI chat bubble
+        // Hide action tags from the UI chat bubble
         const cleanedContent = assistantContent
-          .replace(/\[INTEL_PACKET:[\s\S]*?\|END_PACKET\]/g, '')
           .replace(/\[CREATE_PAGE_ACTION:[^\]]+\]/g, '')
           .replace(/\[RESEARCH_BILL:[^\]]+\]/g, '')
           .trim();
@@ -321,6 +299,45 @@ export default function Chat({
           };
           return newMessages;
         });
+      };
+
+      // Server-sent events: token, tool_start, tool_end, intel, done, error
+      const handleEvent = (event: string, data: any) => {
+        switch (event) {
+          case 'token':
+            assistantContent += data.text;
+            render();
+            break;
+          case 'tool_start':
+            assistantContent += `\n\n*Accessing information from ${data.source}...*\n\n`;
+            render();
+            break;
+          case 'intel':
+            onIntelligenceCaptured?.({ title: data.title.trim(), content: data.content.trim() });
+            break;
+          case 'error':
+            throw new Error(data.message);
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop() ?? '';
+
+        for (const frame of frames) {
+          let event = 'message';
+          const dataLines: string[] = [];
+          for (const line of frame.split('\n')) {
+            // Lines starting with ':' are heartbeats
+            if (line.startsWith('event:')) event = line.slice(6).trim();
+            else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+          }
+          if (dataLines.length) handleEvent(event, JSON.parse(dataLines.join('\n')));
+        }
       }
     } catch (error: any) {
       setMessages((prev) => [
@@ -90,6 +90,15 @@ export interface BillData {
   ai_summary?: string;
 }
 
+export interface IntelPacket {
+  id: string;
+  title: string;
+  content: string;
+  subject_name?: string;
+  conversation_id?: string;
+  created_at: string;
+}
+
 export interface RegistryConversation {
   id: string;
   title: string;